@@ -1,18 +1,130 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session, g, abort
+from markupsafe import Markup
 from flask_apscheduler import APScheduler
-from models.database import db
+from models.database import db, is_memory_database
 from services.simulation_service import SimulationService
+from services.leaderboard_snapshot import leaderboard_snapshots
+from services.fragment_cache import FragmentCache
+from services.leaderboard_payload import build_compact_leaderboard
+from services.cut_tracker import CutLineTracker
+from services.betting_service import betting_service
+from services.pricing_service import PricingService, find_quote
+from services import metrics
+from services.query_tracer import trace_if_enabled, start_trace, finish_trace, report_trace
+from services.event_log import configure_logging, get_logger
+from services.profiler import profiler, TICKS
 from config import Config
+from functools import wraps
+import hmac
 import json
+import re
+import time
 
 app = Flask(__name__)
+app.config.from_object(Config)
 app.secret_key = Config.SECRET_KEY
 
+# Logging setup: simulation events are written by a background thread
+configure_logging()
+logger = get_logger('app')
+
 # Scheduler setup
 scheduler = APScheduler()
 
 # Initialize Simulation Service
 sim_service = SimulationService()
+logger.info("Scoring parameters %s", sim_service.parameters_version,
+            extra={'event': 'scoring_parameters', 'version': sim_service.parameters_version})
+pricing_service = PricingService(sim_service)
+
+# Rendered leaderboard tables, shared by every viewer at the same simulation step
+leaderboard_fragments = FragmentCache(Config.LEADERBOARD_CACHE_SIZE)
+compact_leaderboards = FragmentCache(Config.LEADERBOARD_CACHE_SIZE)
+
+def build_leaderboard_view(tournament_id, tournament=None, cut_tracker=None):
+    """
+    Builds everything the leaderboard pages and APIs show for a tournament
+    from the database: the tournament row, the leaderboard, the current
+    round's hole statistics, the recent price boards and, until the cut is
+    applied, the projected cut line.
+    """
+    tournament = tournament or db.get_tournament_by_id(tournament_id)
+    if not tournament:
+        return None
+
+    players = db.get_leaderboard_from_live_scores(tournament_id)
+    projected_cut = None
+    if tournament['current_round'] <= 2 and not tournament['cut_applied']:
+        if cut_tracker is None:
+            cut_tracker = CutLineTracker.from_leaderboard(players)
+        projected_cut = cut_tracker.projection()
+
+    return {
+        'tournament': tournament,
+        'players': players,
+        'hole_stats': db.get_hole_stats(tournament_id, tournament['current_round']),
+        'projected_cut': projected_cut,
+        'prices': pricing_service.get_boards(tournament, players),
+    }
+
+# Tournament rows as of their last published snapshot, to skip no-op publishes
+_published_tournaments = {}
+# Tournaments changed by a request since their last snapshot
+_dirty_snapshots = set()
+
+def publish_leaderboard_snapshot(tournament_id):
+    """
+    Publishes the tournament's current leaderboard as a shared snapshot so web
+    workers can serve it without querying the database. Nothing is published
+    if the tournament row has not changed since the last snapshot.
+
+    Snapshots have a single writer, so only the simulation tick calls this;
+    requests that change a tournament call mark_leaderboard_dirty instead.
+    """
+    # Cleared before reading the row, so a change made while publishing keeps it dirty
+    _dirty_snapshots.discard(tournament_id)
+    tournament = db.get_tournament_by_id(tournament_id)
+    if not tournament or _published_tournaments.get(tournament_id) == tournament:
+        return
+    view = build_leaderboard_view(tournament_id, tournament=tournament,
+                                  cut_tracker=sim_service.get_cut_tracker(tournament_id, tournament))
+    leaderboard_snapshots.publish(tournament_id, view)
+    _published_tournaments[tournament_id] = tournament
+
+def mark_leaderboard_dirty(tournament_id):
+    """
+    Records that a request changed the tournament: the next tick republishes
+    its snapshot (the tournament row has changed), and until then this worker
+    serves its leaderboard from the database.
+    """
+    _dirty_snapshots.add(tournament_id)
+
+def load_leaderboard(tournament_id):
+    """
+    Returns the tournament's leaderboard view from the latest published
+    snapshot, falling back to the database when no snapshot exists or it is
+    out of date. Returns None if the tournament does not exist.
+    """
+    if tournament_id in _dirty_snapshots:
+        return build_leaderboard_view(tournament_id)
+    return leaderboard_snapshots.read(tournament_id) or build_leaderboard_view(tournament_id)
+
+def is_round_over(tournament, leaderboard_data):
+    """Determines if the current round is over, which shows the "Next Round" button."""
+    round_is_over = False
+    if tournament['status'] == 'active' and leaderboard_data:
+        # Check if all active players have finished the current round
+        # After cut is applied, only consider players who made the cut
+        active_players = [p for p in leaderboard_data if p['status'] != 'cut']
+        
+        if active_players:
+            all_finished = all(p['holes_played'] >= 18 for p in active_players)
+            round_is_over = all_finished
+
+    # After R2, the button should only appear AFTER the cut is applied.
+    if tournament['current_round'] == 2 and not tournament['cut_applied']:
+        round_is_over = False
+    return round_is_over
 
 def advance_simulation():
     """
@@ -22,11 +134,108 @@ def advance_simulation():
     with app.app_context():
         active_tournament = db.get_active_tournament()
         if active_tournament:
-            sim_service.advance_staggered_simulation(active_tournament['id'])
+            with metrics.track_tick(), trace_if_enabled(f"tick {active_tournament['id']}"), profiler.profile(TICKS):
+                sim_service.advance_staggered_simulation(active_tournament['id'])
+                publish_leaderboard_snapshot(active_tournament['id'])
         else:
             # No need to print this every 2 seconds
             pass
 
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    if Config.QUERY_TRACE:
+        route = request.url_rule.rule if request.url_rule else request.path
+        g.query_trace = start_trace(f"{request.method} {route}")
+    if profiler.armed and request.url_rule:
+        g.profile = profiler.begin(request.url_rule.rule)
+
+@app.after_request
+def record_request_metrics(response):
+    """Records each request's latency and status, labelled by route."""
+    started = g.pop('request_started', None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        metrics.REQUEST_SECONDS.observe(time.perf_counter() - started, route=route, method=request.method)
+        metrics.REQUESTS.inc(route=route, method=request.method, status=response.status_code)
+    return response
+
+@app.teardown_request
+def finish_query_trace(exc):
+    query_trace = g.pop('query_trace', None)
+    if query_trace is not None:
+        report_trace(finish_trace(query_trace))
+    profiler.end(g.pop('profile', None))
+
+def admin_required(view):
+    """Restricts a view to requests carrying Config.ADMIN_TOKEN in the X-Admin-Token header."""
+    @wraps(view)
+    def wrapped(*args, **kwargs):
+        if not Config.ADMIN_TOKEN:
+            abort(404)
+        # Compared as bytes: compare_digest rejects non-ASCII strings
+        if not hmac.compare_digest(request.headers.get('X-Admin-Token', '').encode(), Config.ADMIN_TOKEN.encode()):
+            return jsonify({'error': 'Admin token required'}), 403
+        return view(*args, **kwargs)
+    return wrapped
+
+@app.route('/admin/profile', methods=['GET', 'POST', 'DELETE'])
+@admin_required
+def admin_profile():
+    """
+    Admin API for on-demand profiling. POST {"target": "ticks", "count": N}
+    profiles the next N simulation ticks; {"target": "<route rule>", "count": N}
+    the next N requests to that route, e.g. "/leaderboard/<int:tournament_id>".
+    GET lists the sessions, DELETE ?target=... stops one.
+    """
+    if request.method == 'GET':
+        return jsonify(profiler.status())
+    if request.method == 'DELETE':
+        if not profiler.cancel(request.args.get('target', '')):
+            return jsonify({'error': 'No profile for that target'}), 404
+        return jsonify(profiler.status())
+
+    data = request.get_json(silent=True) or {}
+    target = data.get('target')
+    try:
+        count = int(data.get('count', 1))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'count must be a number'}), 400
+    if target != TICKS and target not in {rule.rule for rule in app.url_map.iter_rules()}:
+        return jsonify({'error': f'target must be "{TICKS}" or a route rule'}), 400
+    if not 1 <= count <= Config.PROFILE_MAX_COUNT:
+        return jsonify({'error': f'count must be between 1 and {Config.PROFILE_MAX_COUNT}'}), 400
+    return jsonify(profiler.start(target, count)), 202
+
+@app.route('/admin/profile/download')
+@admin_required
+def admin_profile_download():
+    """
+    Downloads a target's aggregated profile: format=pstats (default, for
+    pstats/snakeviz) or format=text, sorted by sort= (default cumulative)
+    """
+    target = request.args.get('target', TICKS)
+    fmt = request.args.get('format', 'pstats')
+    sort = request.args.get('sort', 'cumulative')
+    if fmt not in ('pstats', 'text'):
+        return jsonify({'error': 'format must be "pstats" or "text"'}), 400
+    try:
+        body = profiler.export(target, fmt, sort)
+    except KeyError:
+        return jsonify({'error': f'Unknown sort key: {sort}'}), 400
+    if body is None:
+        return jsonify({'error': 'Nothing has been profiled for that target yet'}), 404
+    name = re.sub(r'[^A-Za-z0-9_.-]+', '_', target.strip('/')) or 'root'
+    if fmt == 'text':
+        return app.response_class(body, mimetype='text/plain')
+    return app.response_class(body, mimetype='application/octet-stream',
+                              headers={'Content-Disposition': f'attachment; filename={name}.prof'})
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus metrics for the simulator and the web app, from in-process counters"""
+    return app.response_class(metrics.registry.render(), mimetype=None, content_type=metrics.CONTENT_TYPE)
+
 @app.route('/')
 def home():
     """Home page showing available tournaments from the database"""
@@ -34,15 +243,18 @@ def home():
         tournaments = db.get_all_tournaments()
         active_tournament = db.get_active_tournament()
         next_available_tournament = db.get_next_available_tournament()
+        standings = db.get_season_standings(limit=10)
         return render_template('home.html', 
                              tournaments=tournaments, 
                              active_tournament=active_tournament,
-                             next_available_tournament=next_available_tournament)
+                             next_available_tournament=next_available_tournament,
+                             standings=standings)
     except Exception as e:
         return render_template('home.html', 
                              tournaments=[], 
                              active_tournament=None, 
                              next_available_tournament=None,
+                             standings=[],
                              error=f"Error loading data: {str(e)}")
 
 @app.route('/login', methods=['GET', 'POST'])
@@ -95,45 +307,83 @@ def dashboard():
                          bets=bets,
                          tournaments=tournaments)
 
+def submit_bet(user_id, tournament_id, player_id, amount, quoted_step, market='outright', opponent_id=None):
+    """
+    Checks that a player can be backed in a market, then places the bet at the
+    price quoted at quoted_step and waits for it to be committed. Returns
+    (bet_id, player, odds). Raises ValueError if the bet is refused.
+    """
+    view = load_leaderboard(tournament_id)
+    if not view:
+        raise ValueError('Tournament not found.')
+    if view['tournament']['status'] not in ('pending', 'active'):
+        raise ValueError('Betting is closed for this tournament.')
+    player = next((p for p in view['players'] if p['player_id'] == player_id), None)
+    if not player or player['status'] == 'cut':
+        raise ValueError('That player is not in contention.')
+    if opponent_id is not None and opponent_id == player_id:
+        raise ValueError('A player cannot be matched against themselves.')
+    quote = find_quote(view.get('prices', []), quoted_step, market, player_id, opponent_id)
+
+    ticket = betting_service.place_bet(user_id, tournament_id, player_id, amount, quote['odds'], market,
+                                       opponent_id, quote['round_num'], quote['group_num'])
+    return ticket.wait(), player, quote['odds']
+
 @app.route('/place_bet', methods=['POST'])
 def place_bet():
-    """This route will need to be updated to handle bets on simulated players/tournaments"""
-    flash("Betting on simulated tournaments is not yet implemented.")
-    return redirect(url_for('home'))
+    """Places a bet on a player to win a simulated tournament"""
+    if 'user_id' not in session:
+        return redirect(url_for('login'))
+
+    try:
+        tournament_id = int(request.form.get('tournament_id'))
+        player_id = int(request.form.get('player_id'))
+        amount = float(request.form.get('amount'))
+        quoted_step = int(request.form.get('quoted_step'))
+    except (TypeError, ValueError):
+        flash('Please choose a player and enter a valid bet amount.')
+        return redirect(request.referrer or url_for('home'))
+
+    try:
+        _, player, odds = submit_bet(session['user_id'], tournament_id, player_id, amount, quoted_step)
+        flash(f"Bet placed: ${amount:.2f} on {player['player_name']} at {odds:.2f}.")
+    except ValueError as e:
+        flash(f'Bet not placed: {str(e)}')
+    except Exception as e:
+        flash(f'Error placing bet: {str(e)}')
+    return redirect(url_for('leaderboard', tournament_id=tournament_id))
 
 @app.route('/leaderboard/<int:tournament_id>')
 def leaderboard(tournament_id):
     """Show tournament leaderboard from the database"""
     try:
-        tournament = db.get_tournament_by_id(tournament_id)
-        if not tournament:
+        view = load_leaderboard(tournament_id)
+        if not view:
             return "Tournament not found", 404
+        tournament, leaderboard_data = view['tournament'], view['players']
 
-        leaderboard_data = db.get_leaderboard_from_live_scores(tournament_id)
-        
-        # Determine if the current round is over to show the "Next Round" button
-        round_is_over = False
-        if tournament['status'] == 'active' and leaderboard_data:
-            # Check if all active players have finished the current round
-            # After cut is applied, only consider players who made the cut
-            active_players = [p for p in leaderboard_data if p['status'] != 'cut']
-            
-            if active_players:
-                all_finished = all(p['holes_played'] >= 18 for p in active_players)
-                round_is_over = all_finished
-
-        # After R2, the button should only appear AFTER the cut is applied.
-        if tournament['current_round'] == 2 and not tournament['cut_applied']:
-            round_is_over = False
+        round_is_over = is_round_over(tournament, leaderboard_data)
+
+        # The table only changes when the simulation advances, so it is rendered
+        # once per step. The page around it (nav, flash messages) stays per-user.
+        cache_key = (tournament_id, tournament['simulation_step'], tournament['current_round'],
+                     tournament['cut_applied'], tournament['status'])
+        leaderboard_table = leaderboard_fragments.get_or_render(
+            cache_key, lambda: Markup(render_template('_leaderboard_table.html', players=leaderboard_data,
+                                                      hole_stats=view['hole_stats'],
+                                                      current_round=tournament['current_round'])))
 
         return render_template('leaderboard.html',
-                             players=leaderboard_data,
+                             leaderboard_table=leaderboard_table,
                              tournament_name=tournament['name'],
                              tournament_id=tournament_id,
                              status=tournament['status'],
                              current_round=tournament['current_round'],
                              simulation_step=tournament['simulation_step'],
                              cut_applied=tournament['cut_applied'],
+                             projected_cut=view['projected_cut'],
+                             bet_players=[p for p in leaderboard_data if p['status'] != 'cut'],
+                             price_board=(view.get('prices') or [None])[0],
                              round_is_over=round_is_over)
     except Exception as e:
         # Simplified error handling for brevity
@@ -154,14 +404,15 @@ def next_round(tournament_id):
     
     # --- New Logic for Round 4 Regrouping ---
     if next_round_num == 4:
-        print("Regrouping players for the final round...")
+        logger.info("Regrouping players for the final round...")
         # Get the current leaderboard to find players who made the cut
         leaderboard = db.get_leaderboard_from_live_scores(tournament_id)
         players_made_cut = [p for p in leaderboard if p['status'] != 'cut']
         
         # Regroup and set new tee times for Round 4
         sim_service.regroup_players(tournament_id, 4, players_made_cut)
-        print("Players have been regrouped for Round 4.")
+        logger.info("Players have been regrouped for Round 4.",
+                    extra={'event': 'regrouped', 'tournament_id': tournament_id, 'round': 4})
 
     # Record the simulation step when the next round is starting
     current_step = db.get_simulation_step(tournament_id)
@@ -169,6 +420,7 @@ def next_round(tournament_id):
 
     # Advance the round
     db.set_current_round(tournament_id, next_round_num)
+    mark_leaderboard_dirty(tournament_id)
     
     return redirect(url_for('leaderboard', tournament_id=tournament_id))
 
@@ -179,6 +431,7 @@ def start_tournament(tournament_id):
     """
     try:
         db.start_tournament(tournament_id)
+        mark_leaderboard_dirty(tournament_id)
         tournament = db.get_tournament_by_id(tournament_id)
         flash(f"Tournament {tournament['name']} has started!")
     except ValueError as e:
@@ -197,6 +450,164 @@ def api_tournaments():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/leaderboard/<int:tournament_id>')
+def api_leaderboard(tournament_id):
+    """API endpoint to get the live leaderboard, served from the shared snapshot when available"""
+    try:
+        view = load_leaderboard(tournament_id)
+        if not view:
+            return jsonify({'error': 'Tournament not found'}), 404
+        return jsonify({
+            'tournament': view['tournament'],
+            'players': view['players'],
+            'projected_cut': view['projected_cut'],
+            'round_is_over': is_round_over(view['tournament'], view['players']),
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/leaderboard/<int:tournament_id>/compact')
+def api_leaderboard_compact(tournament_id):
+    """
+    API endpoint for the leaderboard as compact column arrays, polled by the
+    leaderboard page. Pass names=1 to include the player names.
+    """
+    try:
+        view = load_leaderboard(tournament_id)
+        if not view:
+            return jsonify({'error': 'Tournament not found'}), 404
+        tournament, leaderboard_data = view['tournament'], view['players']
+
+        include_names = request.args.get('names') == '1'
+        cache_key = (tournament_id, tournament['simulation_step'], tournament['current_round'],
+                     tournament['cut_applied'], tournament['status'], include_names)
+        body = compact_leaderboards.get_or_render(cache_key, lambda: json.dumps(
+            build_compact_leaderboard(tournament, leaderboard_data, is_round_over(tournament, leaderboard_data),
+                                      view['projected_cut'], view['hole_stats'], include_names,
+                                      (view.get('prices') or [None])[0]),
+            separators=(',', ':')))
+        return app.response_class(body, mimetype='application/json')
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/tournaments/<int:tournament_id>/cut_line')
+def api_cut_line(tournament_id):
+    """API endpoint for the projected cut line while rounds 1 and 2 are in play"""
+    try:
+        view = load_leaderboard(tournament_id)
+        if not view:
+            return jsonify({'error': 'Tournament not found'}), 404
+        return jsonify({
+            'tournament_id': tournament_id,
+            'cut_applied': bool(view['tournament']['cut_applied']),
+            'projected_cut': view['projected_cut'],
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/tournaments/<int:tournament_id>/hole_stats')
+def api_hole_stats(tournament_id):
+    """
+    API endpoint for per-hole scoring statistics. Defaults to the current
+    round; pass round=N for another round or round=all for every round.
+    """
+    try:
+        view = load_leaderboard(tournament_id)
+        if not view:
+            return jsonify({'error': 'Tournament not found'}), 404
+
+        round_param = request.args.get('round')
+        current_round = view['tournament']['current_round']
+        if round_param is None or round_param == str(current_round):
+            hole_stats = view['hole_stats']
+        elif round_param == 'all':
+            hole_stats = db.get_hole_stats(tournament_id)
+        else:
+            hole_stats = db.get_hole_stats(tournament_id, int(round_param))
+        return jsonify({'tournament_id': tournament_id, 'hole_stats': hole_stats})
+    except ValueError:
+        return jsonify({'error': 'round must be a round number or "all"'}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/tournaments/<int:tournament_id>/prices')
+def api_prices(tournament_id):
+    """
+    API endpoint for the current price board: win odds for every player still
+    in contention, head-to-heads within each tee group and the best score in
+    each group this round. Bets are placed against the returned step.
+    """
+    try:
+        view = load_leaderboard(tournament_id)
+        if not view:
+            return jsonify({'error': 'Tournament not found'}), 404
+        prices = view.get('prices')
+        if not prices:
+            return jsonify({'error': 'Betting is closed for this tournament'}), 404
+        return jsonify(dict(prices[0], tournament_id=tournament_id))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/bets', methods=['POST'])
+def api_place_bet():
+    """
+    API endpoint to place a bet; responds once the bet has been committed.
+    market is 'outright' (the default), 'round_matchup' or
+    'tournament_matchup' (with an opponent_id from the same tee group) or
+    'group' for the best score in the player's tee group this round.
+    """
+    if 'user_id' not in session:
+        return jsonify({'error': 'Login required'}), 401
+
+    data = request.get_json(silent=True) or {}
+    try:
+        tournament_id = int(data['tournament_id'])
+        player_id = int(data['player_id'])
+        amount = float(data['amount'])
+        quoted_step = int(data['quoted_step'])
+        market = data.get('market', 'outright')
+        opponent_id = int(data['opponent_id']) if data.get('opponent_id') is not None else None
+    except (KeyError, TypeError, ValueError):
+        return jsonify({'error': 'tournament_id, player_id, amount and quoted_step are required'}), 400
+
+    try:
+        bet_id, _, odds = submit_bet(session['user_id'], tournament_id, player_id, amount, quoted_step,
+                                     market, opponent_id)
+        return jsonify({'bet_id': bet_id, 'odds': odds,
+                        'balance': betting_service.available_balance(session['user_id'])}), 201
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/standings')
+def api_standings():
+    """API endpoint for the season standings; pass order_by=money for the money list"""
+    try:
+        order_by = request.args.get('order_by', 'points')
+        if order_by not in ('points', 'money'):
+            return jsonify({'error': 'order_by must be "points" or "money"'}), 400
+        return jsonify(db.get_season_standings(order_by))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/player_stats')
+@app.route('/api/player_stats/<int:player_id>')
+def api_player_stats(player_id=None):
+    """
+    API endpoint for season stats across completed tournaments: every player
+    by form, or a single player
+    """
+    try:
+        if player_id is None:
+            return jsonify(db.get_player_stats())
+        stats = db.get_player_stats(player_id)
+        if not stats:
+            return jsonify({'error': 'No completed rounds for this player'}), 404
+        return jsonify(stats)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/players/<int:tournament_id>')
 def api_players(tournament_id):
     """API endpoint to get players for a given tournament"""
@@ -209,6 +620,13 @@ def api_players(tournament_id):
         return jsonify({'error': str(e)}), 500
 
 if __name__ == '__main__':
-    scheduler.add_job(id='Live Simulation Job', func=advance_simulation, trigger='interval', seconds=1)
+    # Shared-cache databases fail reads during another thread's write instead
+    # of waiting, and the app always has the scheduler and bet writer running
+    if is_memory_database(Config.DATABASE_PATH):
+        raise SystemExit('The app needs a database file: in-memory databases are for tests and batch runs only.')
+    betting_service.reconcile()
+    scheduler.add_listener(metrics.record_scheduler_event, metrics.SCHEDULER_EVENTS)
+    scheduler.add_job(id='Live Simulation Job', func=advance_simulation, trigger='interval',
+                      seconds=Config.SIMULATION_TICK_SECONDS)
     scheduler.start()
     app.run(debug=True, use_reloader=False)
@@ -0,0 +1 @@
+"""Benchmarks for the simulation and data-access hot paths. See benchmarks/run.py."""
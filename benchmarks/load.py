@@ -0,0 +1,598 @@
+"""
+Load test: many concurrent viewers against a local app with a live tournament.
+
+    python -m benchmarks.load                         # 1000 clients for 60s
+    python -m benchmarks.load --clients 3000 --duration 120 --mix leaderboard=70,dashboard=20,api=10
+
+Seeds a temporary database from a fixed seed, starts a tournament in it and
+serves the app from a separate process with the simulation scheduler running,
+exactly as `python app.py` does, so the viewers and the ticks compete for the
+same server the way they do in production. golf_betting.db is never touched.
+
+Virtual clients are asyncio tasks in this process, each holding at most one
+connection (opened per request, with Connection: close):
+
+    leaderboard  opens the leaderboard page, then polls the compact endpoint
+                 every second, reloading the page when the round or status
+                 changes, as templates/leaderboard.html does
+    dashboard    logs in, then views the dashboard every --dashboard-interval
+                 seconds
+    api          polls the JSON leaderboard, prices and cut line in turn,
+                 one request a second
+
+The test runs a --baseline period with no clients, ramps the clients up over
+--ramp seconds and holds them for --duration. The app's /metrics is scraped
+every --interval seconds throughout; the report gives throughput, p50/p99
+latency and error rate for each endpoint and each interval, next to the tick
+durations and scheduler lag of the same interval, and the correlation between
+them. A request errs when it fails to connect, times out or returns 5xx.
+The report is written as JSON to benchmarks/results/ (or --output).
+
+The load generator shares the machine with the server, so on a small machine
+it competes with it for CPU; the client count it can drive is part of what
+the report shows.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from urllib.parse import urlencode
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import Config
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCHMARK_DIR, 'results')
+ROOT_DIR = os.path.dirname(BENCHMARK_DIR)
+
+SEED = 2025
+FIELD_SIZE = 150
+DASHBOARD_USERS = 200
+BETS_PER_USER = 5
+DEFAULT_MIX = 'leaderboard=80,dashboard=10,api=10'
+
+# /metrics series the report follows
+TICK_SUM = 'golf_tick_duration_seconds_sum'
+TICK_COUNT = 'golf_tick_duration_seconds_count'
+TICK_BUCKET = 'golf_tick_duration_seconds_bucket'
+LAG_SUM = 'golf_scheduler_lag_seconds_sum'
+LAG_COUNT = 'golf_scheduler_lag_seconds_count'
+OVER_BUDGET = 'golf_ticks_over_budget_total'
+SKIPPED = 'golf_scheduler_skipped_ticks_total'
+
+_SAMPLE_LINE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{[^}]*\})?\s+(\S+)$')
+
+
+# --- Server ---
+
+def prepare_database(directory, field_size=FIELD_SIZE, seed=SEED):
+    """
+    Seeds a league with one tournament, starts it, and creates the users the
+    dashboard clients log in as, each with a few bets. Returns (path, tournament_id).
+    """
+    from models.database import db, init_db
+    from services.seeder import bulk_seed
+
+    path = os.path.join(directory, 'load.db')
+    Config.DATABASE_PATH = path
+    init_db(path)
+    bulk_seed(num_players=field_size, num_tournaments=1, field_size=field_size, seed=seed, db_path=path)
+    tournament_id = db.get_next_available_tournament()['id']
+    db.start_tournament(tournament_id)
+    players = [p['id'] for p in db.get_tournament_players(tournament_id)]
+    bets = []
+    for i in range(DASHBOARD_USERS):
+        user_id = db.create_user(f'viewer{i}')
+        bets.extend((user_id, tournament_id, players[(i + j) % len(players)], 10.0, 20.0, 'outright', None, None, None)
+                    for j in range(BETS_PER_USER))
+    db.save_bet_batch(bets)
+    return path, tournament_id
+
+
+def serve(database_path, port, backlog):
+    """Serves the app on database_path with the simulation scheduler running, as app.py does."""
+    import logging
+    from werkzeug.serving import ThreadedWSGIServer
+
+    Config.DATABASE_PATH = database_path
+    import app as application
+    from services import metrics
+    from services.betting_service import betting_service
+
+    # Thousands of clients connect at once; the default listen queue of 128 would refuse most
+    ThreadedWSGIServer.request_queue_size = backlog
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+
+    betting_service.reconcile()
+    application.scheduler.add_listener(metrics.record_scheduler_event, metrics.SCHEDULER_EVENTS)
+    application.scheduler.add_job(id='Live Simulation Job', func=application.advance_simulation,
+                                  trigger='interval', seconds=Config.SIMULATION_TICK_SECONDS)
+    application.scheduler.start()
+    application.app.run(host='127.0.0.1', port=port, threaded=True, use_reloader=False)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(directory, database_path, port, backlog):
+    """Starts serve() in a child process, logging to server.log in directory."""
+    env = dict(os.environ, LOG_LEVEL='WARNING',
+               LEADERBOARD_SNAPSHOT_DIR=os.path.join(directory, 'snapshots'))
+    log = open(os.path.join(directory, 'server.log'), 'w')
+    return subprocess.Popen(
+        [sys.executable, '-m', 'benchmarks.load', '--serve', database_path, '--port', str(port),
+         '--backlog', str(backlog)],
+        cwd=ROOT_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+
+# --- HTTP ---
+
+class Response:
+    __slots__ = ('status', 'headers', 'body')
+
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def json(self):
+        return json.loads(self.body)
+
+
+async def http_request(port, method, path, headers=None, body=None, timeout=10.0):
+    """One HTTP/1.1 request on its own connection to the local server."""
+    lines = [f'{method} {path} HTTP/1.1', f'Host: 127.0.0.1:{port}', 'Connection: close']
+    lines.extend(f'{name}: {value}' for name, value in (headers or {}).items())
+    if body is not None:
+        lines.append(f'Content-Length: {len(body)}')
+    request = ('\r\n'.join(lines) + '\r\n\r\n').encode() + (body or b'')
+
+    async def exchange():
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        try:
+            writer.write(request)
+            await writer.drain()
+            return await reader.read()
+        finally:
+            writer.close()
+
+    raw = await asyncio.wait_for(exchange(), timeout)
+    head, _, content = raw.partition(b'\r\n\r\n')
+    status_line, *header_lines = head.decode('latin-1').split('\r\n')
+    response_headers = {}
+    for line in header_lines:
+        name, _, value = line.partition(':')
+        response_headers.setdefault(name.strip().lower(), []).append(value.strip())
+    return Response(int(status_line.split()[1]), response_headers, content)
+
+
+# --- Clients ---
+
+class LoadRun:
+    """Shared state of one run: the target, the clock and every request's outcome."""
+
+    def __init__(self, port, tournament_id, timeout):
+        self.port = port
+        self.tournament_id = tournament_id
+        self.timeout = timeout
+        self.started = time.monotonic()
+        self.boundaries = []  # phase ends, in seconds from the start: baseline, ramp, load
+        self.stop_at = None
+        self.requests = []  # (finished at, endpoint, seconds, ok)
+
+    @property
+    def stopping(self):
+        return time.monotonic() >= self.stop_at
+
+    async def request(self, endpoint, method, path, headers=None, body=None):
+        """Sends a request and records its outcome under endpoint. Returns the response, or None on error."""
+        started = time.monotonic()
+        try:
+            response = await http_request(self.port, method, path, headers, body, self.timeout)
+        except (OSError, asyncio.TimeoutError, ValueError, IndexError):
+            response = None
+        finished = time.monotonic()
+        ok = response is not None and response.status < 500
+        self.requests.append((finished - self.started, endpoint, finished - started, ok))
+        return response if ok else None
+
+    async def every(self, interval, action):
+        """Calls action every interval seconds until the run stops, skipping beats missed while it ran."""
+        next_beat = time.monotonic()
+        while not self.stopping:
+            await action()
+            next_beat += interval
+            now = time.monotonic()
+            if next_beat < now:
+                next_beat += (now - next_beat) // interval * interval + interval
+            await asyncio.sleep(next_beat - now)
+
+
+async def leaderboard_client(run, options):
+    """A leaderboard page left open: loads it, then polls the compact board every second."""
+    tid = run.tournament_id
+    state = {}
+    names = set()
+
+    async def load_page():
+        if await run.request('leaderboard page', 'GET', f'/leaderboard/{tid}') is not None:
+            state.clear()
+
+    async def poll():
+        response = await run.request('compact poll', 'GET', f'/api/leaderboard/{tid}/compact')
+        if response is None:
+            return
+        data = response.json()
+        page = (data['status'], data['round'], data['round_is_over'])
+        if state.get('page', page) != page:
+            await load_page()
+        state['page'] = page
+        if any(str(player_id) not in names for player_id in data['ids']):
+            named = await run.request('compact poll', 'GET', f'/api/leaderboard/{tid}/compact?names=1')
+            if named is not None:
+                names.update(named.json().get('names', {}))
+
+    await load_page()
+    await run.every(1.0, poll)
+
+
+async def dashboard_client(run, options, number):
+    """A logged-in user checking their bets on the dashboard."""
+    body = urlencode({'username': f'viewer{number % DASHBOARD_USERS}'}).encode()
+    response = await run.request('login', 'POST', '/login',
+                                 {'Content-Type': 'application/x-www-form-urlencoded'}, body)
+    if response is None:
+        return
+    cookies = '; '.join(c.split(';', 1)[0] for c in response.headers.get('set-cookie', []))
+    await run.every(options.dashboard_interval,
+                    lambda: run.request('dashboard', 'GET', '/dashboard', {'Cookie': cookies}))
+
+
+async def api_client(run, options):
+    """A script polling the JSON API once a second, cycling through its endpoints."""
+    tid = run.tournament_id
+    endpoints = [('api leaderboard', f'/api/leaderboard/{tid}'),
+                 ('api prices', f'/api/tournaments/{tid}/prices'),
+                 ('api cut line', f'/api/tournaments/{tid}/cut_line')]
+    turn = random.randrange(len(endpoints))
+
+    async def poll():
+        nonlocal turn
+        endpoint, path = endpoints[turn % len(endpoints)]
+        turn += 1
+        await run.request(endpoint, 'GET', path)
+
+    await run.every(1.0, poll)
+
+
+CLIENTS = {
+    'leaderboard': lambda run, options, number: leaderboard_client(run, options),
+    'dashboard': dashboard_client,
+    'api': lambda run, options, number: api_client(run, options),
+}
+
+
+def parse_mix(text):
+    """'leaderboard=80,dashboard=10,api=10' -> {'leaderboard': 0.8, ...}"""
+    weights = {}
+    for part in text.split(','):
+        kind, _, weight = part.partition('=')
+        if kind.strip() not in CLIENTS:
+            raise ValueError(f"Unknown client kind '{kind.strip()}'; expected one of {', '.join(CLIENTS)}")
+        weights[kind.strip()] = float(weight)
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError('The client mix needs a positive weight.')
+    return {kind: weight / total for kind, weight in weights.items()}
+
+
+def client_kinds(mix, count):
+    """count client kinds in the mix's proportions, interleaved so the ramp adds every kind evenly."""
+    kinds = []
+    for kind, share in mix.items():
+        kinds.extend([kind] * round(share * count))
+    kinds = kinds[:count] + [next(iter(mix))] * (count - len(kinds))
+    random.Random(SEED).shuffle(kinds)
+    return kinds
+
+
+async def start_client(run, options, kind, number, start):
+    await asyncio.sleep(run.started + start - time.monotonic())
+    await CLIENTS[kind](run, options, number)
+
+
+# --- Monitoring ---
+
+def parse_metrics(text):
+    """Prometheus text -> {'name{labels}': value}"""
+    samples = {}
+    for line in text.splitlines():
+        match = _SAMPLE_LINE.match(line)
+        if match:
+            name, labels, value = match.groups()
+            samples[name + (labels or '')] = float(value)
+    return samples
+
+
+def series_total(samples, name):
+    """Sum of a metric over all its label sets."""
+    return sum(value for key, value in samples.items() if key == name or key.startswith(name + '{'))
+
+
+def histogram_quantile(before, after, name, q):
+    """Estimates quantile q of observations made between two scrapes from the histogram's buckets."""
+    buckets = []
+    for key, value in after.items():
+        if key.startswith(name + '{le="'):
+            bound = key[len(name) + 5:-2]
+            buckets.append((float('inf') if bound == '+Inf' else float(bound), value - before.get(key, 0.0)))
+    buckets.sort()
+    if not buckets or buckets[-1][1] <= 0:
+        return None
+    rank = q * buckets[-1][1]
+    for bound, cumulative in buckets:
+        if cumulative >= rank:
+            return bound
+    return None
+
+
+async def monitor(run, interval, snapshots):
+    """
+    Scrapes /metrics every interval seconds, and at each phase boundary so no
+    interval straddles two phases. Starts the next round when one is over, as
+    a viewer would.
+    """
+    tid = run.tournament_id
+    while True:
+        try:
+            response = await http_request(run.port, 'GET', '/metrics', timeout=run.timeout)
+            snapshots.append((time.monotonic() - run.started, parse_metrics(response.body.decode())))
+            board = (await http_request(run.port, 'GET', f'/api/leaderboard/{tid}/compact', timeout=run.timeout)).json()
+            if board['status'] == 'active' and board['round_is_over'] and board['round'] < 4:
+                await http_request(run.port, 'POST', f'/next_round/{tid}', timeout=run.timeout)
+        except (OSError, asyncio.TimeoutError, ValueError, KeyError, IndexError):
+            pass  # a missed scrape leaves a longer interval
+        elapsed = time.monotonic() - run.started
+        if elapsed >= run.boundaries[-1]:
+            return
+        await asyncio.sleep(min([interval] + [b - elapsed for b in run.boundaries if b > elapsed]))
+
+
+async def wait_until_ready(port, process, timeout=60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'The server exited with status {process.returncode}')
+        try:
+            if (await http_request(port, 'GET', '/metrics', timeout=2.0)).status == 200:
+                return
+        except (OSError, asyncio.TimeoutError, ValueError, IndexError):
+            pass
+        await asyncio.sleep(0.25)
+    raise RuntimeError('The server did not come up')
+
+
+# --- Report ---
+
+def percentile(values, q):
+    """Nearest-rank percentile of values (0 < q <= 1), or None when empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, int(round(q * len(ordered))) - 1))]
+
+
+def request_stats(requests, seconds):
+    latencies = [latency for _, _, latency, _ in requests]
+    errors = sum(1 for *_, ok in requests if not ok)
+    return {
+        'requests': len(requests),
+        'throughput_per_second': round(len(requests) / seconds, 2) if seconds else None,
+        'p50_ms': round(percentile(latencies, 0.5) * 1000, 2) if latencies else None,
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2) if latencies else None,
+        'error_rate': round(errors / len(requests), 4) if requests else 0.0,
+    }
+
+
+def tick_stats(before, after, seconds):
+    ticks = after.get(TICK_COUNT, 0.0) - before.get(TICK_COUNT, 0.0)
+    lags = after.get(LAG_COUNT, 0.0) - before.get(LAG_COUNT, 0.0)
+    p99 = histogram_quantile(before, after, TICK_BUCKET, 0.99)
+    return {
+        'ticks': int(ticks),
+        'ticks_per_second': round(ticks / seconds, 3) if seconds else None,
+        'tick_mean_ms': round((after.get(TICK_SUM, 0.0) - before.get(TICK_SUM, 0.0)) / ticks * 1000, 2) if ticks else None,
+        'tick_p99_ms_at_most': None if p99 is None else (p99 * 1000 if p99 != float('inf') else 'inf'),
+        'scheduler_lag_mean_ms': round((after.get(LAG_SUM, 0.0) - before.get(LAG_SUM, 0.0)) / lags * 1000, 2) if lags else None,
+        'ticks_over_budget': int(after.get(OVER_BUDGET, 0.0) - before.get(OVER_BUDGET, 0.0)),
+        'ticks_skipped': int(series_total(after, SKIPPED) - series_total(before, SKIPPED)),
+    }
+
+
+def correlation(xs, ys):
+    pairs = [(x, y) for x, y in zip(xs, ys) if x is not None and y is not None]
+    if len(pairs) < 3:
+        return None
+    try:
+        return round(statistics.correlation(*zip(*pairs)), 3)
+    except statistics.StatisticsError:
+        return None  # one of the series is constant
+
+
+def build_report(run, snapshots, options, load_started, load_full):
+    windows = []
+    for (start, before), (end, after) in zip(snapshots, snapshots[1:]):
+        in_window = [r for r in run.requests if start <= r[0] < end]
+        window = {'start': round(start, 1), 'end': round(end, 1),
+                  'phase': 'baseline' if start < load_started else ('ramp' if start < load_full else 'load')}
+        window.update(request_stats(in_window, end - start))
+        window.update(tick_stats(before, after, end - start))
+        windows.append(window)
+
+    def phase(name):
+        chosen = [i for i, w in enumerate(windows) if w['phase'] == name]
+        if not chosen:
+            return None
+        start, before = snapshots[chosen[0]]
+        end, after = snapshots[chosen[-1] + 1]
+        summary = {'seconds': round(end - start, 1)}
+        summary.update(request_stats([r for r in run.requests if start <= r[0] < end], end - start))
+        summary.update(tick_stats(before, after, end - start))
+        return summary
+
+    load_seconds = run.boundaries[-1] - load_full
+    load = [r for r in run.requests if load_full <= r[0] < run.boundaries[-1]]
+    endpoints = {}
+    for endpoint in sorted({r[1] for r in load}):
+        endpoints[endpoint] = request_stats([r for r in load if r[1] == endpoint], load_seconds)
+
+    busy = [w for w in windows if w['phase'] != 'baseline']
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'options': {'clients': options.clients, 'mix': parse_mix(options.mix), 'duration': options.duration,
+                    'ramp': options.ramp, 'baseline': options.baseline, 'field_size': options.field_size,
+                    'dashboard_interval': options.dashboard_interval},
+        'baseline': phase('baseline'),
+        'load': phase('load'),
+        'endpoints': endpoints,
+        'correlation': {
+            'throughput_vs_tick_mean': correlation([w['throughput_per_second'] for w in busy],
+                                                   [w['tick_mean_ms'] for w in busy]),
+            'throughput_vs_scheduler_lag': correlation([w['throughput_per_second'] for w in busy],
+                                                       [w['scheduler_lag_mean_ms'] for w in busy]),
+            'p99_vs_tick_mean': correlation([w['p99_ms'] for w in busy], [w['tick_mean_ms'] for w in busy]),
+        },
+        'windows': windows,
+    }
+
+
+def _ms(value):
+    return '-' if value is None else f'{value:.1f}'
+
+
+def print_report(report):
+    print(f"\n{'phase':10s} {'req/s':>8s} {'p50 ms':>8s} {'p99 ms':>8s} {'errors':>7s} "
+          f"{'ticks/s':>8s} {'tick ms':>8s} {'lag ms':>8s} {'over':>5s} {'skip':>5s}")
+    for name in ('baseline', 'load'):
+        p = report[name]
+        if p:
+            print(f"{name:10s} {p['throughput_per_second'] or 0:8.1f} {_ms(p['p50_ms']):>8s} {_ms(p['p99_ms']):>8s} "
+                  f"{p['error_rate']:7.2%} {p['ticks_per_second'] or 0:8.2f} {_ms(p['tick_mean_ms']):>8s} "
+                  f"{_ms(p['scheduler_lag_mean_ms']):>8s} {p['ticks_over_budget']:5d} {p['ticks_skipped']:5d}")
+    print(f"\n{'endpoint (under full load)':28s} {'req/s':>8s} {'p50 ms':>8s} {'p99 ms':>8s} {'errors':>7s}")
+    for endpoint, e in report['endpoints'].items():
+        print(f"{endpoint:28s} {e['throughput_per_second'] or 0:8.1f} {_ms(e['p50_ms']):>8s} "
+              f"{_ms(e['p99_ms']):>8s} {e['error_rate']:7.2%}")
+    print(f"\n{'window':>13s} {'phase':8s} {'req/s':>8s} {'p99 ms':>8s} {'errors':>7s} {'tick ms':>8s} {'lag ms':>8s}")
+    for w in report['windows']:
+        print(f"{w['start']:6.1f}-{w['end']:<6.1f} {w['phase']:8s} {w['throughput_per_second'] or 0:8.1f} "
+              f"{_ms(w['p99_ms']):>8s} {w['error_rate']:7.2%} {_ms(w['tick_mean_ms']):>8s} "
+              f"{_ms(w['scheduler_lag_mean_ms']):>8s}")
+    print('\nCorrelation across loaded windows: '
+          + ', '.join(f'{name} {value}' for name, value in report['correlation'].items()))
+
+
+# --- Runner ---
+
+async def run_load(options, port, tournament_id, process):
+    await wait_until_ready(port, process)
+    run = LoadRun(port, tournament_id, options.timeout)
+    load_started = options.baseline
+    load_full = load_started + options.ramp
+    run.boundaries = [load_started, load_full, load_full + options.duration]
+    run.stop_at = run.started + run.boundaries[-1]
+    snapshots = []
+    watcher = asyncio.create_task(monitor(run, options.interval, snapshots))
+
+    print(f"Baseline: {options.baseline}s with no clients")
+    print(f"Load: {options.clients} clients ramping up over {options.ramp}s, then {options.duration}s at full load")
+    kinds = client_kinds(parse_mix(options.mix), options.clients)
+    clients = [asyncio.create_task(start_client(run, options, kind, number,
+                                                load_started + options.ramp * number / options.clients))
+               for number, kind in enumerate(kinds)]
+    await asyncio.gather(*clients, return_exceptions=True)
+    await watcher
+    return build_report(run, snapshots, options, load_started, load_full)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load test the app with a live tournament advancing.')
+    parser.add_argument('--clients', type=int, default=1000, help='Concurrent virtual clients')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f'Client kinds by weight (default {DEFAULT_MIX})')
+    parser.add_argument('--duration', type=float, default=60, help='Seconds at full load')
+    parser.add_argument('--ramp', type=float, default=10, help='Seconds to start all clients over')
+    parser.add_argument('--baseline', type=float, default=10, help='Seconds of ticks with no clients first')
+    parser.add_argument('--interval', type=float, default=5, help='Seconds between /metrics scrapes')
+    parser.add_argument('--dashboard-interval', type=float, default=5, help='Seconds between dashboard views')
+    parser.add_argument('--field-size', type=int, default=FIELD_SIZE, help='Players in the tournament')
+    parser.add_argument('--timeout', type=float, default=10, help='Seconds before a request counts as failed')
+    parser.add_argument('--backlog', type=int, default=4096, help="The server's listen queue length")
+    parser.add_argument('--port', type=int, help='Port to serve on (default: a free one)')
+    parser.add_argument('--output', help='Where to write the JSON report')
+    parser.add_argument('--max-error-rate', type=float, help='Exit with status 1 above this error rate under load')
+    parser.add_argument('--max-p99-ms', type=float, help='Exit with status 1 above this p99 latency under load')
+    parser.add_argument('--serve', metavar='DATABASE', help=argparse.SUPPRESS)
+    options = parser.parse_args(argv)
+
+    if options.serve:
+        serve(options.serve, options.port, options.backlog)
+        return 0
+    if options.clients < 1:
+        parser.error('--clients must be at least 1')
+    try:
+        parse_mix(options.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    directory = tempfile.mkdtemp(prefix='golf-load-')
+    process = None
+    try:
+        print(f"Seeding a {options.field_size}-player tournament in {directory}")
+        database_path, tournament_id = prepare_database(directory, options.field_size)
+        port = options.port or free_port()
+        process = start_server(directory, database_path, port, options.backlog)
+        report = asyncio.run(run_load(options, port, tournament_id, process))
+    finally:
+        if process is not None:
+            process.terminate()
+            try:
+                process.wait(10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        shutil.rmtree(directory, ignore_errors=True)
+
+    print_report(report)
+    output = options.output or os.path.join(
+        RESULTS_DIR, f"load-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {output}")
+
+    load = report['load'] or {}
+    failures = []
+    if options.max_error_rate is not None and load.get('error_rate', 0) > options.max_error_rate:
+        failures.append(f"error rate {load['error_rate']:.2%} above {options.max_error_rate:.2%}")
+    if options.max_p99_ms is not None and (load.get('p99_ms') or 0) > options.max_p99_ms:
+        failures.append(f"p99 {load['p99_ms']} ms above {options.max_p99_ms} ms")
+    for failure in failures:
+        print(f"FAILED: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
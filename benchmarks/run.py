@@ -0,0 +1,412 @@
+"""
+Benchmarks for the simulation and data-access hot paths.
+
+    python -m benchmarks.run                  # run everything and check query limits
+    python -m benchmarks.run --check-times    # also fail on time limits (a quiet, known machine)
+    python -m benchmarks.run --only tick      # only benchmarks whose name contains "tick"
+    python -m benchmarks.run --no-check       # record timings without failing on regressions
+
+Every benchmark runs against temporary databases seeded from a fixed seed, so
+golf_betting.db is never touched and runs are repeatable. Tournament states
+(just started, end of round 2, end of round 4) are reached by playing the
+tournament with the real simulation once per field size, then copied with
+SQLite's backup API for each timed run.
+
+Results are written as JSON to benchmarks/results/ (or --output), one file per
+run, recording the commit, the environment and each benchmark's timings.
+Each sample also counts the SQL statements run through the Database layer.
+A benchmark regresses when its query count exceeds its limit in
+benchmarks/thresholds.json; the runner then exits with status 1. Query
+counts are deterministic for a seed, so they catch N+1 regressions that
+timings are too noisy to. Median times over their limits are reported as
+slow, and only fail the run with --check-times, since they depend on the
+machine; the limits leave about 2x headroom over medians recorded on a
+typical development machine.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import Config
+from models.database import db, init_db, copy_database
+from services.metrics import SQL_QUERIES
+from services.simulation_service import SimulationService
+from services.seeder import seed_database, bulk_seed
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+THRESHOLDS_PATH = os.path.join(BENCHMARK_DIR, 'thresholds.json')
+RESULTS_DIR = os.path.join(BENCHMARK_DIR, 'results')
+
+SEED = 2025
+TICK_FIELD_SIZES = (30, 150, 300)
+# Field size for the benchmarks that need a whole tournament played
+TOURNAMENT_FIELD_SIZE = 150
+HOLE_SCORE_CALLS = 20000
+TOURNAMENT_BETS = 1000
+
+BENCHMARKS = []
+
+
+def benchmark(name, unit=None):
+    """
+    Registers a benchmark. The function is called with a Workspace and returns
+    a list of samples from timed(); when unit is given, the result also
+    reports operations per second as unit/s.
+    """
+    def register(func):
+        BENCHMARKS.append({'name': name, 'func': func, 'unit': unit})
+        return func
+    return register
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silences the simulation's progress output while timing."""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+class Workspace:
+    """
+    Temporary databases for one benchmark run. Database states are built once,
+    cached by name and copied for each timed run.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._states = {}
+        self._copies = 0
+
+    def path(self, name):
+        return os.path.join(self.directory, f'{name}.db')
+
+    def use(self, path):
+        """Points the application's database at path."""
+        Config.DATABASE_PATH = path
+
+    def copy(self, state):
+        """Copies a cached state into a fresh database, uses it and returns (path, tournament_id)."""
+        source, tournament_id = self.state(state)
+        self._copies += 1
+        path = self.path(f'copy{self._copies}')
+        copy_database(source, path)
+        self.use(path)
+        return path, tournament_id
+
+    def discard(self, path):
+        if os.path.exists(path):
+            os.remove(path)
+
+    def state(self, name):
+        """Returns (path, tournament_id) for a named tournament state, building it on first use."""
+        if name not in self._states:
+            kind, field_size = name.rsplit('-', 1)
+            if kind == 'started':
+                self._build_started(int(field_size))
+            else:
+                self._build_played(int(field_size))
+        return self._states[name]
+
+    def _save(self, name, tournament_id):
+        path = self.path(name)
+        copy_database(Config.DATABASE_PATH, path)
+        self._states[name] = (path, tournament_id)
+
+    def _build_started(self, field_size):
+        """A league of field_size players with its only tournament just started."""
+        path = self.path(f'league-{field_size}')
+        with quiet():
+            init_db(path)
+            bulk_seed(num_players=field_size, num_tournaments=1, field_size=field_size, seed=SEED, db_path=path)
+        self.use(path)
+        tournament_id = db.get_next_available_tournament()['id']
+        db.start_tournament(tournament_id)
+        user_id = db.create_user('benchmark')
+        # Bets spread over the field, so completing the tournament settles a realistic book
+        players = [p['id'] for p in db.get_tournament_players(tournament_id)]
+        db.save_bet_batch([(user_id, tournament_id, players[i % len(players)], 10.0, 20.0, 'outright', None, None, None)
+                           for i in range(TOURNAMENT_BETS)])
+        self._save(f'started-{field_size}', tournament_id)
+
+    def _build_played(self, field_size):
+        """Plays the tournament through, saving the state at the end of round 2 and of round 4."""
+        _, tournament_id = self.copy(f'started-{field_size}')
+        sim = SimulationService()
+        with quiet():
+            sim.get_cut_tracker(tournament_id)
+            play_until(sim, tournament_id, lambda t: t['current_round'] == 2 and round_finished(t))
+            self._save(f'round2-{field_size}', tournament_id)
+            play_until(sim, tournament_id, lambda t: t['current_round'] == 4 and round_finished(t))
+            self._save(f'round4-{field_size}', tournament_id)
+
+
+def round_finished(tournament):
+    players = db.get_tournament_players(tournament['id'], tournament['current_round'])
+    if tournament['current_round'] == 2:
+        players = [p for p in players if p['status'] == 'active']
+    return db.count_players_finished_round(tournament['id'], tournament['current_round']) >= len(players)
+
+
+def start_next_round(sim, tournament_id):
+    """Starts the next round the way the /next_round route does."""
+    tournament = db.get_tournament_by_id(tournament_id)
+    next_round_num = tournament['current_round'] + 1
+    if next_round_num == 4:
+        leaderboard = db.get_leaderboard_from_live_scores(tournament_id)
+        sim.regroup_players(tournament_id, 4, [p for p in leaderboard if p['status'] != 'cut'])
+    db.set_round_start_step(tournament_id, next_round_num, db.get_simulation_step(tournament_id))
+    db.set_current_round(tournament_id, next_round_num)
+
+
+def play_until(sim, tournament_id, done):
+    """Ticks the simulation, starting each round when the last one is over, until done(tournament)."""
+    while True:
+        tournament = db.get_tournament_by_id(tournament_id)
+        if done(tournament):
+            return
+        if tournament['status'] != 'active':
+            raise RuntimeError(f"Tournament {tournament_id} finished before the benchmark state was reached")
+        sim.advance_staggered_simulation(tournament_id)
+        if db.get_simulation_step(tournament_id) == tournament['simulation_step']:
+            # The round is over (and at the end of round 2, the cut applied)
+            if tournament['current_round'] == 2 and not db.get_tournament_by_id(tournament_id)['cut_applied']:
+                continue
+            start_next_round(sim, tournament_id)
+
+
+def timed(func, *args, operations=1):
+    """
+    Runs func(*args) once. Returns a (seconds, operations, queries) sample;
+    operations may be a function of func's result.
+    """
+    queries_before = SQL_QUERIES.value() or 0
+    started = time.perf_counter()
+    with quiet():
+        result = func(*args)
+    seconds = time.perf_counter() - started
+    queries = (SQL_QUERIES.value() or 0) - queries_before
+    return seconds, operations(result) if callable(operations) else operations, queries
+
+
+# --- Benchmarks ---
+
+@benchmark('hole_score', unit='holes')
+def bench_hole_score(workspace):
+    """Throughput of the per-hole scoring model, with course characteristics."""
+    path, tournament_id = workspace.state('started-150')
+    workspace.use(path)
+    tournament = db.get_tournament_by_id(tournament_id)
+    players = db.get_tournament_players(tournament_id)
+    holes = db.get_holes_for_course(tournament['course_id'])
+    characteristics = db.get_course_characteristics(tournament['course_id'])
+    sim = SimulationService()
+    calls = [(players[i % len(players)], holes[i % 18]) for i in range(HOLE_SCORE_CALLS)]
+
+    def run():
+        for player, hole in calls:
+            sim._calculate_hole_score(player, hole['par'], hole['difficulty_modifier'], characteristics)
+    return [timed(run, operations=HOLE_SCORE_CALLS) for _ in range(5)]
+
+
+def tick_benchmark(field_size):
+    @benchmark(f'tick_field_{field_size}', unit='ticks')
+    def bench_tick(workspace):
+        """One simulation tick with as many groups on the course as the field allows."""
+        path, tournament_id = workspace.copy(f'started-{field_size}')
+        sim = SimulationService()
+        sim.get_cut_tracker(tournament_id)
+        groups = (field_size + 2) // 3
+        with quiet():
+            # Fill the course: every tee group out on a hole, up to one per hole
+            for _ in range(min(groups, 18) - 1):
+                sim.advance_staggered_simulation(tournament_id)
+        samples = [timed(sim.advance_staggered_simulation, tournament_id) for _ in range(10)]
+        workspace.discard(path)
+        return samples
+    return bench_tick
+
+
+for size in TICK_FIELD_SIZES:
+    tick_benchmark(size)
+
+
+def leaderboard_benchmark(label, state):
+    @benchmark(f'leaderboard_{label}')
+    def bench_leaderboard(workspace):
+        """Building the live leaderboard of a 150-player tournament."""
+        path, tournament_id = workspace.state(f'{state}-{TOURNAMENT_FIELD_SIZE}')
+        workspace.use(path)
+        return [timed(db.get_leaderboard_from_live_scores, tournament_id) for _ in range(10)]
+    return bench_leaderboard
+
+
+# 0%, 50% and 100% of the tournament's holes played
+leaderboard_benchmark('0pct', 'started')
+leaderboard_benchmark('50pct', 'round2')
+leaderboard_benchmark('100pct', 'round4')
+
+
+@benchmark('apply_cut')
+def bench_apply_cut(workspace):
+    """Applying the cut and regrouping for round 3, from the incrementally kept cut line."""
+    samples = []
+    for _ in range(5):
+        path, tournament_id = workspace.copy(f'round2-{TOURNAMENT_FIELD_SIZE}')
+        sim = SimulationService()
+        sim.get_cut_tracker(tournament_id)
+        samples.append(timed(sim._check_and_apply_cut, tournament_id))
+        workspace.discard(path)
+    return samples
+
+
+@benchmark('complete_tournament')
+def bench_complete_tournament(workspace):
+    """Saving results, settling bets, updating stats and standings and archiving scores."""
+    samples = []
+    for _ in range(5):
+        path, tournament_id = workspace.copy(f'round4-{TOURNAMENT_FIELD_SIZE}')
+        samples.append(timed(db.complete_tournament, tournament_id))
+        workspace.discard(path)
+    return samples
+
+
+@benchmark('seed_database')
+def bench_seed_database(workspace):
+    """Seeding the standard league: 150 players and a 30-tournament season."""
+    samples = []
+    for i in range(3):
+        path = workspace.path(f'seed{i}')
+        with quiet():
+            init_db(path)
+        samples.append(timed(seed_database, SEED, path))
+        workspace.discard(path)
+    return samples
+
+
+@benchmark('bulk_seed', unit='rows')
+def bench_bulk_seed(workspace):
+    """Bulk seeding 5,000 players and 100 tournaments of 150."""
+    samples = []
+    for i in range(3):
+        path = workspace.path(f'bulk{i}')
+        with quiet():
+            init_db(path)
+        samples.append(timed(lambda: bulk_seed(num_players=5000, num_tournaments=100, seed=SEED, db_path=path),
+                             operations=lambda rates: sum(rate['rows'] for rate in rates.values())))
+        workspace.discard(path)
+    return samples
+
+
+# --- Runner ---
+
+def summarize(spec, samples, threshold, max_queries):
+    seconds = [s for s, _, _ in samples]
+    result = {
+        'name': spec['name'],
+        'samples': len(seconds),
+        'min': min(seconds),
+        'median': statistics.median(seconds),
+        'mean': statistics.mean(seconds),
+        'max': max(seconds),
+        'stdev': statistics.stdev(seconds) if len(seconds) > 1 else 0.0,
+        'threshold': threshold,
+        'queries': max(queries for _, _, queries in samples),
+        'max_queries': max_queries,
+    }
+    if spec['unit']:
+        result['unit'] = spec['unit']
+        result['per_second'] = sum(ops for _, ops, _ in samples) / sum(seconds)
+    result['slow'] = threshold is not None and result['median'] > threshold
+    result['passed'] = max_queries is None or result['queries'] <= max_queries
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=BENCHMARK_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(only=None, check=True, output=None, check_times=False):
+    """
+    Runs the selected benchmarks, writes the results file and returns the
+    results document and the names of the benchmarks that regressed: over
+    their query limit, or with check_times also over their time limit.
+    """
+    with open(THRESHOLDS_PATH) as f:
+        thresholds = json.load(f)
+
+    selected = [spec for spec in BENCHMARKS if not only or any(o in spec['name'] for o in only)]
+    original_path = Config.DATABASE_PATH
+    results = []
+    directory = tempfile.mkdtemp(prefix='golf-bench-')
+    try:
+        workspace = Workspace(directory)
+        for spec in selected:
+            result = summarize(spec, spec['func'](workspace), thresholds['median_seconds'].get(spec['name']),
+                               thresholds['max_queries'].get(spec['name']))
+            results.append(result)
+            rate = f"  {result['per_second']:,.0f} {result['unit']}/s" if 'per_second' in result else ''
+            limit = f"  (limit {result['threshold'] * 1000:.1f} ms)" if result['threshold'] is not None else ''
+            status = 'REGRESSED' if not result['passed'] or (check_times and result['slow']) else (
+                'slow' if result['slow'] else 'ok')
+            queries = f"  {result['queries']} queries" + (f" (limit {result['max_queries']})"
+                                                          if result['max_queries'] is not None else '')
+            print(f"{spec['name']:<22} median {result['median'] * 1000:9.2f} ms{rate}{limit}{queries}  {status}")
+    finally:
+        Config.DATABASE_PATH = original_path
+        shutil.rmtree(directory, ignore_errors=True)
+
+    commit = git_commit()
+    document = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'seed': SEED,
+        'results': results,
+    }
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        output = os.path.join(RESULTS_DIR, f"{stamp}-{(commit or 'nocommit')[:8]}.json")
+    with open(output, 'w') as f:
+        json.dump(document, f, indent=2)
+    print(f"Results written to {output}")
+
+    regressions = [r['name'] for r in results if not r['passed'] or (check_times and r['slow'])]
+    if check and regressions:
+        print(f"Regressed: {', '.join(regressions)}")
+    return document, regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the simulation and data-access hot paths.')
+    parser.add_argument('--only', action='append', help='run benchmarks whose name contains this (repeatable)')
+    parser.add_argument('--output', help='results file (default: benchmarks/results/<time>-<commit>.json)')
+    parser.add_argument('--no-check', action='store_true', help='do not fail when a benchmark exceeds its threshold')
+    parser.add_argument('--check-times', action='store_true', help='also fail when a median exceeds its time limit')
+    parser.add_argument('--list', action='store_true', help='list the benchmarks and exit')
+    args = parser.parse_args()
+
+    if args.list:
+        for spec in BENCHMARKS:
+            print(spec['name'])
+        sys.exit(0)
+    _, regressions = run(args.only, check=not args.no_check, output=args.output, check_times=args.check_times)
+    sys.exit(1 if regressions and not args.no_check else 0)
@@ -11,9 +11,69 @@ class Config:
     
     # App Configuration
     SECRET_KEY = os.getenv('SECRET_KEY', 'your-secret-key-here')
-    DATABASE_PATH = 'golf_betting.db'
+    # A database file, or ':memory:' (or a 'file:...?mode=memory&cache=shared' URI)
+    # for an in-memory database shared by the process, e.g. for tests and batch runs
+    DATABASE_PATH = os.getenv('DATABASE_PATH', 'golf_betting.db')
+    # Interval between simulation ticks; a tick taking longer than this is over budget
+    SIMULATION_TICK_SECONDS = 1
+    # Log level for the app's 'golf' loggers; DEBUG adds a line per group-hole and per score.
+    # LOG_JSON writes one JSON object per event instead of text.
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+    LOG_JSON = os.getenv('LOG_JSON', '').lower() in ('1', 'true', 'yes')
+    # Token for the admin API (X-Admin-Token header); the admin API is off when unset
+    ADMIN_TOKEN = os.getenv('ADMIN_TOKEN')
+    # Most ticks or requests one on-demand profile may cover
+    PROFILE_MAX_COUNT = 1000
+    # Scoring model coefficients fitted by services/calibration.py; the hand-tuned defaults when unset
+    SCORING_PARAMS_PATH = os.getenv('SCORING_PARAMS_PATH')
+    # Registered scoring models (services/scoring_models.py) for live ticks and for pricing
+    SCORING_MODEL = os.getenv('SCORING_MODEL', 'reference')
+    FAST_SCORING_MODEL = os.getenv('FAST_SCORING_MODEL', 'fast')
+    # Opt-in SQL tracing of every request and tick (see services/query_tracer.py).
+    # A trace is printed when it runs more than QUERY_TRACE_MIN_QUERIES statements
+    # or runs one statement QUERY_TRACE_REPEAT_THRESHOLD or more times.
+    QUERY_TRACE = os.getenv('QUERY_TRACE', '').lower() in ('1', 'true', 'yes')
+    QUERY_TRACE_MIN_QUERIES = 50
+    QUERY_TRACE_REPEAT_THRESHOLD = 5
+    # Seeded template databases that resets restore from (see services/seeder.py --golden)
+    GOLDEN_DB_DIR = os.getenv('GOLDEN_DB_DIR', '.golden')
+    
+    # Directory where the simulator publishes memory-mapped leaderboard snapshots
+    LEADERBOARD_SNAPSHOT_DIR = os.getenv('LEADERBOARD_SNAPSHOT_DIR', 'snapshots')
+    # Number of rendered leaderboard tables kept in memory (one per tournament step)
+    LEADERBOARD_CACHE_SIZE = 64
     
     # Virtual Betting Configuration
     INITIAL_VIRTUAL_BALANCE = 10000  # $10,000 starting balance
     MIN_BET_AMOUNT = 10  # Minimum bet $10
-    MAX_BET_AMOUNT = 1000  # Maximum bet $1,000
\ No newline at end of file
+    MAX_BET_AMOUNT = 1000  # Maximum bet $1,000
+    # Accepted bets are written in batches: at most this many per transaction,
+    # waiting at most this many seconds for a batch to fill
+    BET_GROUP_COMMIT_MAX_BATCH = 500
+    BET_GROUP_COMMIT_INTERVAL = 0.02
+    # Win odds are re-priced once per simulation step from this many simulated
+    # finishes, with this bookmaker margin. A quote is honoured for this many steps.
+    PRICE_BOARD_SAMPLES = 500
+    PRICE_BOARD_MARGIN = 0.1
+    PRICE_QUOTE_STEPS = 3
+    MAX_QUOTED_ODDS = 1000.0
+
+    # Weight of the latest round in a player's form rating (exponential moving average)
+    PLAYER_FORM_WEIGHT = 0.2
+
+    # Season standings: points and percentage of the purse paid by finishing
+    # position. Players finishing beyond the tables earn nothing.
+    # Tournament purses are stored in millions of dollars.
+    SEASON_POINTS_TABLE = [
+        500, 300, 190, 135, 110, 100, 90, 85, 80, 75, 70, 65, 60, 57, 56, 55, 54, 53, 52, 51,
+        50, 49, 48, 47, 46, 45, 44, 43, 42, 41, 40, 39, 38, 37, 36, 35, 34, 33, 32, 31,
+        30, 29, 28, 27, 26, 25, 24, 23, 22, 21, 20, 19, 18, 17, 16, 15, 14, 13, 12, 11,
+        10, 9, 8, 7, 6,
+    ]
+    PURSE_PERCENTAGES = [
+        18.0, 10.9, 6.9, 4.9, 4.1, 3.625, 3.375, 3.125, 2.925, 2.725, 2.525, 2.325, 2.125, 1.925,
+        1.825, 1.725, 1.625, 1.525, 1.425, 1.325, 1.225, 1.125, 1.045, 0.965, 0.885, 0.805, 0.775,
+        0.745, 0.715, 0.685, 0.655, 0.625, 0.595, 0.57, 0.545, 0.52, 0.495, 0.475, 0.455, 0.435,
+        0.415, 0.395, 0.375, 0.355, 0.335, 0.315, 0.295, 0.279, 0.265, 0.257, 0.251, 0.245, 0.241,
+        0.237, 0.235, 0.233, 0.231, 0.229, 0.227, 0.225, 0.223, 0.221, 0.219, 0.217, 0.215,
+    ]
\ No newline at end of file
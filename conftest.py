@@ -0,0 +1,27 @@
+import pytest
+
+from config import Config
+from models.database import db, MEMORY_DATABASE
+from services.betting_service import betting_service
+from services.seeder import restore_golden_database
+
+SEED = 2025
+
+
+@pytest.fixture
+def league(monkeypatch):
+    """A freshly seeded in-memory league, restored from the golden database for SEED."""
+    monkeypatch.setattr(Config, 'DATABASE_PATH', MEMORY_DATABASE)
+    restore_golden_database(SEED, MEMORY_DATABASE)
+    # Balances cached by an earlier test belong to a different league
+    betting_service.invalidate_balances()
+    yield db
+    betting_service.invalidate_balances()
+
+
+@pytest.fixture
+def tournament_id(league):
+    """Starts the league's first tournament and returns its id."""
+    tournament_id = league.get_next_available_tournament()['id']
+    league.start_tournament(tournament_id)
+    return tournament_id
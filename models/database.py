@@ -2,17 +2,159 @@ import sqlite3
 from config import Config
 import sys
 import os
+import threading
+import time
+import struct
+from array import array
 from collections import defaultdict
 
 # This ensures that any script running this file can find the 'config' module
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from services.metrics import record_query
+from services.query_tracer import tracing, trace_query
+
+# Shape of an archived tournament's score matrix: one row of rounds x holes per player
+ARCHIVE_ROUNDS = 4
+ARCHIVE_HOLES = 18
+
+# hole_stats counters, in column order
+HOLE_STATS_COUNTERS = ('eagles', 'birdies', 'pars', 'bogeys', 'doubles')
+
+# A shared-cache in-memory database: every connection in the process opening
+# this URI sees the same data. Config.DATABASE_PATH = ':memory:' means this one.
+MEMORY_DATABASE = 'file:golf?mode=memory&cache=shared'
+
+# One connection held open per in-memory database, which SQLite would
+# otherwise discard when the Database class closes its last connection
+_memory_anchors = {}
+_memory_anchors_lock = threading.Lock()
+
+
+def is_memory_database(path):
+    return path == ':memory:' or (path.startswith('file:') and 'mode=memory' in path)
+
+
+def connect(path=None, **kwargs):
+    """
+    Opens a connection to a database file or a 'file:' SQLite URI, by default
+    Config.DATABASE_PATH. In-memory databases are shared-cache and kept alive
+    until drop_memory_database(), so they outlive individual connections.
+    """
+    path = path or Config.DATABASE_PATH
+    if path == ':memory:':
+        path = MEMORY_DATABASE
+    if is_memory_database(path) and path not in _memory_anchors:
+        with _memory_anchors_lock:
+            if path not in _memory_anchors:
+                _memory_anchors[path] = sqlite3.connect(path, uri=True, check_same_thread=False)
+    return sqlite3.connect(path, uri=path.startswith('file:'), **kwargs)
+
+
+def drop_memory_database(path=None):
+    """Frees an in-memory database once its remaining connections close."""
+    path = path or Config.DATABASE_PATH
+    with _memory_anchors_lock:
+        anchor = _memory_anchors.pop(MEMORY_DATABASE if path == ':memory:' else path, None)
+    if anchor is not None:
+        anchor.close()
+
+
+def copy_database(source, target):
+    """
+    Copies source over target with SQLite's backup API. Either may be a file or
+    an in-memory database, so this loads a seeded league into memory or
+    persists an in-memory one to disk, e.g.
+
+        copy_database('golf_betting.db', MEMORY_DATABASE)
+    """
+    source_conn, target_conn = connect(source), connect(target)
+    try:
+        source_conn.backup(target_conn)
+    finally:
+        target_conn.close()
+        source_conn.close()
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """
+    Cursor that reports the time taken by every statement it executes and,
+    while a query trace is active, the statement and the rows fetched from it.
+    """
+
+    _trace = None  # QueryRecord of the last statement, when traced
+
+    def execute(self, sql, parameters=()):
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            seconds = time.perf_counter() - started
+            record_query(seconds)
+            self._trace = trace_query(sql, parameters, seconds)
+
+    def executemany(self, sql, seq_of_parameters):
+        if tracing():
+            seq_of_parameters = list(seq_of_parameters)
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            seconds = time.perf_counter() - started
+            record_query(seconds)
+            self._trace = trace_query(sql, seq_of_parameters, seconds, many=True)
+
+    def fetchone(self):
+        row = super().fetchone()
+        if self._trace is not None and row is not None:
+            self._trace.rows += 1
+        return row
+
+    def fetchmany(self, size=None):
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        if self._trace is not None:
+            self._trace.rows += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = super().fetchall()
+        if self._trace is not None:
+            self._trace.rows += len(rows)
+        return rows
+
+
+class TracedCursor(InstrumentedCursor):
+    """
+    InstrumentedCursor that also counts rows read by iterating over it. Only
+    used while a trace is active: a Python __next__ costs a call per row.
+    """
+
+    def __next__(self):
+        row = super().__next__()
+        if self._trace is not None:
+            self._trace.rows += 1
+        return row
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose statements all run through an InstrumentedCursor, or a TracedCursor while tracing."""
+
+    def cursor(self, factory=None):
+        return super().cursor(factory or (TracedCursor if tracing() else InstrumentedCursor))
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
 class Database:
     """Handles all database operations."""
 
     def _get_connection(self):
         """Gets a new database connection."""
-        conn = sqlite3.connect(Config.DATABASE_PATH)
+        conn = connect(factory=InstrumentedConnection)
         conn.row_factory = lambda c, r: dict(zip([col[0] for col in c.description], r))
         return conn
 
@@ -30,7 +172,65 @@ class Database:
 
     def get_user_bets(self, user_id):
         with self._get_connection() as conn:
-            return conn.execute('SELECT * FROM bets WHERE user_id = ? ORDER BY created_at DESC', (user_id,)).fetchall()
+            return conn.execute('''
+                SELECT b.*, t.name as tournament_name, p.name as player_name, o.name as opponent_name FROM bets b
+                JOIN tournaments t ON b.tournament_id = t.id
+                JOIN players p ON b.player_id = p.id
+                LEFT JOIN players o ON b.opponent_id = o.id
+                WHERE b.user_id = ? ORDER BY b.created_at DESC, b.id DESC
+            ''', (user_id,)).fetchall()
+
+    def get_user_balance(self, user_id):
+        with self._get_connection() as conn:
+            result = conn.execute('SELECT virtual_balance FROM users WHERE id = ?', (user_id,)).fetchone()
+            return result['virtual_balance'] if result else None
+
+    def save_bet_batch(self, bets):
+        """
+        Inserts a batch of accepted bets and takes their stakes from the users'
+        balances in a single transaction. Each bet is a tuple of
+        (user_id, tournament_id, player_id, bet_amount, odds, market,
+        opponent_id, round_num, group_num). Bets on a tournament that is no
+        longer open (e.g. settled since the bet was accepted) are not inserted.
+        Returns the new bet ids in the same order, None for those not inserted.
+        """
+        with self._get_connection() as conn:
+            bet_ids = []
+            stakes_by_user = defaultdict(float)
+            for bet in bets:
+                cursor = conn.execute('''
+                    INSERT INTO bets (user_id, tournament_id, player_id, bet_amount, odds, market, opponent_id, round_num, group_num)
+                    SELECT ?, ?, ?, ?, ?, ?, ?, ?, ? FROM tournaments WHERE id = ? AND status IN ('pending', 'active')
+                ''', bet + (bet[1],))
+                if cursor.rowcount == 0:
+                    bet_ids.append(None)
+                    continue
+                bet_ids.append(cursor.lastrowid)
+                stakes_by_user[bet[0]] += bet[3]
+            conn.executemany('UPDATE users SET virtual_balance = virtual_balance - ? WHERE id = ?',
+                             [(stake, user_id) for user_id, stake in stakes_by_user.items()])
+            conn.commit()
+            return bet_ids
+
+    def reconcile_balances(self, initial_balance):
+        """
+        Recomputes every user's balance from their bets (initial balance, less
+        stakes, plus payouts) and corrects any that have drifted. Returns the
+        number of users whose balance was corrected.
+        """
+        with self._get_connection() as conn:
+            cursor = conn.execute('''
+                UPDATE users SET virtual_balance = l.expected
+                FROM (
+                    SELECT u.id AS user_id,
+                           ? - COALESCE(SUM(b.bet_amount), 0) + COALESCE(SUM(b.payout), 0) AS expected
+                    FROM users u LEFT JOIN bets b ON b.user_id = u.id
+                    GROUP BY u.id
+                ) l
+                WHERE users.id = l.user_id AND ABS(users.virtual_balance - l.expected) > 0.005
+            ''', (initial_balance,))
+            conn.commit()
+            return cursor.rowcount
 
     # --- Tournament & Course Functions ---
     def get_all_tournaments(self):
@@ -115,7 +315,7 @@ class Database:
             conn.commit()
 
     def complete_tournament(self, tournament_id):
-        """Sets a tournament to completed and saves the final results."""
+        """Sets a tournament to completed, saves the final results and settles its bets."""
         with self._get_connection() as conn:
             conn.execute("UPDATE tournaments SET status = 'completed' WHERE id = ?", (tournament_id,))
             final_leaderboard = self.get_leaderboard_from_live_scores(tournament_id, conn=conn)
@@ -124,17 +324,283 @@ class Database:
             for result in final_leaderboard:
                 results_to_save.append((
                     tournament_id, result['player_id'], result['total_strokes'], result['score_to_par'],
-                    result['position'], result.get('r1_score_strokes'), result.get('r2_score_strokes'),
-                    result.get('r3_score_strokes'), result.get('r4_score_strokes')
+                    result['position'], result['r1_info']['strokes'], result['r2_info']['strokes'],
+                    result['r3_info']['strokes'], result['r4_info']['strokes']
                 ))
 
+            # Completing a tournament again replaces its awards rather than adding to them
+            self._revoke_season_awards(conn, tournament_id)
             conn.execute("DELETE FROM tournament_results WHERE tournament_id = ?", (tournament_id,))
             conn.executemany('''
                 INSERT INTO tournament_results (tournament_id, player_id, total_strokes, score_to_par, position, r1_score, r2_score, r3_score, r4_score)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             ''', results_to_save)
+            self._settle_bets(conn, tournament_id)
+            self._update_player_stats(conn, tournament_id)
+            self._update_season_standings(conn, tournament_id)
+            self._archive_live_scores(conn, tournament_id)
             conn.commit()
 
+    def _settle_bets(self, conn, tournament_id):
+        """
+        Settles every pending bet on a completed tournament in bulk and credits
+        the winnings to each user's balance. A winning bet's payout is its full
+        return (stake times decimal odds). Players tied for first, or for the
+        best score in a tee group, share the payout dead-heat style. A tied
+        matchup, or one where either player has no score to compare, is void
+        and returns the stake. Stakes were already taken from the balance when
+        the bets were placed, so losing bets only change status.
+        """
+        conn.execute('''
+            CREATE TEMP TABLE IF NOT EXISTS settled_bets (
+                bet_id INTEGER PRIMARY KEY,
+                user_id INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                payout REAL NOT NULL
+            )
+        ''')
+        conn.execute('DELETE FROM temp.settled_bets')
+        # share is the fraction of the full return a bet wins, or NULL if void
+        conn.execute('''
+            WITH round_scores AS (
+                SELECT player_id, round, SUM(score) AS strokes FROM live_scores
+                WHERE tournament_id = :t GROUP BY player_id, round
+            ),
+            finishes AS (
+                SELECT tp.player_id, tp.status = 'cut' AS missed_cut, SUM(s.strokes) AS total_strokes
+                FROM tournament_players tp JOIN round_scores s ON s.player_id = tp.player_id
+                WHERE tp.tournament_id = :t GROUP BY tp.player_id
+            ),
+            winners AS (
+                SELECT player_id, COUNT(*) OVER () AS tied FROM tournament_results
+                WHERE tournament_id = :t AND position = 1
+            ),
+            group_scores AS (
+                SELECT g.round_num, g.group_num, s.player_id, s.strokes,
+                       MIN(s.strokes) OVER (PARTITION BY g.round_num, g.group_num) AS best
+                FROM round_groups g
+                JOIN round_scores s ON s.player_id = g.player_id AND s.round = g.round_num
+                WHERE g.tournament_id = :t
+            ),
+            group_winners AS (
+                SELECT round_num, group_num, player_id,
+                       COUNT(*) OVER (PARTITION BY round_num, group_num) AS tied
+                FROM group_scores WHERE strokes = best
+            ),
+            outcomes AS (
+                SELECT b.id, b.user_id, b.bet_amount, b.odds,
+                       CASE b.market
+                           WHEN 'outright' THEN COALESCE(1.0 / w.tied, 0)
+                           WHEN 'group' THEN COALESCE(1.0 / gw.tied, 0)
+                           WHEN 'round_matchup' THEN
+                               CASE WHEN rp.strokes IS NULL OR ro.strokes IS NULL OR rp.strokes = ro.strokes THEN NULL
+                                    ELSE rp.strokes < ro.strokes END
+                           WHEN 'tournament_matchup' THEN
+                               -- Making the cut beats missing it, then the lower total wins
+                               CASE WHEN fp.player_id IS NULL OR fo.player_id IS NULL
+                                         OR (fp.missed_cut, fp.total_strokes) = (fo.missed_cut, fo.total_strokes) THEN NULL
+                                    ELSE (fp.missed_cut, fp.total_strokes) < (fo.missed_cut, fo.total_strokes) END
+                       END AS share
+                FROM bets b
+                LEFT JOIN winners w ON b.market = 'outright' AND w.player_id = b.player_id
+                LEFT JOIN group_winners gw ON b.market = 'group' AND gw.player_id = b.player_id
+                    AND gw.round_num = b.round_num AND gw.group_num = b.group_num
+                LEFT JOIN round_scores rp ON b.market = 'round_matchup' AND rp.player_id = b.player_id AND rp.round = b.round_num
+                LEFT JOIN round_scores ro ON b.market = 'round_matchup' AND ro.player_id = b.opponent_id AND ro.round = b.round_num
+                LEFT JOIN finishes fp ON b.market = 'tournament_matchup' AND fp.player_id = b.player_id
+                LEFT JOIN finishes fo ON b.market = 'tournament_matchup' AND fo.player_id = b.opponent_id
+                WHERE b.tournament_id = :t AND b.status = 'pending'
+            )
+            INSERT INTO temp.settled_bets (bet_id, user_id, status, payout)
+            SELECT id, user_id,
+                   CASE WHEN share IS NULL THEN 'void' WHEN share > 0 THEN 'won' ELSE 'lost' END,
+                   CASE WHEN share IS NULL THEN bet_amount ELSE bet_amount * odds * share END
+            FROM outcomes
+        ''', {'t': tournament_id})
+
+        conn.execute('''
+            UPDATE bets SET status = s.status, payout = s.payout
+            FROM temp.settled_bets s WHERE bets.id = s.bet_id
+        ''')
+        conn.execute('''
+            UPDATE users SET virtual_balance = virtual_balance + w.winnings
+            FROM (
+                SELECT user_id, SUM(payout) AS winnings FROM temp.settled_bets
+                GROUP BY user_id HAVING SUM(payout) > 0
+            ) w WHERE users.id = w.user_id
+        ''')
+
+    def _update_player_stats(self, conn, tournament_id):
+        """
+        Folds a completed tournament's rounds into player_stats for the players
+        who played it. Each completed round adds its strokes and its strokes
+        against that round's field average; the form rating is an exponentially
+        weighted average of strokes against the field, most recent rounds
+        weighted highest. Must run before the live scores are archived.
+        """
+        rounds = conn.execute('''
+            WITH round_scores AS (
+                SELECT player_id, round, SUM(score) AS strokes FROM live_scores
+                WHERE tournament_id = ? GROUP BY player_id, round HAVING COUNT(*) >= 18
+            )
+            SELECT player_id, round, strokes, strokes - AVG(strokes) OVER (PARTITION BY round) AS vs_field
+            FROM round_scores ORDER BY player_id, round
+        ''', (tournament_id,)).fetchall()
+        if not rounds:
+            return
+
+        rounds_by_player = defaultdict(list)
+        for r in rounds:
+            rounds_by_player[r['player_id']].append(r)
+        placeholders = ','.join('?' for _ in rounds_by_player)
+        current = {s['player_id']: s for s in conn.execute(
+            f'SELECT * FROM player_stats WHERE player_id IN ({placeholders})', tuple(rounds_by_player)).fetchall()}
+        finishes = {r['player_id']: r for r in conn.execute('''
+            SELECT tp.player_id, tp.status, r.position FROM tournament_players tp
+            LEFT JOIN tournament_results r ON r.tournament_id = tp.tournament_id AND r.player_id = tp.player_id
+            WHERE tp.tournament_id = ?
+        ''', (tournament_id,)).fetchall()}
+
+        alpha = Config.PLAYER_FORM_WEIGHT
+        updates = []
+        for player_id, player_rounds in rounds_by_player.items():
+            stats = current.get(player_id)
+            if stats and stats['last_tournament_id'] == tournament_id:
+                continue  # Already counted
+            stats = dict(stats or {'tournaments': 0, 'cuts_made': 0, 'wins': 0, 'rounds': 0, 'strokes': 0,
+                                   'strokes_sq': 0, 'vs_field': 0.0, 'form': None})
+            for r in player_rounds:
+                stats['rounds'] += 1
+                stats['strokes'] += r['strokes']
+                stats['strokes_sq'] += r['strokes'] ** 2
+                stats['vs_field'] += r['vs_field']
+                stats['form'] = r['vs_field'] if stats['form'] is None else alpha * r['vs_field'] + (1 - alpha) * stats['form']
+            finish = finishes.get(player_id, {})
+            updates.append((
+                player_id, stats['tournaments'] + 1, stats['cuts_made'] + (finish.get('status') != 'cut'),
+                stats['wins'] + (finish.get('position') == 1), stats['rounds'], stats['strokes'], stats['strokes_sq'],
+                stats['vs_field'], stats['form'], tournament_id,
+            ))
+
+        conn.executemany('''
+            INSERT OR REPLACE INTO player_stats (player_id, tournaments, cuts_made, wins, rounds, strokes, strokes_sq,
+                                                 vs_field, form, last_tournament_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', updates)
+
+    def get_player_stats(self, player_id=None):
+        """
+        Returns season stats for one player, or for every player with at least
+        one completed round (best form first): totals plus scoring average,
+        strokes against the field per round and round-to-round variance.
+        """
+        with self._get_connection() as conn:
+            query = '''
+                SELECT s.*, p.name AS player_name,
+                       CAST(s.strokes AS REAL) / s.rounds AS scoring_average,
+                       s.vs_field / s.rounds AS strokes_vs_field,
+                       CAST(s.strokes_sq AS REAL) / s.rounds - (CAST(s.strokes AS REAL) / s.rounds) * (CAST(s.strokes AS REAL) / s.rounds) AS round_variance
+                FROM player_stats s JOIN players p ON p.id = s.player_id
+            '''
+            if player_id is not None:
+                return conn.execute(query + ' WHERE s.player_id = ?', (player_id,)).fetchone()
+            return conn.execute(query + ' ORDER BY s.form').fetchall()
+
+    def _revoke_season_awards(self, conn, tournament_id):
+        """Takes the season points and money already awarded for a tournament back off its players."""
+        conn.execute('''
+            UPDATE players SET season_points = season_points - r.points, season_money = season_money - r.money
+            FROM tournament_results r
+            WHERE r.player_id = players.id AND r.tournament_id = ? AND r.points IS NOT NULL
+        ''', (tournament_id,))
+
+    def _update_season_standings(self, conn, tournament_id):
+        """
+        Awards season points and prize money for a completed tournament and
+        rebuilds the ranked season_standings table. Players tied on a position
+        split the points and money of every position they occupy, e.g. two
+        players tied for 2nd each get the average of 2nd and 3rd. Positions
+        beyond the end of a table earn nothing from it.
+        """
+        purse = conn.execute('SELECT purse FROM tournaments WHERE id = ?', (tournament_id,)).fetchone()['purse']
+        finishers = conn.execute('''
+            SELECT player_id, position, COUNT(*) OVER (PARTITION BY position) AS tied
+            FROM tournament_results WHERE tournament_id = ? AND position IS NOT NULL
+        ''', (tournament_id,)).fetchall()
+
+        def share(table, position, tied):
+            return sum(table[p - 1] for p in range(position, position + tied) if p <= len(table)) / tied
+
+        awards = []
+        for f in finishers:
+            points = round(share(Config.SEASON_POINTS_TABLE, f['position'], f['tied']))
+            money = round(purse * 1_000_000 * share(Config.PURSE_PERCENTAGES, f['position'], f['tied']) / 100, 2)
+            awards.append((points, money, tournament_id, f['player_id']))
+
+        conn.executemany('UPDATE tournament_results SET points = ?, money = ? WHERE tournament_id = ? AND player_id = ?', awards)
+        conn.executemany('UPDATE players SET season_points = season_points + ?, season_money = season_money + ? WHERE id = ?',
+                         [(points, money, player_id) for points, money, _, player_id in awards])
+
+        conn.execute('DELETE FROM season_standings')
+        conn.execute('''
+            INSERT INTO season_standings (player_id, points, money, points_rank, money_rank, events, wins)
+            SELECT p.id, p.season_points, p.season_money,
+                   RANK() OVER (ORDER BY p.season_points DESC),
+                   RANK() OVER (ORDER BY p.season_money DESC),
+                   COALESCE(s.tournaments, 0), COALESCE(s.wins, 0)
+            FROM players p LEFT JOIN player_stats s ON s.player_id = p.id
+            WHERE p.season_points > 0 OR s.tournaments > 0
+        ''')
+
+    def get_season_standings(self, order_by='points', limit=None):
+        """Returns the season standings ranked by 'points' or 'money'."""
+        rank_column = {'points': 'points_rank', 'money': 'money_rank'}[order_by]
+        with self._get_connection() as conn:
+            return conn.execute(f'''
+                SELECT s.*, s.{rank_column} AS rank, p.name AS player_name, p.country
+                FROM season_standings s JOIN players p ON p.id = s.player_id
+                ORDER BY s.{rank_column}, p.name LIMIT ?
+            ''', (limit if limit is not None else -1,)).fetchall()
+
+    def _archive_live_scores(self, conn, tournament_id):
+        """
+        Packs a completed tournament's hole-by-hole scores into score_archives
+        and deletes its live_scores rows, so live_scores only ever holds the
+        events in play. Scores are stored as an int8 matrix with one row of
+        ARCHIVE_ROUNDS x ARCHIVE_HOLES per player (0 for holes not played),
+        alongside the matching vector of player ids.
+        """
+        rows = conn.execute('SELECT player_id, round, hole, score FROM live_scores WHERE tournament_id = ?',
+                            (tournament_id,)).fetchall()
+        if not rows:
+            return
+        player_ids = sorted({r['player_id'] for r in rows})
+        index = {player_id: i for i, player_id in enumerate(player_ids)}
+        row_size = ARCHIVE_ROUNDS * ARCHIVE_HOLES
+        scores = array('b', bytes(len(player_ids) * row_size))
+        for r in rows:
+            scores[index[r['player_id']] * row_size + (r['round'] - 1) * ARCHIVE_HOLES + r['hole'] - 1] = r['score']
+
+        conn.execute('INSERT OR REPLACE INTO score_archives (tournament_id, player_ids, scores) VALUES (?, ?, ?)',
+                     (tournament_id, struct.pack(f'<{len(player_ids)}i', *player_ids), scores.tobytes()))
+        conn.execute('DELETE FROM live_scores WHERE tournament_id = ?', (tournament_id,))
+
+    def _get_archived_scores(self, tournament_id, conn):
+        """Unpacks an archived tournament's scores into live_scores-style rows."""
+        archive = conn.execute('SELECT player_ids, scores FROM score_archives WHERE tournament_id = ?',
+                               (tournament_id,)).fetchone()
+        if not archive:
+            return []
+        player_ids = struct.unpack(f"<{len(archive['player_ids']) // 4}i", archive['player_ids'])
+        scores = array('b', archive['scores'])
+        row_size = ARCHIVE_ROUNDS * ARCHIVE_HOLES
+        return [
+            {'tournament_id': tournament_id, 'player_id': player_id, 'round': offset // ARCHIVE_HOLES + 1,
+             'hole': offset % ARCHIVE_HOLES + 1, 'score': score}
+            for i, player_id in enumerate(player_ids)
+            for offset, score in enumerate(scores[i * row_size:(i + 1) * row_size]) if score
+        ]
+
     def get_tournament_results(self, tournament_id):
         with self._get_connection() as conn:
             return conn.execute('''
@@ -271,7 +737,9 @@ class Database:
     def get_live_scores_for_tournament(self, tournament_id, conn=None):
         db_conn = conn or self._get_connection()
         try:
-            return db_conn.execute('SELECT * FROM live_scores WHERE tournament_id = ?', (tournament_id,)).fetchall()
+            scores = db_conn.execute('SELECT * FROM live_scores WHERE tournament_id = ?', (tournament_id,)).fetchall()
+            # Completed tournaments only keep their packed archive
+            return scores or self._get_archived_scores(tournament_id, db_conn)
         finally:
             if not conn:
                 db_conn.close()
@@ -403,12 +871,127 @@ class Database:
             if not conn:
                 db_conn.close()
 
-    def save_live_score(self, tournament_id, player_id, round_num, hole_num, score):
+    def get_scored_holes(self, tournament_id, round_num, first_hole, last_hole):
+        """The (player_id, hole) pairs already scored in a round on holes first_hole to last_hole."""
         with self._get_connection() as conn:
+            rows = conn.execute('''
+                SELECT player_id, hole FROM live_scores
+                WHERE tournament_id = ? AND round = ? AND hole BETWEEN ? AND ?
+            ''', (tournament_id, round_num, first_hole, last_hole)).fetchall()
+        return {(row['player_id'], row['hole']) for row in rows}
+
+    def save_live_scores(self, tournament_id, round_num, scores):
+        """
+        Saves new hole scores, given as (player_id, hole, score, par) rows that
+        have no score yet, and folds them into the holes' scoring statistics,
+        all in one transaction: one insert per score and one upsert per hole.
+        Use save_live_score to rescore a hole.
+        """
+        if not scores:
+            return
+        deltas = {}  # hole -> [par, players, strokes, eagles, birdies, pars, bogeys, doubles]
+        for _, hole, score, par in scores:
+            delta = deltas.setdefault(hole, [par, 0, 0, 0, 0, 0, 0, 0])
+            delta[1] += 1
+            delta[2] += score
+            delta[3 + HOLE_STATS_COUNTERS.index(self._hole_stats_column(score, par))] += 1
+        with self._get_connection() as conn:
+            conn.executemany('INSERT INTO live_scores (tournament_id, player_id, round, hole, score) VALUES (?, ?, ?, ?, ?)',
+                             [(tournament_id, player_id, round_num, hole, score) for player_id, hole, score, _ in scores])
+            conn.executemany('''
+                INSERT INTO hole_stats (tournament_id, round, hole, par, players, strokes, eagles, birdies, pars, bogeys, doubles)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(tournament_id, round, hole) DO UPDATE SET
+                    players = players + excluded.players, strokes = strokes + excluded.strokes,
+                    eagles = eagles + excluded.eagles, birdies = birdies + excluded.birdies, pars = pars + excluded.pars,
+                    bogeys = bogeys + excluded.bogeys, doubles = doubles + excluded.doubles
+            ''', [(tournament_id, round_num, hole, *delta) for hole, delta in deltas.items()])
+            conn.commit()
+
+    def save_live_score(self, tournament_id, player_id, round_num, hole_num, score, par=None):
+        """
+        Saves or replaces a player's score for a hole and folds it into the
+        hole's scoring statistics in the same transaction, so the stats never
+        need a scan of live_scores. Pass the hole's par if known to save a
+        lookup. The simulation saves new scores in bulk with save_live_scores.
+        """
+        with self._get_connection() as conn:
+            previous = conn.execute('SELECT score FROM live_scores WHERE tournament_id = ? AND player_id = ? AND round = ? AND hole = ?',
+                                    (tournament_id, player_id, round_num, hole_num)).fetchone()
             conn.execute('INSERT OR REPLACE INTO live_scores (tournament_id, player_id, round, hole, score) VALUES (?, ?, ?, ?, ?)',
                          (tournament_id, player_id, round_num, hole_num, score))
+
+            if par is None:
+                par = conn.execute('''
+                    SELECT h.par FROM holes h JOIN tournaments t ON h.course_id = t.course_id
+                    WHERE t.id = ? AND h.hole_number = ?
+                ''', (tournament_id, hole_num)).fetchone()['par']
+            if previous:
+                column = self._hole_stats_column(previous['score'], par)
+                conn.execute(f'''
+                    UPDATE hole_stats SET players = players - 1, strokes = strokes - ?, {column} = {column} - 1
+                    WHERE tournament_id = ? AND round = ? AND hole = ?
+                ''', (previous['score'], tournament_id, round_num, hole_num))
+            column = self._hole_stats_column(score, par)
+            conn.execute(f'''
+                INSERT INTO hole_stats (tournament_id, round, hole, par, players, strokes, {column})
+                VALUES (?, ?, ?, ?, 1, ?, 1)
+                ON CONFLICT(tournament_id, round, hole) DO UPDATE SET
+                    players = players + 1, strokes = strokes + excluded.strokes, {column} = {column} + 1
+            ''', (tournament_id, round_num, hole_num, par, score))
             conn.commit()
 
+    @staticmethod
+    def _hole_stats_column(score, par):
+        """Maps a hole score to the hole_stats counter it belongs to."""
+        to_par = score - par
+        if to_par <= -2:
+            return 'eagles'
+        if to_par >= 2:
+            return 'doubles'
+        return {-1: 'birdies', 0: 'pars', 1: 'bogeys'}[to_par]
+
+    def get_hole_stats(self, tournament_id, round_num=None, conn=None):
+        """
+        Gets the per-hole scoring statistics of a tournament, optionally for a
+        single round. Each hole is ranked by how hard it played in its round
+        (1 = hardest) next to its rank by difficulty_modifier among all the
+        course's holes, which is fixed whichever holes have been played.
+        """
+        db_conn = conn or self._get_connection()
+        try:
+            query = '''
+                SELECT hs.*, h.difficulty_modifier, h.modifier_rank FROM hole_stats hs
+                JOIN (
+                    SELECT hole_number, difficulty_modifier,
+                           ROW_NUMBER() OVER (ORDER BY difficulty_modifier DESC, hole_number) AS modifier_rank
+                    FROM holes WHERE course_id = (SELECT course_id FROM tournaments WHERE id = ?)
+                ) h ON h.hole_number = hs.hole
+                WHERE hs.tournament_id = ?
+            '''
+            params = (tournament_id, tournament_id)
+            if round_num:
+                query += ' AND hs.round = ?'
+                params += (round_num,)
+            stats = db_conn.execute(query + ' ORDER BY hs.round, hs.hole', params).fetchall()
+        finally:
+            if not conn:
+                db_conn.close()
+
+        by_round = defaultdict(list)
+        for hole in stats:
+            played = hole['players'] > 0
+            hole['scoring_average'] = hole['strokes'] / hole['players'] if played else None
+            hole['average_to_par'] = hole['scoring_average'] - hole['par'] if played else None
+            hole['difficulty_rank'] = None
+            by_round[hole['round']].append(hole)
+
+        for holes in by_round.values():
+            played = sorted((h for h in holes if h['players']), key=lambda h: -h['average_to_par'])
+            for rank, hole in enumerate(played, 1):
+                hole['difficulty_rank'] = rank
+        return stats
+
     def get_simulation_step(self, tournament_id):
         with self._get_connection() as conn:
             result = conn.execute('SELECT simulation_step FROM tournaments WHERE id = ?', (tournament_id,)).fetchone()
@@ -431,6 +1014,13 @@ class Database:
             conn.execute('UPDATE tournaments SET current_round = ? WHERE id = ?', (round_num, tournament_id))
             conn.commit()
 
+    def record_scoring_model(self, tournament_id, model, parameters_version):
+        """Records the scoring model and parameter version of a tournament, unless one is recorded already."""
+        with self._get_connection() as conn:
+            conn.execute('UPDATE tournaments SET scoring_model = ?, scoring_params_version = ? '
+                         'WHERE id = ? AND scoring_model IS NULL', (model, parameters_version, tournament_id))
+            conn.commit()
+
     def get_course_characteristics(self, course_id, conn=None):
         """Get all characteristics for a specific course."""
         db_conn = conn or self._get_connection()
@@ -484,9 +1074,9 @@ class Database:
 
 db = Database()
 
-def init_db():
+def init_db(db_path=None):
     """Initialize the database with the new, detailed schema for the golf simulator."""
-    conn = sqlite3.connect(Config.DATABASE_PATH)
+    conn = connect(db_path)
     c = conn.cursor()
 
     # Drop old tables to ensure a clean slate
@@ -495,10 +1085,17 @@ def init_db():
     c.execute("DROP TABLE IF EXISTS tournaments")
     c.execute("DROP TABLE IF EXISTS tournament_results")
     c.execute("DROP TABLE IF EXISTS live_scores")
+    c.execute("DROP TABLE IF EXISTS score_archives")
     c.execute("DROP TABLE IF EXISTS tournament_players")
     c.execute("DROP TABLE IF EXISTS players")
     c.execute("DROP TABLE IF EXISTS courses")
     c.execute("DROP TABLE IF EXISTS holes")
+    c.execute("DROP TABLE IF EXISTS tournament_cuts")
+    c.execute("DROP TABLE IF EXISTS round_groups")
+    c.execute("DROP TABLE IF EXISTS course_characteristics")
+    c.execute("DROP TABLE IF EXISTS hole_stats")
+    c.execute("DROP TABLE IF EXISTS player_stats")
+    c.execute("DROP TABLE IF EXISTS season_standings")
     
     # --- User Management ---
     c.execute('''
@@ -565,6 +1162,8 @@ def init_db():
             r3_start_step INTEGER DEFAULT 0,
             r4_start_step INTEGER DEFAULT 0,
             cut_applied INTEGER DEFAULT 0,
+            scoring_model TEXT, -- model id and parameter version, recorded at the first tick
+            scoring_params_version TEXT,
             FOREIGN KEY(course_id) REFERENCES courses(id)
         )
     ''')
@@ -624,6 +1223,68 @@ def init_db():
         )
     ''')
 
+    # Running per-player totals across completed tournaments, kept by _update_player_stats
+    c.execute('''
+        CREATE TABLE player_stats (
+            player_id INTEGER PRIMARY KEY,
+            tournaments INTEGER NOT NULL DEFAULT 0,
+            cuts_made INTEGER NOT NULL DEFAULT 0,
+            wins INTEGER NOT NULL DEFAULT 0,
+            rounds INTEGER NOT NULL DEFAULT 0, -- completed 18-hole rounds
+            strokes INTEGER NOT NULL DEFAULT 0,
+            strokes_sq INTEGER NOT NULL DEFAULT 0, -- sum of squared round strokes, for the variance
+            vs_field REAL NOT NULL DEFAULT 0, -- sum of round strokes minus the field's round average
+            form REAL, -- exponentially weighted strokes vs field per round (lower is better)
+            last_tournament_id INTEGER,
+            FOREIGN KEY(player_id) REFERENCES players(id)
+        )
+    ''')
+
+    # Ranked season standings, rebuilt by _update_season_standings when a tournament completes
+    c.execute('''
+        CREATE TABLE season_standings (
+            player_id INTEGER PRIMARY KEY,
+            points INTEGER NOT NULL,
+            money REAL NOT NULL,
+            points_rank INTEGER NOT NULL,
+            money_rank INTEGER NOT NULL,
+            events INTEGER NOT NULL,
+            wins INTEGER NOT NULL,
+            FOREIGN KEY(player_id) REFERENCES players(id)
+        )
+    ''')
+    c.execute('CREATE INDEX idx_season_standings_points ON season_standings (points_rank)')
+    c.execute('CREATE INDEX idx_season_standings_money ON season_standings (money_rank)')
+
+    # Hole-by-hole scores of completed tournaments, packed by _archive_live_scores
+    c.execute('''
+        CREATE TABLE score_archives (
+            tournament_id INTEGER PRIMARY KEY,
+            player_ids BLOB NOT NULL, -- little-endian int32 per player
+            scores BLOB NOT NULL, -- int8 matrix, players x rounds x holes
+            FOREIGN KEY(tournament_id) REFERENCES tournaments(id)
+        )
+    ''')
+
+    # Per-hole scoring aggregates, updated as each live score is saved
+    c.execute('''
+        CREATE TABLE hole_stats (
+            tournament_id INTEGER NOT NULL,
+            round INTEGER NOT NULL,
+            hole INTEGER NOT NULL,
+            par INTEGER NOT NULL,
+            players INTEGER NOT NULL DEFAULT 0,
+            strokes INTEGER NOT NULL DEFAULT 0,
+            eagles INTEGER NOT NULL DEFAULT 0, -- eagle or better
+            birdies INTEGER NOT NULL DEFAULT 0,
+            pars INTEGER NOT NULL DEFAULT 0,
+            bogeys INTEGER NOT NULL DEFAULT 0,
+            doubles INTEGER NOT NULL DEFAULT 0, -- double bogey or worse
+            PRIMARY KEY(tournament_id, round, hole),
+            FOREIGN KEY(tournament_id) REFERENCES tournaments(id)
+        )
+    ''')
+
     # This table will store the final, summarized results once a tournament is over
     c.execute('''
         CREATE TABLE tournament_results (
@@ -637,6 +1298,8 @@ def init_db():
             r2_score INTEGER,
             r3_score INTEGER,
             r4_score INTEGER,
+            points INTEGER, -- season points awarded
+            money REAL, -- prize money awarded
             FOREIGN KEY(tournament_id) REFERENCES tournaments(id),
             FOREIGN KEY(player_id) REFERENCES players(id)
         )
@@ -650,14 +1313,21 @@ def init_db():
             player_id INTEGER NOT NULL,
             bet_amount REAL NOT NULL,
             odds REAL NOT NULL,
-            status TEXT NOT NULL DEFAULT 'pending', -- pending, won, lost
+            market TEXT NOT NULL DEFAULT 'outright', -- outright, round_matchup, tournament_matchup, group
+            opponent_id INTEGER, -- matchups only
+            round_num INTEGER, -- round matchups and group bets
+            group_num INTEGER, -- group bets only
+            status TEXT NOT NULL DEFAULT 'pending', -- pending, won, lost, void
             payout REAL,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY(user_id) REFERENCES users(id),
             FOREIGN KEY(tournament_id) REFERENCES tournaments(id),
-            FOREIGN KEY(player_id) REFERENCES players(id)
+            FOREIGN KEY(player_id) REFERENCES players(id),
+            FOREIGN KEY(opponent_id) REFERENCES players(id)
         )
     ''')
+    c.execute('CREATE INDEX idx_bets_tournament_status ON bets (tournament_id, status)')
+    c.execute('CREATE INDEX idx_bets_user ON bets (user_id)')
 
     # New table for course characteristics that affect player performance
     c.execute('''
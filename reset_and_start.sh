@@ -9,10 +9,17 @@ pkill -f "python app.py" 2>/dev/null || true
 # Remove database files
 echo "🗑️  Removing old database files..."
 rm -f golf_betting.db db.sqlite3
+rm -rf snapshots
 
-# Reseed the database
-echo "🌱 Reseeding database..."
-PYTHONPATH=. venv/bin/python services/seeder.py
+# Reseed the database. With SEED set, the seeded league is restored from a
+# cached golden database instead of being generated again.
+if [ -n "$SEED" ]; then
+    echo "🌱 Restoring seed $SEED league..."
+    PYTHONPATH=. venv/bin/python services/seeder.py --golden --seed "$SEED"
+else
+    echo "🌱 Reseeding database..."
+    PYTHONPATH=. venv/bin/python services/seeder.py
+fi
 
 # Start the app
 echo "🚀 Starting the app..."
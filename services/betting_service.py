@@ -0,0 +1,161 @@
+import threading
+import time
+from collections import defaultdict
+from models.database import db
+from services.event_log import get_logger
+from config import Config
+
+logger = get_logger('betting')
+
+
+class BetTicket:
+    """An accepted bet waiting for its batch to be committed."""
+
+    def __init__(self, user_id, tournament_id, player_id, amount, odds, market='outright',
+                 opponent_id=None, round_num=None, group_num=None):
+        self.bet = (user_id, tournament_id, player_id, amount, odds, market, opponent_id, round_num, group_num)
+        self.bet_id = None
+        self.error = None
+        self._committed = threading.Event()
+
+    def wait(self, timeout=None):
+        """Blocks until the bet's batch is durable. Raises if the batch failed."""
+        if not self._committed.wait(timeout):
+            raise TimeoutError('Timed out waiting for the bet to be saved.')
+        if self.error:
+            raise self.error
+        return self.bet_id
+
+
+class BettingService:
+    """
+    Accepts bets against an in-memory ledger of user balances and persists them
+    through a group-commit writer.
+
+    Balance checks happen in memory under a single lock, so bursts of bets never
+    wait on SQLite to be accepted. Accepted bets are queued and a background
+    thread writes them in batches, each batch's inserts and balance updates in
+    one transaction. A bet only counts as placed once its batch has committed.
+    """
+
+    def __init__(self, flush_interval=Config.BET_GROUP_COMMIT_INTERVAL, max_batch=Config.BET_GROUP_COMMIT_MAX_BATCH):
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._cond = threading.Condition()
+        self._balances = {}  # user_id -> balance as committed in the database
+        self._pending = defaultdict(float)  # user_id -> stakes accepted but not yet committed
+        self._queue = []
+        self._generation = 0  # bumped whenever committed balances change
+        self._writer = None
+
+    def available_balance(self, user_id):
+        """Returns the user's balance less any stakes still waiting to be committed."""
+        self._load_balance(user_id)
+        with self._cond:
+            return self._balances[user_id] - self._pending[user_id]
+
+    def _load_balance(self, user_id):
+        while True:
+            with self._cond:
+                if user_id in self._balances:
+                    return
+                generation = self._generation
+            balance = db.get_user_balance(user_id)
+            if balance is None:
+                raise ValueError('Unknown user.')
+            with self._cond:
+                # Retry if a batch committed while we were reading
+                if self._generation == generation:
+                    self._balances[user_id] = balance
+                    return
+
+    def place_bet(self, user_id, tournament_id, player_id, amount, odds, market='outright',
+                  opponent_id=None, round_num=None, group_num=None):
+        """
+        Validates a bet against the betting limits and the user's balance,
+        reserves the stake and queues the bet for the next group commit.
+        Returns a BetTicket; call wait() on it for the durability ack.
+        """
+        if amount < Config.MIN_BET_AMOUNT or amount > Config.MAX_BET_AMOUNT:
+            raise ValueError(f'Bets must be between ${Config.MIN_BET_AMOUNT} and ${Config.MAX_BET_AMOUNT}.')
+        if odds <= 1.0:
+            raise ValueError('Invalid odds.')
+
+        self._load_balance(user_id)
+        with self._cond:
+            available = self._balances[user_id] - self._pending[user_id]
+            if amount > available:
+                raise ValueError(f'Insufficient balance: ${available:.2f} available.')
+            self._pending[user_id] += amount
+
+            ticket = BetTicket(user_id, tournament_id, player_id, amount, odds, market,
+                               opponent_id, round_num, group_num)
+            self._queue.append(ticket)
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run_writer, name='bet-group-commit', daemon=True)
+                self._writer.start()
+            self._cond.notify()
+        return ticket
+
+    def invalidate_balances(self):
+        """Drops the cached balances, e.g. after bets were settled in the database."""
+        with self._cond:
+            self._balances.clear()
+            self._generation += 1
+
+    def _run_writer(self):
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                # Give a burst a moment to fill the batch before committing
+                deadline = time.monotonic() + self.flush_interval
+                while len(self._queue) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._queue[:self.max_batch]
+                del self._queue[:self.max_batch]
+            self._commit_batch(batch)
+
+    def _commit_batch(self, batch):
+        try:
+            bet_ids = db.save_bet_batch([ticket.bet for ticket in batch])
+        except Exception as e:
+            bet_ids, error = None, e
+
+        with self._cond:
+            for i, ticket in enumerate(batch):
+                user_id, amount = ticket.bet[0], ticket.bet[3]
+                self._pending[user_id] -= amount
+                if bet_ids is None:
+                    ticket.error = error
+                elif bet_ids[i] is None:
+                    ticket.error = ValueError('Betting is closed for this tournament.')
+                else:
+                    ticket.bet_id = bet_ids[i]
+                    # Reloaded from the database rather than debited here: a
+                    # load racing the commit may already have the new balance
+                    self._balances.pop(user_id, None)
+            if bet_ids is not None:
+                self._generation += 1
+
+        for ticket in batch:
+            ticket._committed.set()
+
+    def reconcile(self):
+        """
+        Rebuilds balances from the bets table at startup. Bets and their balance
+        updates are committed together, so only bets whose batch committed were
+        ever acknowledged; this repairs any balance that disagrees with them.
+        """
+        corrected = db.reconcile_balances(Config.INITIAL_VIRTUAL_BALANCE)
+        self.invalidate_balances()
+        if corrected:
+            logger.info("Reconciled the balances of %d users with their bets.", corrected,
+                        extra={'event': 'balances_reconciled', 'users': corrected})
+        return corrected
+
+
+betting_service = BettingService()
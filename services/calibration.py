@@ -0,0 +1,365 @@
+"""
+Fits the scoring model's coefficients to target round-score statistics.
+
+    python services/calibration.py                                   # default targets, seeded league
+    python services/calibration.py --target-average 0.3 --target-sd 2.8 --target-birdie-rate 0.21
+    SCORING_PARAMS_PATH=calibrations/<version>.json python app.py    # run with the fitted set
+
+The population is every player entered in a tournament of a league, on that
+tournament's course: by default the seeded league for --league-seed,
+restored into memory from its golden database, or the configured database
+with --database. A sample of --sample entries keeps each evaluation fast.
+
+For a parameter set, each hole's score distribution is computed exactly by
+the scoring model being fitted (--model, default Config.SCORING_MODEL; see
+services/scoring_models.py). Summing over the
+holes gives each entry's expected round and its variance, and so the
+population's scoring average to par, the spread of round scores and the
+rate of birdies or better, with no sampling noise for the optimizer to
+chase. A Monte Carlo run through SimulationService checks the fitted set.
+
+The skill weights, modifier scale, skill pivot (which mostly sets the
+scoring average), randomness and score clamp are fitted by
+differential evolution, each generation's candidates evaluated across worker
+processes. The loss is the squared miss on each target in units of its
+tolerance, plus a penalty on moving away from the hand-tuned defaults, which
+keeps coefficients the targets say nothing about where they were. The
+result is written as a versioned parameter set that SimulationService
+loads when Config.SCORING_PARAMS_PATH points at it.
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import Config
+from services.scoring_params import DEFAULT_PARAMETERS, save_scoring_parameters
+from services.scoring_models import SCORING_MODELS, effective_skill, get_model
+from services.simulation_service import SimulationService
+
+CALIBRATIONS_DIR = 'calibrations'
+
+# Round-score statistics to match: mean strokes to par per round, standard
+# deviation of round scores and the share of holes scored under par
+DEFAULT_TARGETS = {'scoring_average': 0.5, 'round_sd': 3.0, 'birdie_rate': 0.2}
+# A miss of one tolerance costs as much as moving one coefficient across its whole range
+TOLERANCES = {'scoring_average': 0.1, 'round_sd': 0.1, 'birdie_rate': 0.005}
+REGULARIZATION = 1.0
+
+# Fitted coefficients: (name, low, high, whole number)
+FITTED = (
+    ('weight_overall', 0.0, 1.0, False),
+    ('weight_driving', 0.0, 1.0, False),
+    ('weight_approach', 0.0, 1.0, False),
+    ('weight_short_game', 0.0, 1.0, False),
+    ('weight_putting', 0.0, 1.0, False),
+    ('modifier_scale', 0.0, 150.0, False),
+    ('skill_pivot', 50.0, 120.0, False),
+    ('randomness', 0.5, 10.0, False),
+    ('best_to_par', -4, -1, True),
+    ('worst_to_par', 1, 5, True),
+)
+WEIGHTS = ('weight_overall', 'weight_driving', 'weight_approach', 'weight_short_game', 'weight_putting')
+
+SKILLS = ('overall_skill', 'driving_skill', 'approach_skill', 'short_game_skill', 'putting_skill')
+CHARACTERISTICS = (
+    'avg_temperature', 'humidity_level', 'wind_factor', 'rain_probability', 'design_strategy',
+    'course_length', 'narrowness_factor', 'hazard_density', 'green_speed', 'turf_firmness',
+    'rough_length', 'prestige_level', 'course_age', 'crowd_factor', 'elevation_factor', 'terrain_difficulty',
+)
+
+
+# --- Population ---
+
+def load_population(sample=None, seed=0):
+    """
+    (skills, course characteristics, [(par, difficulty)]) for every tournament
+    entry in the configured database, or a sample of them.
+    """
+    from models.database import db
+    entries = []
+    for tournament in db.get_all_tournaments():
+        course_id = tournament['course_id']
+        characteristics = db.get_course_characteristics(course_id)
+        characteristics = {k: characteristics[k] for k in CHARACTERISTICS} if characteristics else None
+        holes = [(h['par'], h['difficulty_modifier']) for h in db.get_holes_for_course(course_id)]
+        for player in db.get_tournament_players(tournament['id']):
+            entries.append(({k: player[k] for k in SKILLS}, characteristics, holes))
+    if sample and sample < len(entries):
+        entries = random.Random(seed).sample(entries, sample)
+    return entries
+
+
+def load_league(seed):
+    """Restores the seeded league for seed into memory and points the app's database at it."""
+    from services.seeder import restore_golden_database
+    Config.DATABASE_PATH = ':memory:'
+    restore_golden_database(seed)
+
+
+# --- Exact round statistics ---
+
+def round_statistics(parameters, population, model=None):
+    """
+    The population's scoring average (strokes to par per round), the standard
+    deviation of round scores and the birdie-or-better, par and bogey-or-worse
+    rates per hole, computed exactly from the hole score distributions of the
+    scoring model (default Config.SCORING_MODEL) under parameters.
+    """
+    model = get_model(model or Config.SCORING_MODEL, parameters)
+
+    means, variances = [], []
+    holes_played = birdies = pars = 0.0
+    for skills, characteristics, holes in population:
+        weighted_skill = effective_skill(parameters, skills, characteristics)
+        mean = variance = 0.0
+        for par, difficulty in holes:
+            best, probabilities = model.distribution(weighted_skill, difficulty)
+            hole_mean = sum((best + i) * p for i, p in enumerate(probabilities))
+            mean += hole_mean
+            variance += sum((best + i) ** 2 * p for i, p in enumerate(probabilities)) - hole_mean * hole_mean
+            birdies += sum(probabilities[:-best])
+            pars += probabilities[-best]
+        means.append(mean)
+        variances.append(variance)
+        holes_played += len(holes)
+
+    average = sum(means) / len(means)
+    # Spread of all rounds: the variance within each entry plus that between entries
+    spread = sum(variances) / len(variances) + sum((m - average) ** 2 for m in means) / len(means)
+    return {
+        'scoring_average': average,
+        'round_sd': math.sqrt(spread),
+        'birdie_rate': birdies / holes_played,
+        'par_rate': pars / holes_played,
+        'bogey_rate': 1.0 - (birdies + pars) / holes_played,
+    }
+
+
+def simulate_statistics(parameters, population, rounds, seed=0, model=None):
+    """The statistics of round_statistics, estimated by playing rounds through SimulationService."""
+    sim = SimulationService(parameters, model=model)
+    random.seed(seed)
+    totals, holes_played, birdies, pars = [], 0, 0, 0
+    for i in range(rounds):
+        skills, characteristics, holes = population[i % len(population)]
+        total = 0
+        for par, difficulty in holes:
+            to_par = sim._calculate_hole_score(skills, par, difficulty, characteristics) - par
+            total += to_par
+            birdies += to_par < 0
+            pars += to_par == 0
+        totals.append(total)
+        holes_played += len(holes)
+    average = sum(totals) / len(totals)
+    return {
+        'scoring_average': average,
+        'round_sd': math.sqrt(sum((t - average) ** 2 for t in totals) / len(totals)),
+        'birdie_rate': birdies / holes_played,
+        'par_rate': pars / holes_played,
+        'bogey_rate': 1.0 - (birdies + pars) / holes_played,
+    }
+
+
+# --- Fitting ---
+
+def decode(vector):
+    """A full parameter set from a vector of the FITTED coefficients; the weights are normalized to sum to 1."""
+    parameters = dict(DEFAULT_PARAMETERS)
+    for (name, low, high, whole), value in zip(FITTED, vector):
+        parameters[name] = int(round(value)) if whole else value
+    total = sum(parameters[name] for name in WEIGHTS)
+    for name in WEIGHTS:
+        parameters[name] = parameters[name] / total if total > 0 else DEFAULT_PARAMETERS[name]
+    return parameters
+
+
+def loss(parameters, statistics, targets):
+    miss = sum(((statistics[name] - target) / TOLERANCES[name]) ** 2 for name, target in targets.items())
+    drift = sum(((parameters[name] - DEFAULT_PARAMETERS[name]) / (high - low)) ** 2
+                for name, low, high, _ in FITTED)
+    return miss + REGULARIZATION * drift
+
+
+# Set in each worker process by _init_worker
+_population = None
+_targets = None
+_model = None
+
+
+def _init_worker(population, targets, model):
+    global _population, _targets, _model
+    _population, _targets, _model = population, targets, model
+
+
+def _evaluate(vector):
+    parameters = decode(vector)
+    return loss(parameters, round_statistics(parameters, _population, _model), _targets)
+
+
+def differential_evolution(evaluate_all, bounds, population_size=24, generations=40, seed=0,
+                           mutation=0.7, crossover=0.9, start=None, tolerance=1e-6):
+    """
+    Minimizes over the box bounds with DE/rand/1/bin. evaluate_all maps a list
+    of vectors to their losses, so a whole generation is evaluated at once.
+    start, if given, seeds the first generation. Returns (best vector, best
+    loss, evaluations, best loss per generation).
+    """
+    rng = random.Random(seed)
+    dimensions = len(bounds)
+    population = [[rng.uniform(low, high) for low, high in bounds] for _ in range(population_size)]
+    if start is not None:
+        population[0] = list(start)
+    scores = evaluate_all(population)
+    evaluations = len(population)
+    history = [min(scores)]
+
+    for _ in range(generations):
+        trials = []
+        for i, target in enumerate(population):
+            a, b, c = rng.sample([j for j in range(population_size) if j != i], 3)
+            forced = rng.randrange(dimensions)
+            trial = []
+            for d, (low, high) in enumerate(bounds):
+                if d == forced or rng.random() < crossover:
+                    value = population[a][d] + mutation * (population[b][d] - population[c][d])
+                    trial.append(min(max(value, low), high))
+                else:
+                    trial.append(target[d])
+            trials.append(trial)
+        trial_scores = evaluate_all(trials)
+        evaluations += len(trials)
+        for i, score in enumerate(trial_scores):
+            if score <= scores[i]:
+                population[i], scores[i] = trials[i], score
+        history.append(min(scores))
+        if max(scores) - min(scores) < tolerance:
+            break
+
+    best = min(range(population_size), key=scores.__getitem__)
+    return population[best], scores[best], evaluations, history
+
+
+def calibrate(population, targets=DEFAULT_TARGETS, generations=40, population_size=24, seed=0, workers=1,
+              model=None):
+    """
+    Fits the FITTED coefficients so population's round statistics under the
+    scoring model (default Config.SCORING_MODEL) match targets. Returns a dict with the fitted 'parameters', their 'statistics',
+    those of the defaults and the optimizer's record.
+    """
+    bounds = [(low, high) for _, low, high, _ in FITTED]
+    start = [DEFAULT_PARAMETERS[name] for name, *_ in FITTED]
+    model = model or Config.SCORING_MODEL
+    started = time.perf_counter()
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(population, targets, model)) as executor:
+            def evaluate_all(vectors):
+                return list(executor.map(_evaluate, vectors, chunksize=max(1, len(vectors) // (workers * 2))))
+            vector, best_loss, evaluations, history = differential_evolution(
+                evaluate_all, bounds, population_size, generations, seed, start=start)
+    else:
+        _init_worker(population, targets, model)
+        vector, best_loss, evaluations, history = differential_evolution(
+            lambda vectors: [_evaluate(v) for v in vectors], bounds, population_size, generations, seed, start=start)
+
+    parameters = decode(vector)
+    return {
+        'parameters': parameters,
+        'statistics': round_statistics(parameters, population, model),
+        'default_statistics': round_statistics(dict(DEFAULT_PARAMETERS), population, model),
+        'optimizer': {
+            'method': 'differential_evolution',
+            'population': population_size,
+            'generations': len(history) - 1,
+            'evaluations': evaluations,
+            'loss': best_loss,
+            'loss_by_generation': history,
+            'seconds': round(time.perf_counter() - started, 2),
+            'seed': seed,
+        },
+    }
+
+
+def _rounded(statistics):
+    return {name: round(value, 4) for name, value in statistics.items()}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Fit the scoring model to target round-score statistics.')
+    parser.add_argument('--target-average', type=float, default=DEFAULT_TARGETS['scoring_average'],
+                        help='mean strokes to par per round')
+    parser.add_argument('--target-sd', type=float, default=DEFAULT_TARGETS['round_sd'],
+                        help='standard deviation of round scores')
+    parser.add_argument('--target-birdie-rate', type=float, default=DEFAULT_TARGETS['birdie_rate'],
+                        help='share of holes scored under par')
+    parser.add_argument('--league-seed', type=int, default=2025, help='calibrate on the seeded league for this seed')
+    parser.add_argument('--database', action='store_true', help='calibrate on the configured database instead')
+    parser.add_argument('--sample', type=int, default=1500, help='tournament entries to calibrate on')
+    parser.add_argument('--generations', type=int, default=40, help='optimizer generations')
+    parser.add_argument('--population', type=int, default=24, help='candidates per generation')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the sample and the optimizer')
+    parser.add_argument('--model', default=Config.SCORING_MODEL, choices=sorted(SCORING_MODELS),
+                        help='scoring model to fit (default SCORING_MODEL)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='worker processes')
+    parser.add_argument('--validate-rounds', type=int, default=5000,
+                        help='rounds to simulate with the fitted parameters as a check (0 to skip)')
+    parser.add_argument('--output', help=f'parameter file to write (default {CALIBRATIONS_DIR}/<version>.json)')
+    args = parser.parse_args()
+    if args.population < 4:
+        parser.error('--population must be at least 4')
+
+    targets = {'scoring_average': args.target_average, 'round_sd': args.target_sd,
+               'birdie_rate': args.target_birdie_rate}
+    if not args.database:
+        load_league(args.league_seed)
+    population = load_population(args.sample, args.seed)
+    if not population:
+        parser.error('No tournament entries to calibrate on.')
+    print(f"Calibrating on {len(population)} tournament entries with {args.workers} worker(s)...")
+
+    result = calibrate(population, targets, args.generations, args.population, args.seed, args.workers, args.model)
+    validation = None
+    if args.validate_rounds:
+        validation = _rounded(simulate_statistics(result['parameters'], population, args.validate_rounds, args.seed,
+                                                  args.model))
+
+    print(f"\n{'statistic':16s} {'target':>8s} {'default':>8s} {'fitted':>8s} {'simulated':>10s}")
+    for name in result['statistics']:
+        simulated = f"{validation[name]:10.3f}" if validation else ''
+        target = f"{targets[name]:8.3f}" if name in targets else ''
+        print(f"{name:16s} {target:>8s} {result['default_statistics'][name]:8.3f} "
+              f"{result['statistics'][name]:8.3f} {simulated}")
+    print(f"\n{'coefficient':18s} {'default':>8s} {'fitted':>8s}")
+    for name, *_ in FITTED:
+        print(f"{name:18s} {DEFAULT_PARAMETERS[name]:8.3f} {result['parameters'][name]:8.3f}")
+    optimizer = result['optimizer']
+    print(f"\n{optimizer['evaluations']} evaluations over {optimizer['generations']} generations "
+          f"in {optimizer['seconds']:.1f}s, loss {optimizer['loss']:.3f}")
+
+    output = args.output
+    if not output:
+        os.makedirs(CALIBRATIONS_DIR, exist_ok=True)
+        output = os.path.join(CALIBRATIONS_DIR, 'calibration.json.tmp')
+    version = save_scoring_parameters(
+        output, result['parameters'],
+        created_at=datetime.now().isoformat(timespec='seconds'),
+        model=get_model(args.model, result['parameters']).id,
+        targets=targets,
+        statistics=_rounded(result['statistics']),
+        default_statistics=_rounded(result['default_statistics']),
+        simulated_statistics=validation,
+        population={'source': 'database' if args.database else f'league seed {args.league_seed}',
+                    'entries': len(population)},
+        optimizer=optimizer)
+    if not args.output:
+        os.replace(output, os.path.join(CALIBRATIONS_DIR, f'{version}.json'))
+        output = os.path.join(CALIBRATIONS_DIR, f'{version}.json')
+    print(f"Wrote scoring parameters {version} to {output}")
+    print(f"Run with them: SCORING_PARAMS_PATH={output} python app.py")
@@ -0,0 +1,90 @@
+CUT_SIZE = 65  # Top 65 and ties make the cut
+
+# Scores to par are bounded: a hole is never scored better than eagle or worse
+# than triple bogey, so 36 holes stay well inside this range.
+MIN_SCORE = -200
+MAX_SCORE = 400
+
+
+class CutLineTracker:
+    """
+    Tracks the projected cut line while rounds 1 and 2 are being played.
+
+    Player scores to par are counted in a Fenwick tree indexed by score, which
+    gives O(log n) updates and O(log n) order-statistic lookups. The cut score
+    is recomputed on every update, so reading it is O(1).
+    """
+
+    def __init__(self, cut_size=CUT_SIZE):
+        self.cut_size = cut_size
+        self._size = MAX_SCORE - MIN_SCORE + 1
+        self._tree = [0] * (self._size + 1)
+        self._top_bit = 1 << (self._size.bit_length() - 1)
+        self._scores = {}  # player_id -> score_to_par
+        self.cut_score = None
+
+    @classmethod
+    def from_leaderboard(cls, leaderboard, cut_size=CUT_SIZE):
+        """Builds a tracker from the leaderboard rows of players who have started."""
+        tracker = cls(cut_size)
+        for p in leaderboard:
+            if p['has_started_tournament'] and p['status'] != 'cut':
+                tracker.set_score(p['player_id'], p['score_to_par'])
+        return tracker
+
+    def __len__(self):
+        return len(self._scores)
+
+    def _add(self, score, delta):
+        i = min(max(score, MIN_SCORE), MAX_SCORE) - MIN_SCORE + 1
+        while i <= self._size:
+            self._tree[i] += delta
+            i += i & -i
+
+    def _kth_score(self, k):
+        """Returns the k-th lowest tracked score (1-based)."""
+        pos, bit = 0, self._top_bit
+        while bit:
+            nxt = pos + bit
+            if nxt <= self._size and self._tree[nxt] < k:
+                pos = nxt
+                k -= self._tree[nxt]
+            bit >>= 1
+        return pos + MIN_SCORE
+
+    def set_score(self, player_id, score_to_par):
+        """Sets a player's total score to par."""
+        old = self._scores.get(player_id)
+        if old is not None:
+            self._add(old, -1)
+        self._scores[player_id] = score_to_par
+        self._add(score_to_par, 1)
+        self.cut_score = self._kth_score(self.cut_size) if len(self._scores) > self.cut_size else None
+
+    def record_hole(self, player_id, strokes_to_par):
+        """Adds a newly scored hole (strokes relative to the hole's par) to a player's total."""
+        self.set_score(player_id, self._scores.get(player_id, 0) + strokes_to_par)
+
+    def players_making_cut(self):
+        """Returns the players inside the cut line as leaderboard-style dicts."""
+        return [{'player_id': player_id, 'score_to_par': score}
+                for player_id, score in self._scores.items()
+                if self.cut_score is None or score <= self.cut_score]
+
+    def projection(self):
+        """Summarises the projected cut for the leaderboard and the API."""
+        players_inside = len(self._scores) if self.cut_score is None else self._count_at_or_below(self.cut_score)
+        return {
+            'score_to_par': self.cut_score,
+            'players_inside': players_inside,
+            'players_tracked': len(self._scores),
+            'cut_size': self.cut_size,
+        }
+
+    def _count_at_or_below(self, score):
+        i = min(max(score, MIN_SCORE), MAX_SCORE) - MIN_SCORE + 1
+        total = 0
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
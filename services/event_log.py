@@ -0,0 +1,92 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+from config import Config
+
+LOGGER_NAME = 'golf'
+TEXT_FORMAT = '%(asctime)s %(levelname)-7s %(name)s: %(message)s'
+
+# Attributes every LogRecord has; anything else on a record came from extra=
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats a record as one JSON object per line: its time, level, logger and
+    message, plus any fields passed with extra=, e.g.
+
+        logger.debug('%s scores a %d', name, score, extra={'event': 'hole_scored', 'score': score})
+    """
+
+    def format(self, record):
+        event = {
+            'time': self.formatTime(record, '%Y-%m-%dT%H:%M:%S') + f'.{int(record.msecs):03d}',
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        event.update((k, v) for k, v in vars(record).items() if k not in _RECORD_ATTRIBUTES)
+        if record.exc_info:
+            event['exception'] = self.formatException(record.exc_info)
+        return json.dumps(event, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Queues records untouched; formatting happens on the listener thread."""
+
+    def prepare(self, record):
+        # The message is rendered here so arguments cannot change before the
+        # listener gets to it; extra= fields are kept for the JSON formatter.
+        record.msg, record.args = record.getMessage(), None
+        return record
+
+
+_listener = None
+
+
+def configure_logging(level=None, json_output=None, stream=None):
+    """
+    Sends the app's log records (the 'golf' logger and its children) through
+    an unbounded queue to a background thread that formats and writes them,
+    so logging never blocks the simulation on I/O. Writes text lines, or JSON
+    objects with json_output, to stdout by default. Defaults come from
+    Config.LOG_LEVEL and Config.LOG_JSON. Calling it again reconfigures.
+    """
+    global _listener
+    level = level or Config.LOG_LEVEL
+    json_output = Config.LOG_JSON if json_output is None else json_output
+
+    if _listener is not None:
+        _listener.stop()
+    logger = logging.getLogger(LOGGER_NAME)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonFormatter() if json_output else logging.Formatter(TEXT_FORMAT, '%H:%M:%S'))
+    records = queue.SimpleQueue()
+    logger.addHandler(_QueueHandler(records))
+    logger.setLevel(level)
+    logger.propagate = False
+    _listener = logging.handlers.QueueListener(records, output)
+    _listener.start()
+    return logger
+
+
+def shutdown_logging():
+    """Writes out any queued records and stops the background writer."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
+
+
+def get_logger(name):
+    """The logger for one part of the app, e.g. get_logger('simulation')."""
+    return logging.getLogger(f'{LOGGER_NAME}.{name}')
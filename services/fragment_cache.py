@@ -0,0 +1,44 @@
+import threading
+from collections import OrderedDict
+
+
+class FragmentCache:
+    """
+    A bounded LRU cache of rendered fragments, such as template partials or
+    serialized API payloads.
+
+    Concurrent requests for the same missing key wait for a single render
+    instead of each rendering the fragment themselves.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def get_or_render(self, key, render):
+        """Returns the cached fragment for key, calling render() to build it on a miss."""
+        while True:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    return self._entries[key]
+                event = self._pending.get(key)
+                if event is None:
+                    event = self._pending[key] = threading.Event()
+                    break
+            # Another request is rendering this key; wait for it and look again.
+            event.wait()
+
+        try:
+            fragment = render()
+            with self._lock:
+                self._entries[key] = fragment
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            return fragment
+        finally:
+            with self._lock:
+                del self._pending[key]
+            event.set()
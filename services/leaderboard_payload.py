@@ -0,0 +1,53 @@
+STATUS_CODES = {'active': 0, 'cut': 1}
+
+
+def build_compact_leaderboard(tournament, players, round_is_over, projected_cut=None, hole_stats=(), include_names=False,
+                              price_board=None):
+    """
+    Packs a leaderboard into parallel column arrays for client-side rendering.
+
+    Every column is indexed like 'ids', which is in leaderboard order. Round
+    columns hold the score to par for each round (None if not started) and,
+    once a round is finished, its strokes in the matching 'rs' column. Player
+    names rarely change, so they are only included when asked for. The
+    current round's hole statistics are packed the same way under 'holes'.
+    With a price board, 'odds' holds each player's quoted win odds (None if
+    not priced) and 'quote_step' the step they were quoted at.
+    """
+    rounds = range(1, 5)
+    payload = {
+        'tournament_id': tournament['id'],
+        'status': tournament['status'],
+        'round': tournament['current_round'],
+        'step': tournament['simulation_step'],
+        'cut_applied': tournament['cut_applied'],
+        'round_is_over': round_is_over,
+        'cut_line': projected_cut['score_to_par'] if projected_cut else None,
+        'ids': [p['player_id'] for p in players],
+        'pos': [p['position'] for p in players],
+        'st': [STATUS_CODES.get(p['status'], 0) for p in players],
+        'started': [int(p['has_started_tournament']) for p in players],
+        'par': [p['score_to_par'] for p in players],
+        'thru': [p['holes_played'] if p['has_teed_off'] else None for p in players],
+        'tee': [p['tee_time_step'] for p in players],
+        'r': [[p[f'r{i}_info']['score_to_par'] for p in players] for i in rounds],
+        'rs': [[p[f'r{i}_info']['strokes'] if p[f'r{i}_info']['finished'] else None for p in players] for i in rounds],
+    }
+    payload['holes'] = {
+        'hole': [h['hole'] for h in hole_stats],
+        'par': [h['par'] for h in hole_stats],
+        'avg': [round(h['scoring_average'], 2) if h['players'] else None for h in hole_stats],
+        'eagles': [h['eagles'] for h in hole_stats],
+        'birdies': [h['birdies'] for h in hole_stats],
+        'pars': [h['pars'] for h in hole_stats],
+        'bogeys': [h['bogeys'] for h in hole_stats],
+        'doubles': [h['doubles'] for h in hole_stats],
+        'rank': [h['difficulty_rank'] for h in hole_stats],
+        'model_rank': [h['modifier_rank'] for h in hole_stats],
+    }
+    if price_board:
+        payload['quote_step'] = price_board['step']
+        payload['odds'] = [price_board['odds'].get(str(p['player_id'])) for p in players]
+    if include_names:
+        payload['names'] = {p['player_id']: p['player_name'] for p in players}
+    return payload
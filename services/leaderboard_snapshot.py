@@ -0,0 +1,141 @@
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from config import Config
+
+# Header layout: magic, format version, active slot, sequence number,
+# slot capacity, payload length of slot 0, payload length of slot 1.
+HEADER = struct.Struct('<4sHHQIII')
+HEADER_SIZE = 64
+MAGIC = b'GBLS'
+FORMAT_VERSION = 1
+MIN_SLOT_CAPACITY = 64 * 1024
+
+
+class LeaderboardSnapshotStore:
+    """
+    Publishes immutable, versioned leaderboard snapshots to memory-mapped files
+    so every web worker can serve the leaderboard without touching SQLite.
+
+    Each tournament gets one file holding two payload slots. The simulator
+    writes the next snapshot into the inactive slot and then flips the header,
+    so readers always see a complete snapshot. The header is guarded by a
+    sequence number (odd while the writer is updating it) and readers retry
+    whenever it changes underneath them.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._writers = {}  # path -> mmap owned by the publishing process
+        self._readers = {}  # path -> (inode, mmap)
+        self._decoded = {}  # path -> ((inode, seq), snapshot)
+
+    def _path(self, tournament_id):
+        return os.path.join(self.directory, f'leaderboard_{tournament_id}.snap')
+
+    # --- Writer side (simulation worker) ---
+    def publish(self, tournament_id, view):
+        """Publishes a tournament's leaderboard view as its next snapshot version."""
+        payload = json.dumps(dict(view, published_at=time.time()), separators=(',', ':')).encode('utf-8')
+
+        path = self._path(tournament_id)
+        with self._lock:
+            buf = self._writers.get(path)
+            if buf is None and os.path.exists(path):
+                buf = self._open_mmap(path)
+                if buf is not None:
+                    self._writers[path] = buf
+
+            if buf is None or len(payload) > HEADER.unpack_from(buf)[4]:
+                self._create_file(path, payload, buf)
+                return
+
+            _, _, active, seq, capacity, len0, len1 = HEADER.unpack_from(buf)
+            inactive = 1 - active
+            offset = HEADER_SIZE + inactive * capacity
+            buf[offset:offset + len(payload)] = payload
+
+            lengths = [len0, len1]
+            lengths[inactive] = len(payload)
+            # Mark the header as being written, then publish the new slot.
+            HEADER.pack_into(buf, 0, MAGIC, FORMAT_VERSION, active, seq + 1, capacity, len0, len1)
+            HEADER.pack_into(buf, 0, MAGIC, FORMAT_VERSION, inactive, seq + 2, capacity, *lengths)
+
+    def _create_file(self, path, payload, old_buf):
+        """Writes a fresh, larger snapshot file and atomically swaps it into place."""
+        os.makedirs(self.directory, exist_ok=True)
+        seq = HEADER.unpack_from(old_buf)[3] + 2 if old_buf is not None else 2
+        capacity = max(MIN_SLOT_CAPACITY, len(payload) * 2)
+
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, seq, capacity, len(payload), 0).ljust(HEADER_SIZE, b'\0'))
+            f.write(payload.ljust(capacity, b'\0'))
+            f.write(b'\0' * capacity)
+        os.replace(tmp_path, path)
+
+        if old_buf is not None:
+            old_buf.close()
+        self._writers[path] = self._open_mmap(path)
+
+    # --- Reader side (web workers) ---
+    def read(self, tournament_id):
+        """
+        Returns the latest snapshot for a tournament, or None if none has been
+        published. The decoded snapshot is shared between callers and is only
+        rebuilt when a new version is published, so it must not be mutated.
+        """
+        path = self._path(tournament_id)
+        try:
+            inode = os.stat(path).st_ino
+        except FileNotFoundError:
+            return None
+
+        cached = self._readers.get(path)
+        if cached is None or cached[0] != inode:
+            buf = self._open_mmap(path, writable=False)
+            if buf is None:
+                return None
+            # The replaced mapping is left to the garbage collector, since
+            # another request thread may still be reading from it.
+            self._readers[path] = (inode, buf)
+        buf = self._readers[path][1]
+
+        for _ in range(10):
+            magic, _, active, seq, capacity, len0, len1 = HEADER.unpack_from(buf)
+            if magic != MAGIC:
+                return None
+            if seq % 2:
+                continue
+
+            decoded = self._decoded.get(path)
+            if decoded and decoded[0] == (inode, seq):
+                return decoded[1]
+
+            length = len0 if active == 0 else len1
+            offset = HEADER_SIZE + active * capacity
+            raw = buf[offset:offset + length]
+            if HEADER.unpack_from(buf)[3] != seq:
+                continue  # The writer moved on while we were reading.
+
+            snapshot = json.loads(raw)
+            snapshot['version'] = seq // 2
+            self._decoded[path] = ((inode, seq), snapshot)
+            return snapshot
+        return None
+
+    @staticmethod
+    def _open_mmap(path, writable=True):
+        try:
+            with open(path, 'r+b' if writable else 'rb') as f:
+                access = mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+                return mmap.mmap(f.fileno(), 0, access=access)
+        except (FileNotFoundError, ValueError):
+            return None
+
+
+leaderboard_snapshots = LeaderboardSnapshotStore(Config.LEADERBOARD_SNAPSHOT_DIR)
@@ -0,0 +1,244 @@
+import math
+import threading
+import time
+from contextlib import contextmanager
+from apscheduler.events import EVENT_JOB_SUBMITTED, EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED
+from config import Config
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Bucket upper bounds, in seconds unless noted. Tick buckets are dense around
+# the one-second budget so alerts can fire on the approach to it.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+TICK_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 0.75, 0.9, 1.0, 1.5, 2.5, 5.0)
+COUNT_BUCKETS = (0, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)  # queries or players
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for v in labels.values())
+    return '{' + ','.join(f'{k}="{v}"' for k, v in zip(labels, escaped)) + '}'
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}  # label values tuple -> value
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f'{self.name} takes labels {self.labelnames}, got {tuple(labels)}')
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def value(self, **labels):
+        """The current value for a set of labels, or None if nothing was recorded."""
+        with self._lock:
+            return self._values.get(self._key(labels))
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._samples(dict(zip(self.labelnames, key)), value))
+        return lines
+
+    def _samples(self, labels, value):
+        return [f'{self.name}{_format_labels(labels)} {_format_value(value)}']
+
+
+class Counter(_Metric):
+    """A monotonically increasing total."""
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """A value that can go up and down."""
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """Counts observations into cumulative buckets, with their sum and count."""
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            counts = state[0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def _samples(self, labels, state):
+        counts, total, count = state
+        lines, cumulative = [], 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            lines.append(f'{self.name}_bucket{_format_labels(dict(labels, le=_format_value(bound)))} {cumulative}')
+        lines.append(f'{self.name}_sum{_format_labels(labels)} {_format_value(float(total))}')
+        lines.append(f'{self.name}_count{_format_labels(labels)} {count}')
+        return lines
+
+
+class MetricsRegistry:
+    """In-process metrics, rendered in the Prometheus text exposition format."""
+
+    def __init__(self):
+        self._metrics = []
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+TICK_SECONDS = registry.histogram(
+    'golf_tick_duration_seconds', 'Time taken to advance the simulation by one tick.', buckets=TICK_BUCKETS)
+TICKS_OVER_BUDGET = registry.counter(
+    'golf_ticks_over_budget_total', 'Ticks that took longer than the scheduler interval.')
+TICK_LAST_SECONDS = registry.gauge(
+    'golf_tick_last_duration_seconds', 'Duration of the most recent tick.')
+TICK_BUDGET_SECONDS = registry.gauge(
+    'golf_tick_budget_seconds', 'Scheduler interval each tick has to finish within.')
+TICK_BUDGET_SECONDS.set(Config.SIMULATION_TICK_SECONDS)
+TICK_PLAYERS_SCORED = registry.histogram(
+    'golf_tick_players_scored', 'Player hole scores recorded per tick.', buckets=COUNT_BUCKETS)
+PLAYERS_SCORED = registry.counter(
+    'golf_players_scored_total', 'Player hole scores recorded by the simulation.')
+TICK_SQL_QUERIES = registry.histogram(
+    'golf_tick_sql_queries', 'SQL statements executed per tick.', buckets=COUNT_BUCKETS)
+TICK_SQL_SECONDS = registry.histogram(
+    'golf_tick_sql_seconds', 'Time spent executing SQL statements per tick.', buckets=TICK_BUCKETS)
+SQL_QUERIES = registry.counter(
+    'golf_sql_queries_total', 'SQL statements executed through the Database layer.')
+SQL_SECONDS = registry.counter(
+    'golf_sql_seconds_total', 'Time spent executing SQL statements through the Database layer.')
+SCHEDULER_LAG_SECONDS = registry.histogram(
+    'golf_scheduler_lag_seconds', 'Delay between a scheduled tick time and the tick being submitted to run.')
+SCHEDULER_SKIPPED = registry.counter(
+    'golf_scheduler_skipped_ticks_total', 'Ticks the scheduler skipped, by reason.', ('reason',))
+REQUEST_SECONDS = registry.histogram(
+    'golf_request_duration_seconds', 'Time taken to serve a request, by route.', ('route', 'method'))
+REQUESTS = registry.counter(
+    'golf_requests_total', 'Requests served, by route and status code.', ('route', 'method', 'status'))
+
+
+class TickStats:
+    """What one tick did: SQL statements run, time spent in them and player scores recorded."""
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.players_scored = 0
+
+
+# The tick, if any, that the current thread is running
+_local = threading.local()
+
+
+def record_query(seconds):
+    """Records one SQL statement; called by the Database layer's connections."""
+    SQL_QUERIES.inc()
+    SQL_SECONDS.inc(seconds)
+    stats = getattr(_local, 'tick', None)
+    if stats is not None:
+        stats.queries += 1
+        stats.sql_seconds += seconds
+
+
+def record_players_scored(count):
+    """Records player hole scores saved by the simulation."""
+    PLAYERS_SCORED.inc(count)
+    stats = getattr(_local, 'tick', None)
+    if stats is not None:
+        stats.players_scored += count
+
+
+@contextmanager
+def track_tick():
+    """
+    Times one simulation tick and attributes the SQL statements and player
+    scores recorded on this thread meanwhile to it.
+    """
+    stats = TickStats()
+    _local.tick = stats
+    started = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        elapsed = time.perf_counter() - started
+        _local.tick = None
+        TICK_SECONDS.observe(elapsed)
+        TICK_LAST_SECONDS.set(elapsed)
+        if elapsed > Config.SIMULATION_TICK_SECONDS:
+            TICKS_OVER_BUDGET.inc()
+        TICK_PLAYERS_SCORED.observe(stats.players_scored)
+        TICK_SQL_QUERIES.observe(stats.queries)
+        TICK_SQL_SECONDS.observe(stats.sql_seconds)
+
+
+# Scheduler events record_scheduler_event listens for
+SCHEDULER_EVENTS = EVENT_JOB_SUBMITTED | EVENT_JOB_MAX_INSTANCES | EVENT_JOB_MISSED
+
+
+def record_scheduler_event(event):
+    """
+    APScheduler listener: records how late each tick was submitted to run, and
+    ticks skipped because the previous one was still running or that were missed.
+    """
+    if event.code == EVENT_JOB_SUBMITTED:
+        now = time.time()
+        for scheduled in event.scheduled_run_times:
+            SCHEDULER_LAG_SECONDS.observe(max(now - scheduled.timestamp(), 0.0))
+    elif event.code == EVENT_JOB_MAX_INSTANCES:
+        SCHEDULER_SKIPPED.inc(reason='still_running')
+    elif event.code == EVENT_JOB_MISSED:
+        SCHEDULER_SKIPPED.inc(reason='missed')
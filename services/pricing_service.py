@@ -0,0 +1,246 @@
+import math
+import random
+import threading
+from statistics import NormalDist
+from models.database import db
+from config import Config
+
+MARKETS = ('outright', 'round_matchup', 'tournament_matchup', 'group')
+# Board section that prices each head-to-head market
+MATCHUP_SCOPES = {'round_matchup': 'round', 'tournament_matchup': 'tournament'}
+
+# Standard normal quantiles at evenly spaced probabilities. Picking from this
+# table is several times cheaper than random.gauss and plenty accurate for
+# pricing from a few hundred samples.
+NORMAL_TABLE = [NormalDist().inv_cdf((i + 0.5) / 4096) for i in range(4096)]
+
+
+class PricingService:
+    """
+    Prices every market in a tournament once per simulation step: each player
+    to win, head-to-heads within each tee group over the current round and
+    the tournament, and the best score in each tee group this round.
+
+    A player's final score to par is approximated as their current score plus
+    a normal variable whose mean and variance are summed over the holes they
+    have left, from the simulation's fast scoring model and the same player
+    and course inputs the live scoring uses. Win
+    probabilities come from a small Monte Carlo over those distributions,
+    seeded by (tournament_id, step) so every process prices a step the same.
+    The last few boards are kept so a quote stays valid for a short while.
+    """
+
+    def __init__(self, sim_service, samples=Config.PRICE_BOARD_SAMPLES, margin=Config.PRICE_BOARD_MARGIN,
+                 history=Config.PRICE_QUOTE_STEPS):
+        self.sim_service = sim_service
+        self.samples = samples
+        self.margin = margin
+        self.history = history
+        self._lock = threading.Lock()
+        self._boards = {}  # tournament_id -> recent boards, newest first
+        self._inputs = {}  # tournament_id -> per-player scoring distributions
+
+    def get_boards(self, tournament, players):
+        """
+        Returns the tournament's recent price boards, newest first, building the
+        board for the current step, round and cut if needed. Each board is a
+        dict with the 'step', 'round' and 'cut_applied' it was priced at,
+        outright 'odds' keyed by player id, 'matchups' keyed by scope then
+        "player:opponent", and 'groups' keyed by tee group then player id (ids
+        as strings). Returns an empty list once betting is closed.
+        """
+        tournament_id = tournament['id']
+        if tournament['status'] not in ('pending', 'active'):
+            with self._lock:
+                self._boards.pop(tournament_id, None)
+                self._inputs.pop(tournament_id, None)
+            return []
+
+        step = tournament['simulation_step']
+        # A new round or the cut changes the field and the round being priced
+        # without advancing the step, so the board is keyed on all three
+        key = (step, tournament['current_round'], tournament['cut_applied'])
+        with self._lock:
+            boards = self._boards.get(tournament_id, [])
+            if boards and (boards[0]['step'], boards[0]['round'], boards[0]['cut_applied']) == key:
+                return boards
+
+        board = self._build_board(tournament, players)
+        with self._lock:
+            boards = [b for b in self._boards.get(tournament_id, []) if b['step'] != step]
+            boards = self._boards[tournament_id] = [board] + boards[:self.history - 1]
+        return boards
+
+    def _player_distributions(self, tournament, player_ids):
+        """
+        For each player in the field, the mean and variance of their strokes
+        to par over the last k holes of a round, for k = 0..18. Skills and the
+        course never change during a tournament, so this is computed once, and
+        again only if player_ids includes a player missing from the field.
+        """
+        tournament_id = tournament['id']
+        distributions = self._inputs.get(tournament_id)
+        if distributions is not None and all(player_id in distributions for player_id in player_ids):
+            return distributions
+
+        inputs = self.sim_service.scoring_inputs(tournament_id, tournament, player_ids)
+        model = self.sim_service.fast_model
+        distributions = {}
+        for player_id in inputs.skills:
+            means, variances = [0.0], [0.0]
+            for hole_number in sorted(inputs.holes, reverse=True):
+                mean, variance = model.expected(inputs, player_id, hole_number)
+                means.append(means[-1] + mean - inputs.holes[hole_number][0])
+                variances.append(variances[-1] + variance)
+            distributions[player_id] = (means, variances)
+
+        with self._lock:
+            self._inputs[tournament_id] = distributions
+        return distributions
+
+    def _build_board(self, tournament, players):
+        distributions = self._player_distributions(tournament, [p['player_id'] for p in players])
+        current_round = tournament['current_round']
+        rounds_left = 4 - current_round
+
+        contenders = []
+        for p in players:
+            dist = distributions.get(p['player_id'])
+            if p['status'] == 'cut' or dist is None:
+                continue
+            means, variances = dist
+            left = max(len(means) - 1 - p['holes_played'], 0)
+            round_so_far = p[f'r{current_round}_info']['score_to_par'] or 0
+            contenders.append({
+                'player_id': p['player_id'],
+                'group': p['tee_group'],
+                'finished_round': left == 0,
+                # Strokes to par still to come this round, and in the rounds after it
+                'round': (round_so_far, means[left], math.sqrt(variances[left])),
+                'rest': (p['score_to_par'] - round_so_far + rounds_left * means[-1],
+                         math.sqrt(rounds_left * variances[-1])),
+            })
+
+        rng = random.Random(f"{tournament['id']}:{tournament['simulation_step']}")
+        wins, groups = self._simulate(contenders, rng)
+
+        odds = {}
+        for c in contenders:
+            odds[str(c['player_id'])] = self._odds(wins[c['player_id']] / self.samples)
+
+        matchups = {'round': {}, 'tournament': {}}
+        group_odds = {}
+        for group_num, group in groups.items():
+            for (a, b), (round_record, total_record) in group['pairs'].items():
+                for market, (a_wins, b_wins) in (('round', round_record), ('tournament', total_record)):
+                    # Tied matchups are void, so price on the decided samples only
+                    decided = a_wins + b_wins
+                    if decided:
+                        matchups[market][f'{a}:{b}'] = self._odds(a_wins / decided)
+                        matchups[market][f'{b}:{a}'] = self._odds(b_wins / decided)
+            group_odds[str(group_num)] = {str(pid): self._odds(share / self.samples)
+                                          for pid, share in group['best'].items()}
+
+        return {
+            'step': tournament['simulation_step'],
+            'round': current_round,
+            'cut_applied': tournament['cut_applied'],
+            'odds': odds,
+            'matchups': matchups,
+            'groups': group_odds,
+        }
+
+    def _odds(self, probability):
+        probability = max(probability, 1.0 / Config.MAX_QUOTED_ODDS)
+        return round(min(max((1 - self.margin) / probability, 1.01), Config.MAX_QUOTED_ODDS), 2)
+
+    def _simulate(self, contenders, rng):
+        """
+        Simulates the rest of the tournament for every contender in one batch.
+
+        Each sample draws every player's remaining strokes this round and in
+        later rounds once. Their round score and 72-hole total come from the
+        same draws, so round and tournament markets are correlated just like
+        the outright. The same samples are then read for the outright winner
+        and, within each tee group still playing the round, for every
+        head-to-head pair and the best score in the group.
+        """
+        wins = {c['player_id']: 0.0 for c in contenders}
+        groups = {}
+        for i, c in enumerate(contenders):
+            groups.setdefault(c['group'], []).append(i)
+        # A group that has finished the round has nothing left to price
+        groups = {g: members for g, members in groups.items()
+                  if g is not None and len(members) > 1 and not all(contenders[i]['finished_round'] for i in members)}
+        records = {g: {'pairs': {(contenders[i]['player_id'], contenders[j]['player_id']): ([0, 0], [0, 0])
+                                 for x, i in enumerate(members) for j in members[x + 1:]},
+                       'best': {contenders[i]['player_id']: 0.0 for i in members}}
+                   for g, members in groups.items()}
+        if not contenders:
+            return wins, records
+
+        choices = rng.choices
+        params = [(c['round'], c['rest']) for c in contenders]
+        ids = [c['player_id'] for c in contenders]
+        # Flatten the pairs so the sample loop only indexes lists
+        pairs = [(i, j) + records[g]['pairs'][(ids[i], ids[j])]
+                 for g, members in groups.items() for x, i in enumerate(members) for j in members[x + 1:]]
+        group_members = [(members, records[g]['best']) for g, members in groups.items()]
+        for _ in range(self.samples):
+            draws = iter(choices(NORMAL_TABLE, k=2 * len(params)))
+            round_scores, totals = [], []
+            for ((so_far, round_mean, round_sd), (rest_mean, rest_sd)), z in zip(params, draws):
+                round_score = so_far + round(round_mean + round_sd * z)
+                round_scores.append(round_score)
+                totals.append(round_score + round(rest_mean + rest_sd * next(draws)))
+
+            best = min(totals)
+            leaders = [ids[i] for i, total in enumerate(totals) if total == best]
+            for player_id in leaders:
+                wins[player_id] += 1.0 / len(leaders)
+
+            for i, j, round_tally, total_tally in pairs:
+                if round_scores[i] != round_scores[j]:
+                    round_tally[round_scores[j] < round_scores[i]] += 1
+                if totals[i] != totals[j]:
+                    total_tally[totals[j] < totals[i]] += 1
+            for members, group_best in group_members:
+                scores = [round_scores[i] for i in members]
+                low = min(scores)
+                group_leaders = [ids[i] for i, score in zip(members, scores) if score == low]
+                for player_id in group_leaders:
+                    group_best[player_id] += 1.0 / len(group_leaders)
+        return wins, records
+
+
+def find_quote(boards, quoted_step, market, player_id, opponent_id=None):
+    """
+    Looks up the price a bet was quoted at. Returns a dict with the 'odds' and,
+    for round and group markets, the 'round_num' and 'group_num' the bet
+    settles on. Raises ValueError if the quote is no longer on the board or
+    the selection is not priced.
+    """
+    if market not in MARKETS:
+        raise ValueError('Unknown market.')
+    board = next((b for b in boards if b['step'] == quoted_step), None)
+    if board is None:
+        raise ValueError('The odds have moved since your quote. Please check the new price and try again.')
+
+    quote = {'odds': None, 'round_num': None, 'group_num': None}
+    if market == 'outright':
+        quote['odds'] = board['odds'].get(str(player_id))
+    elif market == 'group':
+        for group_num, group in board['groups'].items():
+            if str(player_id) in group:
+                quote.update(odds=group[str(player_id)], round_num=board['round'], group_num=int(group_num))
+                break
+    else:
+        if opponent_id is None:
+            raise ValueError('Matchup bets need an opponent.')
+        quote['odds'] = board['matchups'][MATCHUP_SCOPES[market]].get(f'{player_id}:{opponent_id}')
+        if market == 'round_matchup':
+            quote['round_num'] = board['round']
+
+    if quote['odds'] is None:
+        raise ValueError('That selection is not available.')
+    return quote
@@ -0,0 +1,155 @@
+import cProfile
+import io
+import marshal
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+
+TICKS = 'ticks'
+
+
+class ProfileSession:
+    """Profiles of the next `count` runs of one target, aggregated as they finish."""
+
+    def __init__(self, target, count):
+        self.target = target
+        self.requested = count
+        self.remaining = count  # runs not yet claimed
+        self.running = 0
+        self.completed = 0
+        self.seconds = 0.0
+        self.started_at = time.time()
+        self.finished_at = None
+        self.stats = None
+
+    @property
+    def done(self):
+        return self.remaining == 0 and self.running == 0
+
+    def status(self):
+        return {
+            'target': self.target,
+            'requested': self.requested,
+            'completed': self.completed,
+            'running': self.running,
+            'done': self.done,
+            'profiled_seconds': round(self.seconds, 6),
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+        }
+
+
+class Profiler:
+    """
+    On-demand cProfile of the next N simulation ticks (target 'ticks') or the
+    next N requests to a route (target: its rule, e.g.
+    '/leaderboard/<int:tournament_id>'), with the profiles of all N runs
+    merged into one set of stats to download.
+
+    Only the thread running a claimed tick or request is profiled. While
+    nothing is armed, begin() returns after reading one attribute, so the
+    hooks cost nothing in normal operation.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions = {}  # target -> ProfileSession, kept after completion for download
+        self.armed = False  # whether any session still has runs to claim
+
+    def start(self, target, count):
+        """Arms profiling of the next count runs of target, replacing any earlier session for it."""
+        if count < 1:
+            raise ValueError('count must be at least 1.')
+        with self._lock:
+            session = self._sessions[target] = ProfileSession(target, count)
+            self.armed = True
+        return session.status()
+
+    def cancel(self, target):
+        """Stops claiming runs for target; runs already profiled are kept. Returns False if unknown."""
+        with self._lock:
+            session = self._sessions.get(target)
+            if session is None:
+                return False
+            session.remaining = 0
+            if session.done and session.finished_at is None:
+                session.finished_at = time.time()
+            self._rearm()
+        return True
+
+    def status(self):
+        with self._lock:
+            return [session.status() for session in self._sessions.values()]
+
+    def begin(self, target):
+        """
+        Starts profiling this run of target if a session wants it. Returns a
+        handle to pass to end(), or None.
+        """
+        if not self.armed:
+            return None
+        with self._lock:
+            session = self._sessions.get(target)
+            if session is None or session.remaining == 0:
+                return None
+            session.remaining -= 1
+            session.running += 1
+            self._rearm()
+        profile = cProfile.Profile()
+        started = time.perf_counter()
+        profile.enable()
+        return session, profile, started
+
+    def end(self, handle):
+        """Stops a profile started by begin() and merges it into its session."""
+        if handle is None:
+            return
+        session, profile, started = handle
+        profile.disable()
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            if session.stats is None:
+                session.stats = pstats.Stats(profile)
+            else:
+                session.stats.add(profile)
+            session.running -= 1
+            session.completed += 1
+            session.seconds += elapsed
+            if session.done:
+                session.finished_at = time.time()
+
+    @contextmanager
+    def profile(self, target):
+        """Profiles the block if a session for target wants this run."""
+        handle = self.begin(target)
+        try:
+            yield
+        finally:
+            self.end(handle)
+
+    def _rearm(self):
+        self.armed = any(session.remaining for session in self._sessions.values())
+
+    def export(self, target, fmt='pstats', sort='cumulative', limit=50):
+        """
+        The aggregated stats for target: 'pstats' gives the binary format that
+        pstats.Stats, snakeviz and similar tools load; 'text' a report of the
+        top `limit` functions by `sort`. Returns None if nothing was profiled.
+        """
+        with self._lock:
+            session = self._sessions.get(target)
+            if session is None or session.stats is None:
+                return None
+            if fmt == 'pstats':
+                return marshal.dumps(session.stats.stats)
+            stream = io.StringIO()
+            stats = pstats.Stats(stream=stream)
+            stats.add(session.stats)
+            stream.write(f"Profile of {session.completed} run(s) of {target}, "
+                         f"{session.seconds:.3f}s profiled\n")
+            stats.sort_stats(sort).print_stats(limit)
+            return stream.getvalue().encode()
+
+
+profiler = Profiler()
@@ -0,0 +1,176 @@
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from config import Config
+from services.event_log import get_logger
+
+logger = get_logger('query_trace')
+
+
+def parameters_shape(parameters, many=False):
+    """
+    Describes statement parameters without their values, e.g. '(int, str)',
+    '{tournament_id: int}', or '500 x (int, float)' for executemany.
+    """
+    if many:
+        rows = parameters if isinstance(parameters, (list, tuple)) else list(parameters)
+        return f"{len(rows)} x {parameters_shape(rows[0]) if rows else '()'}"
+    if isinstance(parameters, dict):
+        return '{' + ', '.join(f'{k}: {type(v).__name__}' for k, v in parameters.items()) + '}'
+    return '(' + ', '.join(type(v).__name__ for v in parameters) + ')'
+
+
+class QueryRecord:
+    """One traced statement: its SQL, parameter values and shape, rows fetched and execute time."""
+
+    __slots__ = ('sql', 'parameters', 'shape', 'rows', 'seconds')
+
+    def __init__(self, sql, parameters, shape, seconds):
+        self.sql = ' '.join(sql.split())
+        self.parameters = parameters
+        self.shape = shape
+        self.rows = 0
+        self.seconds = seconds
+
+
+class QueryTrace:
+    """
+    The statements executed through the Database layer on one thread while the
+    trace was active, e.g. during one request or one simulation tick.
+    """
+
+    def __init__(self, label):
+        self.label = label
+        self.queries = []
+        self.started = time.perf_counter()
+        self.seconds = None
+
+    @property
+    def query_seconds(self):
+        return sum(q.seconds for q in self.queries)
+
+    def duplicates(self):
+        """Statements run more than once with identical parameters: [(sql, parameters, count)], most first."""
+        counts = Counter((q.sql, repr(q.parameters)) for q in self.queries)
+        return [(sql, parameters, count) for (sql, parameters), count in counts.most_common() if count > 1]
+
+    def n_plus_one(self, threshold=None):
+        """
+        Statements run at least threshold times (default
+        Config.QUERY_TRACE_REPEAT_THRESHOLD) with any parameters, the usual
+        sign of a lookup inside a loop: [(sql, count, total seconds)], most first.
+        """
+        threshold = threshold or Config.QUERY_TRACE_REPEAT_THRESHOLD
+        counts, seconds = Counter(), Counter()
+        for q in self.queries:
+            counts[q.sql] += 1
+            seconds[q.sql] += q.seconds
+        return [(sql, count, seconds[sql]) for sql, count in counts.most_common() if count >= threshold]
+
+    def flagged(self):
+        return bool(self.duplicates() or self.n_plus_one())
+
+    def report(self, limit=10):
+        """A readable summary: totals, then repeated statements and the slowest ones."""
+        lines = [f"{self.label}: {len(self.queries)} queries, {self.query_seconds * 1000:.1f} ms in SQL"
+                 + (f" of {self.seconds * 1000:.1f} ms" if self.seconds is not None else '')]
+        repeated = self.n_plus_one()
+        if repeated:
+            lines.append('  Repeated statements (possible N+1):')
+            lines.extend(f"    {count:5d}x {total * 1000:8.1f} ms  {sql[:160]}" for sql, count, total in repeated[:limit])
+        duplicates = self.duplicates()
+        if duplicates:
+            lines.append('  Identical statements run more than once:')
+            lines.extend(f"    {count:5d}x  {sql[:120]}  {parameters[:60]}" for sql, parameters, count in duplicates[:limit])
+        slowest = sorted(self.queries, key=lambda q: q.seconds, reverse=True)[:min(limit, 3)]
+        if slowest:
+            lines.append('  Slowest:')
+            lines.extend(f"    {q.seconds * 1000:8.2f} ms  {q.rows:5d} rows  {q.sql[:120]} {q.shape}" for q in slowest)
+        return '\n'.join(lines)
+
+
+# Traces active on the current thread, innermost last
+_local = threading.local()
+
+
+def tracing():
+    """Whether any trace is active on this thread."""
+    return bool(getattr(_local, 'traces', None))
+
+
+def trace_query(sql, parameters, seconds, many=False):
+    """
+    Records a statement in every trace active on this thread. Returns the
+    record, so the cursor can count rows as they are fetched, or None when
+    nothing is being traced.
+    """
+    traces = getattr(_local, 'traces', None)
+    if not traces:
+        return None
+    record = QueryRecord(sql, parameters, parameters_shape(parameters, many), seconds)
+    for trace in traces:
+        trace.queries.append(record)
+    return record
+
+
+def start_trace(label):
+    """Starts tracing the statements this thread executes; pair with finish_trace."""
+    trace = QueryTrace(label)
+    traces = getattr(_local, 'traces', None)
+    if traces is None:
+        traces = _local.traces = []
+    traces.append(trace)
+    return trace
+
+
+def finish_trace(trace):
+    _local.traces.remove(trace)
+    trace.seconds = time.perf_counter() - trace.started
+    return trace
+
+
+def report_trace(trace):
+    """
+    Logs the trace's report if it ran more than Config.QUERY_TRACE_MIN_QUERIES
+    statements or repeated any.
+    """
+    if len(trace.queries) > Config.QUERY_TRACE_MIN_QUERIES or trace.flagged():
+        logger.info("%s", trace.report(), extra={'event': 'query_trace', 'label': trace.label,
+                                                'queries': len(trace.queries), 'sql_seconds': trace.query_seconds})
+
+
+@contextmanager
+def trace_queries(label='queries'):
+    """Traces the statements this thread executes through the Database layer inside the block."""
+    trace = start_trace(label)
+    try:
+        yield trace
+    finally:
+        finish_trace(trace)
+
+
+@contextmanager
+def max_queries(limit, label='block'):
+    """
+    Fails with an AssertionError, and the trace's report, if the block runs
+    more than limit statements. For pinning query counts in tests:
+
+        with max_queries(40):
+            db.get_leaderboard_from_live_scores(tournament_id)
+    """
+    with trace_queries(label) as trace:
+        yield trace
+    if len(trace.queries) > limit:
+        raise AssertionError(f"Expected at most {limit} queries, ran {len(trace.queries)}.\n{trace.report()}")
+
+
+@contextmanager
+def trace_if_enabled(label):
+    """Traces and logs the block when Config.QUERY_TRACE is on. Costs nothing when it is off."""
+    if not Config.QUERY_TRACE:
+        yield None
+        return
+    with trace_queries(label) as trace:
+        yield trace
+    report_trace(trace)
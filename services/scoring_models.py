@@ -0,0 +1,357 @@
+import bisect
+import random
+from abc import ABC, abstractmethod
+from services.scoring_params import load_scoring_parameters, parameters_version
+
+# Score given for a hole the course does not have
+DEFAULT_HOLE_SCORE = 4
+
+
+def effective_skill(params, player_skills, course_characteristics=None):
+    """
+    Combines a player's detailed skills and the course characteristics that
+    affect performance into the single weighted skill used to score holes,
+    with the coefficients in params (see services/scoring_params.py).
+    """
+    # Extract skills from the player data
+    overall_skill = player_skills['overall_skill']
+    driving_skill = player_skills['driving_skill']
+    approach_skill = player_skills['approach_skill']
+    short_game_skill = player_skills['short_game_skill']
+    putting_skill = player_skills['putting_skill']
+    
+    # Base weighted skill calculation
+    weighted_skill = (overall_skill * params['weight_overall'] + driving_skill * params['weight_driving'] +
+                      approach_skill * params['weight_approach'] + short_game_skill * params['weight_short_game'] +
+                      putting_skill * params['weight_putting'])
+    
+    # Apply course characteristic modifiers
+    if course_characteristics:
+        # Weather effects
+        weather_modifier = 0.0
+        
+        # Temperature effects (extreme temperatures affect performance)
+        temp_factor = abs(course_characteristics['avg_temperature'] - 0.5) * 2  # 0 at 50%, max at extremes
+        weather_modifier += temp_factor * 0.1
+        
+        # Humidity effects (high humidity is more challenging)
+        weather_modifier += course_characteristics['humidity_level'] * 0.05
+        
+        # Wind effects (wind affects all shots)
+        wind_penalty = course_characteristics['wind_factor'] * 0.15
+        weather_modifier += wind_penalty
+        
+        # Rain effects (rain makes conditions more difficult)
+        weather_modifier += course_characteristics['rain_probability'] * 0.1
+        
+        # Course design effects
+        design_modifier = 0.0
+        
+        # Penal vs strategic design
+        if course_characteristics['design_strategy'] > 0.7:
+            # Penal courses favor accuracy over distance
+            accuracy_bonus = (approach_skill + short_game_skill) / 2 - weighted_skill
+            design_modifier += accuracy_bonus * 0.1
+        else:
+            # Strategic courses favor overall skill
+            design_modifier += 0.0  # Neutral effect
+        
+        # Course length effects (longer courses favor driving distance)
+        if course_characteristics['course_length'] > 0.7:
+            driving_bonus = driving_skill - weighted_skill
+            design_modifier += driving_bonus * 0.1
+        
+        # Narrowness effects (narrow courses favor accuracy)
+        if course_characteristics['narrowness_factor'] > 0.7:
+            accuracy_penalty = (weighted_skill - (approach_skill + short_game_skill) / 2) * 0.1
+            design_modifier += accuracy_penalty
+        
+        # Hazard density effects (more hazards = more challenging)
+        hazard_penalty = course_characteristics['hazard_density'] * 0.1
+        design_modifier += hazard_penalty
+        
+        # Course conditions effects
+        conditions_modifier = 0.0
+        
+        # Green speed effects (faster greens favor putting skill)
+        if course_characteristics['green_speed'] > 0.7:
+            putting_bonus = putting_skill - weighted_skill
+            conditions_modifier += putting_bonus * 0.15
+        elif course_characteristics['green_speed'] < 0.3:
+            putting_penalty = (weighted_skill - putting_skill) * 0.1
+            conditions_modifier += putting_penalty
+        
+        # Turf firmness effects (firmer turf affects approach shots)
+        if course_characteristics['turf_firmness'] > 0.7:
+            approach_penalty = (weighted_skill - approach_skill) * 0.1
+            conditions_modifier += approach_penalty
+        
+        # Rough length effects (longer rough affects all shots)
+        rough_penalty = course_characteristics['rough_length'] * 0.1
+        conditions_modifier += rough_penalty
+        
+        # Mental factors
+        mental_modifier = 0.0
+        
+        # Prestige effects (higher prestige = more pressure)
+        prestige_pressure = course_characteristics['prestige_level'] * 0.1
+        mental_modifier += prestige_pressure
+        
+        # Crowd effects (larger crowds = more pressure)
+        crowd_pressure = course_characteristics['crowd_factor'] * 0.05
+        mental_modifier += crowd_pressure
+        
+        # Course age effects (historic courses can be intimidating)
+        if course_characteristics['course_age'] > 0.7:
+            historic_intimidation = 0.05
+            mental_modifier += historic_intimidation
+        
+        # Elevation and terrain effects
+        physical_modifier = 0.0
+        
+        # Elevation effects (high elevation affects distance and stamina)
+        elevation_penalty = course_characteristics['elevation_factor'] * 0.1
+        physical_modifier += elevation_penalty
+        
+        # Terrain difficulty effects (hilly courses are more physically demanding)
+        terrain_penalty = course_characteristics['terrain_difficulty'] * 0.05
+        physical_modifier += terrain_penalty
+        
+        # Apply all modifiers to the weighted skill
+        total_modifier = weather_modifier + design_modifier + conditions_modifier + mental_modifier + physical_modifier
+        weighted_skill += total_modifier * params['modifier_scale']  # Scale up the modifier effect
+    else:
+        # No course characteristics available, use base calculation
+        pass
+    
+    return weighted_skill
+
+
+def hole_distribution(mean_to_par, half_width, best, worst):
+    """
+    Probabilities of each score to par from best to worst, for a hole score of
+    round(mean_to_par + uniform(-half_width, half_width)) clamped to [best, worst].
+    """
+    low = mean_to_par - half_width
+    width = 2.0 * half_width
+    probabilities = []
+    below = 0.0  # P(raw score < k - 0.5)
+    for k in range(best, worst):
+        edge = k + 0.5
+        if width > 0:
+            cdf = min(max((edge - low) / width, 0.0), 1.0)
+        else:
+            cdf = 1.0 if mean_to_par < edge else 0.0
+        probabilities.append(cdf - below)
+        below = cdf
+    probabilities.append(1.0 - below)
+    return probabilities
+
+
+def cumulative_probabilities(probabilities):
+    """
+    The running totals of probabilities but the last, for inverse-CDF sampling:
+    bisect.bisect_right(cumulative, u) is the index of the outcome for a
+    uniform draw u in [0, 1).
+    """
+    cumulative, total = [], 0.0
+    for p in probabilities[:-1]:
+        total += p
+        cumulative.append(total)
+    return cumulative
+
+
+class ScoringInputs:
+    """
+    What every scoring model needs for one tournament, computed once: each
+    entered player's weighted skill and the course's holes. Models keep any
+    precomputation of their own in tables, keyed by model name.
+    """
+
+    def __init__(self, skills, holes):
+        self.skills = skills  # player id -> weighted skill
+        self.holes = holes  # hole number -> (par, difficulty modifier)
+        self.tables = {}
+
+    @classmethod
+    def build(cls, parameters, players, holes, course_characteristics=None):
+        return cls({p['id']: effective_skill(parameters, p, course_characteristics) for p in players},
+                   {h['hole_number']: (h['par'], h['difficulty_modifier']) for h in holes})
+
+    def covers(self, player_ids):
+        return all(player_id in self.skills for player_id in player_ids)
+
+
+class ScoringModel(ABC):
+    """
+    A hole-scoring model. hole_score() is the scalar entry point and
+    distribution() the exact distribution it samples from; score() and
+    score_batch() score tournament players from shared ScoringInputs, and
+    expected() gives the mean and variance of a score. Models are registered
+    by name with register_model; bump version whenever a model's scores for
+    the same inputs and random draws change, since tournaments record it.
+    """
+
+    name = None
+    version = 1
+
+    def __init__(self, parameters, parameters_version):
+        self.parameters = parameters
+        self.parameters_version = parameters_version
+
+    @property
+    def id(self):
+        """The model and its implementation version, as recorded on tournaments, e.g. 'reference/1'."""
+        return f'{self.name}/{self.version}'
+
+    @abstractmethod
+    def hole_score(self, weighted_skill, hole_par, hole_difficulty, rng=random):
+        """A score in strokes for a player of weighted_skill on a hole, drawing from rng."""
+
+    @abstractmethod
+    def distribution(self, weighted_skill, hole_difficulty):
+        """(best score to par, probabilities of each score to par from it upwards)."""
+
+    def score(self, inputs, player_id, hole_number, rng=random):
+        hole = inputs.holes.get(hole_number)
+        if hole is None:
+            return DEFAULT_HOLE_SCORE
+        return self.hole_score(inputs.skills[player_id], hole[0], hole[1], rng)
+
+    def score_batch(self, inputs, player_ids, hole_number, rng=random):
+        """Scores of several players on one hole, drawn in order."""
+        return [self.score(inputs, player_id, hole_number, rng) for player_id in player_ids]
+
+    def expected(self, inputs, player_id, hole_number):
+        """Mean and variance of a player's score on a hole, in strokes."""
+        hole = inputs.holes.get(hole_number)
+        if hole is None:
+            return float(DEFAULT_HOLE_SCORE), 0.0
+        par, difficulty = hole
+        best, probabilities = self.distribution(inputs.skills[player_id], difficulty)
+        mean = sum((best + i) * p for i, p in enumerate(probabilities))
+        variance = sum((best + i) ** 2 * p for i, p in enumerate(probabilities)) - mean * mean
+        return par + mean, variance
+
+
+SCORING_MODELS = {}
+
+
+def register_model(cls):
+    """Class decorator adding a ScoringModel to the registry under its name."""
+    SCORING_MODELS[cls.name] = cls
+    return cls
+
+
+def get_model(name, parameters=None, version=None):
+    """An instance of a registered model with a parameter set (default: the configured one) and its version."""
+    model = SCORING_MODELS.get(name)
+    if model is None:
+        raise ValueError(f"Unknown scoring model '{name}'. Available: {', '.join(sorted(SCORING_MODELS))}")
+    if parameters is None:
+        version, parameters = load_scoring_parameters()
+    return model(parameters, version or parameters_version(parameters))
+
+
+@register_model
+class ReferenceModel(ScoringModel):
+    """The simulation's original model: one uniform draw per score, rounded and clamped."""
+
+    name = 'reference'
+
+    def hole_score(self, weighted_skill, hole_par, hole_difficulty, rng=random):
+        params = self.parameters
+
+        # Base score tendency (lower is better)
+        # Higher skill means a score closer to par, but not dramatically better
+        skill_bonus = (weighted_skill - params['skill_pivot']) / params['skill_scale']  # e.g. skill 85 -> +0.1
+        base_tendency = hole_par - skill_bonus
+
+        # Use overall skill as a consistency factor (higher skill = more consistent)
+        consistency_factor = (100 - weighted_skill) / 100.0  # e.g. skill 90 -> 0.1
+
+        # Introduce more randomness to allow for bogeys and worse
+        random_factor = rng.uniform(-params['randomness'], params['randomness']) * consistency_factor
+
+        # Difficulty modifier of the hole
+        difficulty_factor = (hole_difficulty - 1.0) * params['difficulty_scale']  # e.g. 1.1 -> +0.2, 0.9 -> -0.2
+
+        # Final score calculation
+        raw_score = base_tendency + random_factor + difficulty_factor
+
+        # Round to nearest integer
+        final_score = round(raw_score)
+
+        # Cap scores to avoid extreme outliers (e.g., nothing worse than triple bogey)
+        return max(hole_par + params['best_to_par'], min(final_score, hole_par + params['worst_to_par']))
+
+    def distribution(self, weighted_skill, hole_difficulty):
+        params = self.parameters
+        best, worst = params['best_to_par'], params['worst_to_par']
+        mean_to_par = (-(weighted_skill - params['skill_pivot']) / params['skill_scale']
+                       + (hole_difficulty - 1.0) * params['difficulty_scale'])
+        half_width = abs(params['randomness'] * (100 - weighted_skill) / 100.0)
+        return best, hole_distribution(mean_to_par, half_width, best, worst)
+
+
+@register_model
+class FastModel(ReferenceModel):
+    """
+    The reference model's score distribution, sampled from a cumulative
+    probability table per player and hole built once per tournament: one
+    uniform draw and a bisect per score, with no arithmetic on the skill.
+    Same distribution, different draws, so it serves pricing and projections
+    rather than the scores tournaments record.
+    """
+
+    name = 'fast'
+
+    def _tables(self, inputs):
+        tables = inputs.tables.get(self.name)
+        if tables is None:
+            tables = {}
+            for player_id, skill in inputs.skills.items():
+                for hole_number, (par, difficulty) in inputs.holes.items():
+                    best, probabilities = self.distribution(skill, difficulty)
+                    cumulative = cumulative_probabilities(probabilities)
+                    mean = sum((best + i) * p for i, p in enumerate(probabilities))
+                    variance = sum((best + i) ** 2 * p for i, p in enumerate(probabilities)) - mean * mean
+                    tables[player_id, hole_number] = (par + best, cumulative, par + mean, variance)
+            inputs.tables[self.name] = tables
+        return tables
+
+    def hole_score(self, weighted_skill, hole_par, hole_difficulty, rng=random):
+        best, probabilities = self.distribution(weighted_skill, hole_difficulty)
+        return hole_par + best + bisect.bisect_right(cumulative_probabilities(probabilities), rng.random())
+
+    def score(self, inputs, player_id, hole_number, rng=random):
+        entry = self._tables(inputs).get((player_id, hole_number))
+        if entry is None:
+            return DEFAULT_HOLE_SCORE
+        return entry[0] + bisect.bisect_right(entry[1], rng.random())
+
+    def score_batch(self, inputs, player_ids, hole_number, rng=random):
+        tables, draw = self._tables(inputs), rng.random
+        scores = []
+        for player_id in player_ids:
+            entry = tables.get((player_id, hole_number))
+            scores.append(DEFAULT_HOLE_SCORE if entry is None else entry[0] + bisect.bisect_right(entry[1], draw()))
+        return scores
+
+    def expected(self, inputs, player_id, hole_number):
+        entry = self._tables(inputs).get((player_id, hole_number))
+        if entry is None:
+            return float(DEFAULT_HOLE_SCORE), 0.0
+        return entry[2], entry[3]
+
+
+def compare_models(inputs, model, other):
+    """Largest differences between two models' expected scores and variances over every player and hole."""
+    mean_gap = variance_gap = 0.0
+    for player_id in inputs.skills:
+        for hole_number in inputs.holes:
+            mean, variance = model.expected(inputs, player_id, hole_number)
+            other_mean, other_variance = other.expected(inputs, player_id, hole_number)
+            mean_gap = max(mean_gap, abs(mean - other_mean))
+            variance_gap = max(variance_gap, abs(variance - other_variance))
+    return mean_gap, variance_gap
@@ -0,0 +1,71 @@
+import hashlib
+import json
+from config import Config
+
+# The coefficients of SimulationService's scoring model, as originally tuned by hand
+DEFAULT_PARAMETERS = {
+    # Weighted skill: a weighted sum of the player's skills...
+    'weight_overall': 0.3,
+    'weight_driving': 0.25,
+    'weight_approach': 0.25,
+    'weight_short_game': 0.15,
+    'weight_putting': 0.05,
+    # ...plus the course characteristics' modifiers times this scale
+    'modifier_scale': 100.0,
+    # Strokes gained per hole: (weighted skill - skill_pivot) / skill_scale
+    'skill_pivot': 75.0,
+    'skill_scale': 100.0,
+    # Half-width of the uniform random part, before the consistency factor
+    'randomness': 3.0,
+    # Strokes added per unit of hole difficulty modifier above 1.0
+    'difficulty_scale': 2.0,
+    # Best and worst hole scores relative to par
+    'best_to_par': -2,
+    'worst_to_par': 3,
+}
+
+
+def validate_parameters(parameters):
+    """Raises ValueError unless parameters has exactly the model's coefficients with sane values."""
+    missing = set(DEFAULT_PARAMETERS) - set(parameters)
+    unknown = set(parameters) - set(DEFAULT_PARAMETERS)
+    if missing or unknown:
+        raise ValueError(f"Scoring parameters missing {sorted(missing)}, unknown {sorted(unknown)}")
+    if parameters['skill_scale'] <= 0:
+        raise ValueError('skill_scale must be positive.')
+    if parameters['randomness'] < 0:
+        raise ValueError('randomness must not be negative.')
+    if not parameters['best_to_par'] <= 0 <= parameters['worst_to_par']:
+        raise ValueError('best_to_par must be at most 0 and worst_to_par at least 0.')
+
+
+def parameters_version(parameters):
+    """A version for a parameter set: a hash of its values, so equal sets always share a version."""
+    return hashlib.sha256(json.dumps(parameters, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def load_scoring_parameters(path=None):
+    """
+    Loads the parameter set written by services/calibration.py from path
+    (default Config.SCORING_PARAMS_PATH). Returns (version, parameters); the
+    hand-tuned defaults when no file is configured.
+    """
+    path = path or Config.SCORING_PARAMS_PATH
+    if not path:
+        return parameters_version(DEFAULT_PARAMETERS), dict(DEFAULT_PARAMETERS)
+    with open(path) as f:
+        data = json.load(f)
+    parameters = data['parameters']
+    validate_parameters(parameters)
+    # Versioned by content, so files written before versions were content
+    # hashes still agree with the same coefficients loaded any other way
+    return parameters_version(parameters), parameters
+
+
+def save_scoring_parameters(path, parameters, **metadata):
+    """Writes a versioned parameter set, with any metadata, for load_scoring_parameters. Returns the version."""
+    validate_parameters(parameters)
+    version = parameters_version(parameters)
+    with open(path, 'w') as f:
+        json.dump(dict(version=version, parameters=parameters, **metadata), f, indent=2)
+    return version
@@ -1,16 +1,127 @@
 import sqlite3
 import random
+import os
+import sys
+import hashlib
+import inspect
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
 from faker import Faker
-from models.database import init_db
 from datetime import datetime, timedelta
 
-def get_db_connection():
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.database import init_db, connect, copy_database
+from config import Config
+
+# Bump whenever a change to this module should invalidate golden databases.
+# Schema changes are picked up automatically, see seeder_version().
+SEEDER_VERSION = 2
+
+def get_db_connection(db_path=None):
     """Create a database connection."""
-    conn = sqlite3.connect('golf_betting.db')
+    conn = connect(db_path)
     conn.row_factory = sqlite3.Row
     return conn
 
-def generate_course_name():
+# Player nationalities
+COUNTRIES = ['USA', 'UK', 'Australia', 'Canada', 'Sweden', 'Spain', 'South Africa', 'Japan', 'South Korea', 'Ireland']
+
+# US Cities by State Population (Top 5 states get 5 cities, next 20 get 3, next 20 get 2, rest get 1)
+US_CITIES_BY_STATE = {
+    # Top 5 States by Population (5 cities each)
+    "California": ["Los Angeles", "San Diego", "San Jose", "San Francisco", "Fresno"],
+    "Texas": ["Houston", "San Antonio", "Dallas", "Austin", "Fort Worth"],
+    "Florida": ["Jacksonville", "Miami", "Tampa", "Orlando", "St. Petersburg"],
+    "New York": ["New York", "Buffalo", "Rochester", "Yonkers", "Syracuse"],
+    "Pennsylvania": ["Philadelphia", "Pittsburgh", "Allentown", "Erie", "Reading"],
+
+    # Next 20 States by Population (3 cities each)
+    "Illinois": ["Chicago", "Aurora", "Naperville"],
+    "Ohio": ["Columbus", "Cleveland", "Cincinnati"],
+    "Georgia": ["Atlanta", "Augusta", "Columbus"],
+    "North Carolina": ["Charlotte", "Raleigh", "Greensboro"],
+    "Michigan": ["Detroit", "Grand Rapids", "Warren"],
+    "New Jersey": ["Newark", "Jersey City", "Paterson"],
+    "Virginia": ["Virginia Beach", "Richmond", "Norfolk"],
+    "Washington": ["Seattle", "Spokane", "Tacoma"],
+    "Arizona": ["Phoenix", "Tucson", "Mesa"],
+    "Tennessee": ["Nashville", "Memphis", "Knoxville"],
+    "Indiana": ["Indianapolis", "Fort Wayne", "Evansville"],
+    "Massachusetts": ["Boston", "Worcester", "Springfield"],
+    "Missouri": ["Kansas City", "St. Louis", "Springfield"],
+    "Maryland": ["Baltimore", "Frederick", "Rockville"],
+    "Colorado": ["Denver", "Colorado Springs", "Aurora"],
+    "Wisconsin": ["Milwaukee", "Madison", "Green Bay"],
+    "Minnesota": ["Minneapolis", "St. Paul", "Rochester"],
+    "South Carolina": ["Columbia", "Charleston", "North Charleston"],
+    "Alabama": ["Birmingham", "Montgomery", "Huntsville"],
+    "Louisiana": ["New Orleans", "Baton Rouge", "Shreveport"],
+    "Kentucky": ["Louisville", "Lexington", "Bowling Green"],
+    "Oregon": ["Portland", "Salem", "Eugene"],
+
+    # Next 20 States by Population (2 cities each)
+    "Oklahoma": ["Oklahoma City", "Tulsa"],
+    "Connecticut": ["Bridgeport", "New Haven"],
+    "Utah": ["Salt Lake City", "West Valley City"],
+    "Iowa": ["Des Moines", "Cedar Rapids"],
+    "Nevada": ["Las Vegas", "Reno"],
+    "Arkansas": ["Little Rock", "Fort Smith"],
+    "Mississippi": ["Jackson", "Gulfport"],
+    "Kansas": ["Wichita", "Overland Park"],
+    "New Mexico": ["Albuquerque", "Las Cruces"],
+    "Nebraska": ["Omaha", "Lincoln"],
+    "West Virginia": ["Charleston", "Huntington"],
+    "Idaho": ["Boise", "Meridian"],
+    "Hawaii": ["Honolulu", "Hilo"],
+    "New Hampshire": ["Manchester", "Nashua"],
+    "Maine": ["Portland", "Lewiston"],
+    "Montana": ["Billings", "Missoula"],
+    "Rhode Island": ["Providence", "Warwick"],
+    "Delaware": ["Wilmington", "Dover"],
+    "South Dakota": ["Sioux Falls", "Rapid City"],
+    "North Dakota": ["Fargo", "Bismarck"],
+    "Alaska": ["Anchorage", "Fairbanks"],
+    "Vermont": ["Burlington", "South Burlington"],
+    "Wyoming": ["Cheyenne", "Casper"]
+}
+
+# International locations (limited pool)
+INTERNATIONAL_LOCATIONS = {
+    "Canada": ["Toronto", "Montreal", "Vancouver", "Calgary", "Edmonton", "Ottawa", "Winnipeg", "Quebec City"],
+    "Puerto Rico": ["San Juan"],
+    "Mexico": ["Mexico City"],
+    "Ireland": ["Dublin"],
+    "Scotland": ["Edinburgh"],
+    "England": ["London"],
+    # One additional location from these countries (will be randomly selected)
+    "Brazil": ["São Paulo"],
+    "Argentina": ["Buenos Aires"],
+    "France": ["Paris"],
+    "Spain": ["Madrid"],
+    "Italy": ["Rome"]
+}
+
+# Sponsors (Real financial/corporate sector companies and non-profits)
+SPONSORS = [
+    # Financial Services
+    "J.P. Morgan", "Goldman Sachs", "Morgan Stanley", "BlackRock", "Fidelity", "State Street", "Charles Schwab",
+    "Bank of America", "Citigroup", "Wells Fargo", "American Express", "Visa", "Mastercard",
+    "Berkshire Hathaway", "Blackstone", "KKR", "The Carlyle Group", "Bain Capital",
+    # Insurance
+    "Prudential", "MetLife", "AIG", "Travelers", "Allstate", "Progressive", "Farmers", "Nationwide", "Liberty Mutual",
+    # Professional Services
+    "Deloitte", "PwC", "Ernst & Young", "KPMG", "Accenture", "Grant Thornton", "BKD", "Baker Tilly", "BDO", "Baker McKenzie",
+    # Non-Profits
+    "Red Cross", "United Way", "Salvation Army", "Make-A-Wish", "St. Jude Children's",
+    "ACS", "Habitat for Humanity", "BGCA", "YMCA", "Special Olympics", "UNICEF", "Sierra Club"
+]
+
+# Event Types
+GENERAL_EVENT_TYPES = ["Championship", "Open", "Pro-Am", "Invitational Tournament", "Invitational", "Classic"]
+
+def generate_course_name(rng=random):
     """Generate a creative fictional course name based on the user's detailed spreadsheet."""
     
     adjectives = [
@@ -71,20 +182,20 @@ def generate_course_name():
     # --- Naming Patterns based on User's Convention ---
     
     # Simple Patterns
-    p1 = f"{random.choice(plants)} {random.choice(geo)}"                             # Walnut Lake
-    p2 = f"{random.choice(plants)} {random.choice(structures)}"                      # Cottonwood House
-    p3 = f"{random.choice(animals)} {random.choice(structures)}"                     # Grackle House
-    p4 = f"{random.choice(names)} {random.choice(plants)}"                           # Lancaster Cottonwood
-    p5 = f"{random.choice(professions)} {random.choice(structures)}"                 # Foxcatcher Chapel
+    p1 = f"{rng.choice(plants)} {rng.choice(geo)}"                             # Walnut Lake
+    p2 = f"{rng.choice(plants)} {rng.choice(structures)}"                      # Cottonwood House
+    p3 = f"{rng.choice(animals)} {rng.choice(structures)}"                     # Grackle House
+    p4 = f"{rng.choice(names)} {rng.choice(plants)}"                           # Lancaster Cottonwood
+    p5 = f"{rng.choice(professions)} {rng.choice(structures)}"                 # Foxcatcher Chapel
 
     # Adjective-led Patterns
-    p6 = f"{random.choice(adjectives)} {random.choice(plants)} {random.choice(geo)}" # Astorian Oak Dale
-    p7 = f"{random.choice(adjectives)} {random.choice(animals)} {random.choice(geo)}" # Astorian Shiner Creek
-    p8 = f"{random.choice(adjectives)} {random.choice(professions)} {random.choice(structures)}" # Golden Foxcatcher Manse
+    p6 = f"{rng.choice(adjectives)} {rng.choice(plants)} {rng.choice(geo)}" # Astorian Oak Dale
+    p7 = f"{rng.choice(adjectives)} {rng.choice(animals)} {rng.choice(geo)}" # Astorian Shiner Creek
+    p8 = f"{rng.choice(adjectives)} {rng.choice(professions)} {rng.choice(structures)}" # Golden Foxcatcher Manse
     
     # Suffix Concatenation Patterns
-    name = random.choice(names)
-    suffix = random.choice(suffixes)
+    name = rng.choice(names)
+    suffix = rng.choice(suffixes)
     if suffix == "-on-Sea":
         p9 = f"{name}{suffix}" # Baker-on-Sea
     else:
@@ -94,16 +205,16 @@ def generate_course_name():
         else:
              p9 = f"{name}{suffix}" # Oakes + bourne -> Oakesbourne
 
-    p10 = f"{p9} {random.choice(structures)}" # Winthrop Rectory (structure acts as suffix here)
+    p10 = f"{p9} {rng.choice(structures)}" # Winthrop Rectory (structure acts as suffix here)
     
     # Select a base pattern
     patterns = [p1, p2, p3, p4, p5, p6, p7, p8, p9, p10]
-    base_name = random.choice(patterns)
+    base_name = rng.choice(patterns)
     
     # Always add an organization suffix
-    return f"{base_name} {random.choice(organizations)}"
+    return f"{base_name} {rng.choice(organizations)}"
 
-def generate_course_characteristics(course_name, course_type, city, state_country):
+def generate_course_characteristics(course_name, course_type, city, state_country, rng=random):
     """
     Generate realistic course characteristics based on course name, type, and location.
     Returns a dictionary of characteristics that affect player performance.
@@ -115,165 +226,266 @@ def generate_course_characteristics(course_name, course_type, city, state_countr
     
     # Weather conditions (influenced by location and season)
     # Temperature: 50-95°F, normalized to 0-1 scale
-    base_temp = random.uniform(50, 95)
+    base_temp = rng.uniform(50, 95)
     characteristics['avg_temperature'] = (base_temp - 50) / 45.0  # Normalize to 0-1
     
     # Humidity: influenced by location (coastal = higher, desert = lower)
     if any(word in city.lower() for word in ['miami', 'houston', 'new orleans', 'charleston', 'savannah']):
-        base_humidity = random.uniform(0.6, 1.0)  # High humidity areas
+        base_humidity = rng.uniform(0.6, 1.0)  # High humidity areas
     elif any(word in city.lower() for word in ['phoenix', 'las vegas', 'denver', 'salt lake']):
-        base_humidity = random.uniform(0.0, 0.4)  # Low humidity areas
+        base_humidity = rng.uniform(0.0, 0.4)  # Low humidity areas
     else:
-        base_humidity = random.uniform(0.3, 0.7)  # Moderate humidity
+        base_humidity = rng.uniform(0.3, 0.7)  # Moderate humidity
     characteristics['humidity_level'] = base_humidity
     
     # Wind factor: influenced by location and course type
     if any(word in city.lower() for word in ['chicago', 'dallas', 'oklahoma', 'kansas']):
-        base_wind = random.uniform(0.5, 1.0)  # Windy areas
+        base_wind = rng.uniform(0.5, 1.0)  # Windy areas
     elif any(word in course_name.lower() for word in ['links', 'coastal', 'ocean']):
-        base_wind = random.uniform(0.4, 0.9)  # Links courses tend to be windy
+        base_wind = rng.uniform(0.4, 0.9)  # Links courses tend to be windy
     else:
-        base_wind = random.uniform(0.1, 0.6)  # Moderate wind
+        base_wind = rng.uniform(0.1, 0.6)  # Moderate wind
     characteristics['wind_factor'] = base_wind
     
     # Rain probability: influenced by location and season
     if any(word in city.lower() for word in ['seattle', 'portland', 'atlanta', 'nashville']):
-        rain_prob = random.uniform(0.3, 0.8)  # Rainy areas
+        rain_prob = rng.uniform(0.3, 0.8)  # Rainy areas
     else:
-        rain_prob = random.uniform(0.1, 0.5)  # Moderate rain
+        rain_prob = rng.uniform(0.1, 0.5)  # Moderate rain
     characteristics['rain_probability'] = rain_prob
     
     # Course design and strategy
     # Design strategy: influenced by course type and name
     if any(word in course_name.lower() for word in ['penal', 'championship', 'major', 'pga']):
-        design_strategy = random.uniform(0.7, 1.0)  # More penal
+        design_strategy = rng.uniform(0.7, 1.0)  # More penal
     elif any(word in course_name.lower() for word in ['resort', 'country club', 'parkland']):
-        design_strategy = random.uniform(0.3, 0.7)  # More strategic
+        design_strategy = rng.uniform(0.3, 0.7)  # More strategic
     else:
-        design_strategy = random.uniform(0.4, 0.8)  # Mixed
+        design_strategy = rng.uniform(0.4, 0.8)  # Mixed
     characteristics['design_strategy'] = design_strategy
     
     # Course length: influenced by course type
     if any(word in course_name.lower() for word in ['championship', 'major', 'pga']):
-        course_length = random.uniform(0.7, 1.0)  # Longer courses
+        course_length = rng.uniform(0.7, 1.0)  # Longer courses
     elif any(word in course_name.lower() for word in ['executive', 'par 3', 'short']):
-        course_length = random.uniform(0.0, 0.4)  # Shorter courses
+        course_length = rng.uniform(0.0, 0.4)  # Shorter courses
     else:
-        course_length = random.uniform(0.4, 0.8)  # Standard length
+        course_length = rng.uniform(0.4, 0.8)  # Standard length
     characteristics['course_length'] = course_length
     
     # Narrowness factor: influenced by design strategy
     if design_strategy > 0.7:
-        narrowness = random.uniform(0.6, 1.0)  # Penal courses tend to be narrower
+        narrowness = rng.uniform(0.6, 1.0)  # Penal courses tend to be narrower
     else:
-        narrowness = random.uniform(0.2, 0.7)  # Strategic courses can be wider
+        narrowness = rng.uniform(0.2, 0.7)  # Strategic courses can be wider
     characteristics['narrowness_factor'] = narrowness
     
     # Hazard density: influenced by design strategy and course type
     if design_strategy > 0.7:
-        hazard_density = random.uniform(0.6, 1.0)  # More hazards on penal courses
+        hazard_density = rng.uniform(0.6, 1.0)  # More hazards on penal courses
     else:
-        hazard_density = random.uniform(0.2, 0.6)  # Fewer hazards on strategic courses
+        hazard_density = rng.uniform(0.2, 0.6)  # Fewer hazards on strategic courses
     characteristics['hazard_density'] = hazard_density
     
     # Course conditions
     # Green speed: influenced by prestige and maintenance
     if any(word in course_name.lower() for word in ['championship', 'major', 'pga', 'tour']):
-        green_speed = random.uniform(0.7, 1.0)  # Fast greens on championship courses
+        green_speed = rng.uniform(0.7, 1.0)  # Fast greens on championship courses
     else:
-        green_speed = random.uniform(0.3, 0.7)  # Moderate green speeds
+        green_speed = rng.uniform(0.3, 0.7)  # Moderate green speeds
     characteristics['green_speed'] = green_speed
     
     # Turf firmness: influenced by climate and maintenance
     if base_temp > 80:  # Hotter climates tend to have firmer turf
-        turf_firmness = random.uniform(0.6, 1.0)
+        turf_firmness = rng.uniform(0.6, 1.0)
     else:
-        turf_firmness = random.uniform(0.3, 0.7)
+        turf_firmness = rng.uniform(0.3, 0.7)
     characteristics['turf_firmness'] = turf_firmness
     
     # Rough length: influenced by course type and maintenance
     if any(word in course_name.lower() for word in ['championship', 'major', 'pga']):
-        rough_length = random.uniform(0.6, 1.0)  # Longer rough on championship courses
+        rough_length = rng.uniform(0.6, 1.0)  # Longer rough on championship courses
     else:
-        rough_length = random.uniform(0.2, 0.6)  # Shorter rough on regular courses
+        rough_length = rng.uniform(0.2, 0.6)  # Shorter rough on regular courses
     characteristics['rough_length'] = rough_length
     
     # Course prestige and mental factors
     # Prestige level: influenced by course name and type
     if any(word in course_name.lower() for word in ['championship', 'major', 'pga', 'tour', 'national']):
-        prestige = random.uniform(0.7, 1.0)  # High prestige
+        prestige = rng.uniform(0.7, 1.0)  # High prestige
     elif any(word in course_name.lower() for word in ['country club', 'resort']):
-        prestige = random.uniform(0.4, 0.8)  # Medium prestige
+        prestige = rng.uniform(0.4, 0.8)  # Medium prestige
     else:
-        prestige = random.uniform(0.2, 0.6)  # Lower prestige
+        prestige = rng.uniform(0.2, 0.6)  # Lower prestige
     characteristics['prestige_level'] = prestige
     
     # Course age: influenced by course name and type
     if any(word in course_name.lower() for word in ['old', 'historic', 'classic', 'traditional']):
-        course_age = random.uniform(0.7, 1.0)  # Historic courses
+        course_age = rng.uniform(0.7, 1.0)  # Historic courses
     elif any(word in course_name.lower() for word in ['new', 'modern', 'contemporary']):
-        course_age = random.uniform(0.0, 0.3)  # New courses
+        course_age = rng.uniform(0.0, 0.3)  # New courses
     else:
-        course_age = random.uniform(0.3, 0.7)  # Mixed age
+        course_age = rng.uniform(0.3, 0.7)  # Mixed age
     characteristics['course_age'] = course_age
     
     # Crowd factor: influenced by prestige and course type
     if prestige > 0.7:
-        crowd_factor = random.uniform(0.7, 1.0)  # Large crowds at prestigious courses
+        crowd_factor = rng.uniform(0.7, 1.0)  # Large crowds at prestigious courses
     else:
-        crowd_factor = random.uniform(0.2, 0.6)  # Smaller crowds
+        crowd_factor = rng.uniform(0.2, 0.6)  # Smaller crowds
     characteristics['crowd_factor'] = crowd_factor
     
     # Elevation and terrain
     # Elevation factor: influenced by location
     if any(word in state_country.lower() for word in ['colorado', 'utah', 'wyoming', 'montana']):
-        elevation = random.uniform(0.6, 1.0)  # High elevation areas
+        elevation = rng.uniform(0.6, 1.0)  # High elevation areas
     elif any(word in state_country.lower() for word in ['florida', 'louisiana', 'mississippi']):
-        elevation = random.uniform(0.0, 0.2)  # Low elevation areas
+        elevation = rng.uniform(0.0, 0.2)  # Low elevation areas
     else:
-        elevation = random.uniform(0.2, 0.6)  # Moderate elevation
+        elevation = rng.uniform(0.2, 0.6)  # Moderate elevation
     characteristics['elevation_factor'] = elevation
     
     # Terrain difficulty: influenced by location and course type
     if any(word in state_country.lower() for word in ['colorado', 'utah', 'wyoming', 'montana', 'vermont']):
-        terrain = random.uniform(0.6, 1.0)  # Hilly/mountainous areas
+        terrain = rng.uniform(0.6, 1.0)  # Hilly/mountainous areas
     elif any(word in course_name.lower() for word in ['mountain', 'alpine', 'highland']):
-        terrain = random.uniform(0.7, 1.0)  # Mountain courses
+        terrain = rng.uniform(0.7, 1.0)  # Mountain courses
     else:
-        terrain = random.uniform(0.1, 0.5)  # Flatter terrain
+        terrain = rng.uniform(0.1, 0.5)  # Flatter terrain
     characteristics['terrain_difficulty'] = terrain
     
     return characteristics
 
-def seed_database():
-    """Populate the database with fictional data based on the new simulation model."""
+PLAYER_INSERT = ('INSERT INTO players (name, country, overall_skill, driving_skill, approach_skill, short_game_skill, '
+                 'putting_skill, season_points, season_money) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)')
+# Bulk seeding numbers rows itself, so its player rows lead with the id
+PLAYER_INSERT_WITH_ID = ('INSERT INTO players (id, name, country, overall_skill, driving_skill, approach_skill, '
+                         'short_game_skill, putting_skill, season_points, season_money) '
+                         'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)')
+HOLE_INSERT = 'INSERT INTO holes (course_id, hole_number, par, difficulty_modifier) VALUES (?, ?, ?, ?)'
+CHARACTERISTIC_COLUMNS = [
+    'avg_temperature', 'humidity_level', 'wind_factor', 'rain_probability',
+    'design_strategy', 'course_length', 'narrowness_factor', 'hazard_density',
+    'green_speed', 'turf_firmness', 'rough_length',
+    'prestige_level', 'course_age', 'crowd_factor',
+    'elevation_factor', 'terrain_difficulty',
+]
+CHARACTERISTICS_INSERT = (f"INSERT INTO course_characteristics (course_id, {', '.join(CHARACTERISTIC_COLUMNS)}) "
+                          f"VALUES ({', '.join('?' for _ in range(len(CHARACTERISTIC_COLUMNS) + 1))})")
+
+def generate_player(full_name, rng=random):
+    """Generates a player row for PLAYER_INSERT."""
+    return (
+        full_name,
+        rng.choice(COUNTRIES),
+        round(rng.uniform(70, 95), 2),  # Overall Skill
+        round(rng.uniform(70, 95), 2),  # Driving Skill
+        round(rng.uniform(70, 95), 2),  # Approach Skill
+        round(rng.uniform(70, 95), 2),  # Short Game Skill
+        round(rng.uniform(70, 95), 2),  # Putting Skill
+        0,  # Season Points
+        0.0,  # Season Money
+    )
+
+def generate_holes(course_par, rng=random):
+    """
+    Generates 18 (hole_number, par, difficulty_modifier) tuples adding up to
+    roughly the course par. Prefix the course id for HOLE_INSERT.
+    """
+    holes, total_par = [], 0
+    for hole_num in range(1, 18):
+        par = rng.choice([3, 4, 5])
+        holes.append((hole_num, par, round(rng.uniform(0.8, 1.2), 2)))
+        total_par += par
+    last_hole_par = max(3, min(5, course_par - total_par))
+    holes.append((18, last_hole_par, round(rng.uniform(0.8, 1.2), 2)))
+    return holes
+
+def characteristics_row(course_id, characteristics):
+    """Orders generated course characteristics for CHARACTERISTICS_INSERT."""
+    return (course_id,) + tuple(characteristics[column] for column in CHARACTERISTIC_COLUMNS)
+
+# Every stage of seeding draws from its own generator, derived from the seed
+# and the stage's name, so no stage's output depends on how much randomness
+# another consumed or on which process ran it. Players are generated in chunks
+# of a fixed size and courses one by one, each with their own generator, so a
+# league comes out the same however the work is spread over worker processes.
+PLAYER_CHUNK_SIZE = 1000
+
+def stage_rng(seed, *stage):
+    """Random generator for one stage of seeding a league from a seed."""
+    return random.Random(':'.join(str(part) for part in (seed,) + stage))
+
+def stage_faker(seed, *stage):
+    """Faker instance for one stage of seeding a league from a seed."""
     fake = Faker()
-    conn = get_db_connection()
+    fake.seed_instance(':'.join(str(part) for part in (seed,) + stage))
+    return fake
+
+def generate_players(seed, start, count, first_names=None, last_names=None):
+    """
+    Generates the player rows for PLAYER_INSERT numbered start to
+    start + count - 1 in the league for a seed. Names come from Faker, or are
+    combined from the given name pools when there are too many players for
+    Faker to be fast enough.
+    """
+    rng = stage_rng(seed, 'players', start)
+    if first_names is None:
+        # Generate male names only, without professional titles
+        fake = stage_faker(seed, 'players', start)
+        names = [f"{fake.first_name_male()} {fake.last_name()}" for _ in range(count)]
+    else:
+        names = [f"{rng.choice(first_names)} {rng.choice(last_names)}" for _ in range(count)]
+    return [generate_player(name, rng) for name in names]
+
+def generate_course(seed, index, city, state_country):
+    """
+    Generates the course for the index-th tournament in the league for a seed:
+    a dict with its 'name', 'par', 'difficulty', 'characteristics' and
+    'holes' (see generate_holes).
+    """
+    rng = stage_rng(seed, 'course', index)
+    name = generate_course_name(rng)
+    par = rng.randint(70, 72)
+    return {
+        'name': name,
+        'par': par,
+        'difficulty': round(rng.uniform(0.8, 1.2), 2),
+        'characteristics': generate_course_characteristics(name, 'Fictional', city, state_country, rng),
+        'holes': generate_holes(par, rng),
+    }
+
+def _run_stage(func, jobs, workers=1):
+    """
+    Calls func with each tuple of arguments in jobs and returns the results in
+    order, spreading the calls over worker processes if workers > 1.
+    """
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(func, *zip(*jobs), chunksize=max(1, len(jobs) // (workers * 4))))
+    return [func(*job) for job in jobs]
+
+def _player_jobs(seed, count, *name_pools):
+    return [(seed, start, min(PLAYER_CHUNK_SIZE, count - start)) + name_pools
+            for start in range(0, count, PLAYER_CHUNK_SIZE)]
+
+def seed_database(seed=None, db_path=None, workers=1):
+    """
+    Populate the database with fictional data based on the new simulation model.
+    Pass a seed to generate the same league every time; without one a seed is
+    picked and printed. Player and course generation run in that many worker
+    processes if workers > 1, with the same result.
+    """
+    if seed is None:
+        seed = random.SystemRandom().randrange(2 ** 32)
+    conn = get_db_connection(db_path)
     c = conn.cursor()
 
-    print("Seeding database with new simulation data...")
+    print(f"Seeding database with new simulation data (seed {seed})...")
 
     # --- 1. Create Players ---
-    countries = ['USA', 'UK', 'Australia', 'Canada', 'Sweden', 'Spain', 'South Africa', 'Japan', 'South Korea', 'Ireland']
-    players = []
-    for _ in range(150):
-        # Generate male names only, without professional titles
-        first_name = fake.first_name_male()
-        last_name = fake.last_name()
-        full_name = f"{first_name} {last_name}"
-        
-        players.append((
-            full_name,
-            random.choice(countries),
-            round(random.uniform(70, 95), 2),  # Overall Skill
-            round(random.uniform(70, 95), 2),  # Driving Skill
-            round(random.uniform(70, 95), 2),  # Approach Skill
-            round(random.uniform(70, 95), 2),  # Short Game Skill
-            round(random.uniform(70, 95), 2),  # Putting Skill
-            0,  # Season Points
-            0.0,  # Season Money
-        ))
-    c.executemany('INSERT INTO players (name, country, overall_skill, driving_skill, approach_skill, short_game_skill, putting_skill, season_points, season_money) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', players)
+    players = [row for chunk in _run_stage(generate_players, _player_jobs(seed, 150), workers) for row in chunk]
+    c.executemany(PLAYER_INSERT, players)
     print(f"Seeded {len(players)} players.")
 
     # --- 3. Define Location and Naming Components ---
@@ -288,101 +500,10 @@ def seed_database():
         "Utah", "Vermont", "Virginia", "Washington", "West Virginia", "Wisconsin", "Wyoming"
     ]
     
-    # US Cities by State Population (Top 5 states get 5 cities, next 20 get 3, next 20 get 2, rest get 1)
-    us_cities_by_state = {
-        # Top 5 States by Population (5 cities each)
-        "California": ["Los Angeles", "San Diego", "San Jose", "San Francisco", "Fresno"],
-        "Texas": ["Houston", "San Antonio", "Dallas", "Austin", "Fort Worth"],
-        "Florida": ["Jacksonville", "Miami", "Tampa", "Orlando", "St. Petersburg"],
-        "New York": ["New York", "Buffalo", "Rochester", "Yonkers", "Syracuse"],
-        "Pennsylvania": ["Philadelphia", "Pittsburgh", "Allentown", "Erie", "Reading"],
-        
-        # Next 20 States by Population (3 cities each)
-        "Illinois": ["Chicago", "Aurora", "Naperville"],
-        "Ohio": ["Columbus", "Cleveland", "Cincinnati"],
-        "Georgia": ["Atlanta", "Augusta", "Columbus"],
-        "North Carolina": ["Charlotte", "Raleigh", "Greensboro"],
-        "Michigan": ["Detroit", "Grand Rapids", "Warren"],
-        "New Jersey": ["Newark", "Jersey City", "Paterson"],
-        "Virginia": ["Virginia Beach", "Richmond", "Norfolk"],
-        "Washington": ["Seattle", "Spokane", "Tacoma"],
-        "Arizona": ["Phoenix", "Tucson", "Mesa"],
-        "Tennessee": ["Nashville", "Memphis", "Knoxville"],
-        "Indiana": ["Indianapolis", "Fort Wayne", "Evansville"],
-        "Massachusetts": ["Boston", "Worcester", "Springfield"],
-        "Missouri": ["Kansas City", "St. Louis", "Springfield"],
-        "Maryland": ["Baltimore", "Frederick", "Rockville"],
-        "Colorado": ["Denver", "Colorado Springs", "Aurora"],
-        "Wisconsin": ["Milwaukee", "Madison", "Green Bay"],
-        "Minnesota": ["Minneapolis", "St. Paul", "Rochester"],
-        "South Carolina": ["Columbia", "Charleston", "North Charleston"],
-        "Alabama": ["Birmingham", "Montgomery", "Huntsville"],
-        "Louisiana": ["New Orleans", "Baton Rouge", "Shreveport"],
-        "Kentucky": ["Louisville", "Lexington", "Bowling Green"],
-        "Oregon": ["Portland", "Salem", "Eugene"],
-        
-        # Next 20 States by Population (2 cities each)
-        "Oklahoma": ["Oklahoma City", "Tulsa"],
-        "Connecticut": ["Bridgeport", "New Haven"],
-        "Utah": ["Salt Lake City", "West Valley City"],
-        "Iowa": ["Des Moines", "Cedar Rapids"],
-        "Nevada": ["Las Vegas", "Reno"],
-        "Arkansas": ["Little Rock", "Fort Smith"],
-        "Mississippi": ["Jackson", "Gulfport"],
-        "Kansas": ["Wichita", "Overland Park"],
-        "New Mexico": ["Albuquerque", "Las Cruces"],
-        "Nebraska": ["Omaha", "Lincoln"],
-        "West Virginia": ["Charleston", "Huntington"],
-        "Idaho": ["Boise", "Meridian"],
-        "Hawaii": ["Honolulu", "Hilo"],
-        "New Hampshire": ["Manchester", "Nashua"],
-        "Maine": ["Portland", "Lewiston"],
-        "Montana": ["Billings", "Missoula"],
-        "Rhode Island": ["Providence", "Warwick"],
-        "Delaware": ["Wilmington", "Dover"],
-        "South Dakota": ["Sioux Falls", "Rapid City"],
-        "North Dakota": ["Fargo", "Bismarck"],
-        "Alaska": ["Anchorage", "Fairbanks"],
-        "Vermont": ["Burlington", "South Burlington"],
-        "Wyoming": ["Cheyenne", "Casper"]
-    }
-    
-    # International locations (limited pool)
-    international_locations = {
-        "Canada": ["Toronto", "Montreal", "Vancouver", "Calgary", "Edmonton", "Ottawa", "Winnipeg", "Quebec City"],
-        "Puerto Rico": ["San Juan"],
-        "Mexico": ["Mexico City"],
-        "Ireland": ["Dublin"],
-        "Scotland": ["Edinburgh"],
-        "England": ["London"],
-        # One additional location from these countries (will be randomly selected)
-        "Brazil": ["São Paulo"],
-        "Argentina": ["Buenos Aires"],
-        "France": ["Paris"],
-        "Spain": ["Madrid"],
-        "Italy": ["Rome"]
-    }
-    
     # Famous (Fictional) Golfers
+    fake = stage_faker(seed, 'schedule')
     famous_golfers = [f"{fake.first_name_male()} {fake.last_name()}" for _ in range(15)]
 
-    # Sponsors (Real financial/corporate sector companies and non-profits)
-    sponsors = [
-        # Financial Services
-        "J.P. Morgan", "Goldman Sachs", "Morgan Stanley", "BlackRock", "Fidelity", "State Street", "Charles Schwab",
-        "Bank of America", "Citigroup", "Wells Fargo", "American Express", "Visa", "Mastercard",
-        "Berkshire Hathaway", "Blackstone", "KKR", "The Carlyle Group", "Bain Capital",
-        # Insurance
-        "Prudential", "MetLife", "AIG", "Travelers", "Allstate", "Progressive", "Farmers", "Nationwide", "Liberty Mutual",
-        # Professional Services
-        "Deloitte", "PwC", "Ernst & Young", "KPMG", "Accenture", "Grant Thornton", "BKD", "Baker Tilly", "BDO", "Baker McKenzie",
-        # Non-Profits
-        "Red Cross", "United Way", "Salvation Army", "Make-A-Wish", "St. Jude Children's",
-        "ACS", "Habitat for Humanity", "BGCA", "YMCA", "Special Olympics", "UNICEF", "Sierra Club"
-    ]
-
-    # Event Types
-    general_event_types = ["Championship", "Open", "Pro-Am", "Invitational Tournament", "Invitational", "Classic"]
     location_event_types = ["Open", "Invitational", "Classic"]
     
     # Non-profit sponsors (for Pro-Am logic)
@@ -460,11 +581,11 @@ def seed_database():
     country_counts = {}
     state_counts = {}
     used_cities = set()  # Track exact city names to prevent duplicates
-    used_sponsors = set()  # Track used sponsors to prevent duplicates
+    available_sponsors = list(SPONSORS)  # Sponsors not used yet, to prevent duplicates
     
     # Build available locations from US cities by state
     available_us_locations = []
-    for state, cities in us_cities_by_state.items():
+    for state, cities in US_CITIES_BY_STATE.items():
         for city in cities:
             available_us_locations.append((city, state))
     
@@ -472,19 +593,20 @@ def seed_database():
     available_international_locations = []
     
     # Canada gets 2 events max
-    for city in international_locations["Canada"]:
+    for city in INTERNATIONAL_LOCATIONS["Canada"]:
         available_international_locations.append((city, "Canada"))
     
     # Only 2 other international locations total
     other_international = ["Ireland", "Scotland"]  # Keep it simple like real PGA Tour
     for country in other_international:
-        for city in international_locations[country]:
+        for city in INTERNATIONAL_LOCATIONS[country]:
             available_international_locations.append((city, country))
     
-    random.shuffle(available_us_locations)
-    random.shuffle(available_international_locations)
+    rng = stage_rng(seed, 'schedule')
+    rng.shuffle(available_us_locations)
+    rng.shuffle(available_international_locations)
     
-    start_date = datetime.now().replace(year=2025, month=5, day=26)
+    start_date = datetime(2025, 5, 26)
     
     NUM_TOURNAMENTS = 30
     us_tournaments = int(NUM_TOURNAMENTS * 0.93)  # 93% US tournaments (like real PGA Tour)
@@ -495,6 +617,7 @@ def seed_database():
     # Track used international countries
     used_international_countries = set()
     pro_am_count = 0  # Track number of Pro-Ams created
+    schedule = []  # (tournament name, city, state/country, start date, purse)
     
     for i in range(NUM_TOURNAMENTS):
         
@@ -545,7 +668,7 @@ def seed_database():
             
             # Generate tournament name based on PGA Tour conventions
             # ~20-25% location-based, ~75-80% sponsored (like real PGA Tour)
-            name_type = random.choices(['sponsor', 'location', 'golfer'], weights=[0.70, 0.25, 0.05], k=1)[0]
+            name_type = rng.choices(['sponsor', 'location', 'golfer'], weights=[0.70, 0.25, 0.05], k=1)[0]
             
             final_tournament_name = ""
             
@@ -554,7 +677,7 @@ def seed_database():
                 top_5_states = ["California", "Texas", "Florida", "New York", "Pennsylvania"]
                 if state in top_5_states:
                     # Can use either city or state name
-                    location_name = random.choice([selected_location, state])
+                    location_name = rng.choice([selected_location, state])
                 else:
                     # Use state name for smaller states
                     location_name = state
@@ -569,26 +692,24 @@ def seed_database():
                     available_types = [et for et in location_event_types if et not in vowel_vowel_avoid[location_name]]
                     if not available_types:
                         available_types = ["Classic"]  # Fallback
-                    event_type = random.choice(available_types)
+                    event_type = rng.choice(available_types)
                 else:
                     # 70-80% chance of being called an "Open"
-                    if random.random() < 0.75:  # 75% probability
+                    if rng.random() < 0.75:  # 75% probability
                         event_type = "Open"
                     else:
-                        event_type = random.choice(["Invitational", "Classic"])
+                        event_type = rng.choice(["Invitational", "Classic"])
                 
                 final_tournament_name = f"{location_name} {event_type}"
             else:
                 # Sponsored or golfer events
                 if name_type == 'sponsor':
-                    # Get available sponsors (not used yet)
-                    available_sponsors = [s for s in sponsors if s not in used_sponsors]
                     if not available_sponsors:
                         # If all sponsors used, fall back to location-based
                         name_type = 'location'
                         top_5_states = ["California", "Texas", "Florida", "New York", "Pennsylvania"]
                         if state in top_5_states:
-                            location_name = random.choice([selected_location, state])
+                            location_name = rng.choice([selected_location, state])
                         else:
                             location_name = state
                         
@@ -601,28 +722,28 @@ def seed_database():
                             available_types = [et for et in location_event_types if et not in vowel_vowel_avoid[location_name]]
                             if not available_types:
                                 available_types = ["Classic"]
-                            event_type = random.choice(available_types)
+                            event_type = rng.choice(available_types)
                         else:
-                            if random.random() < 0.75:
+                            if rng.random() < 0.75:
                                 event_type = "Open"
                             else:
-                                event_type = random.choice(["Invitational", "Classic"])
+                                event_type = rng.choice(["Invitational", "Classic"])
                         
                         final_tournament_name = f"{location_name} {event_type}"
                     else:
-                        prefix = random.choice(available_sponsors)
-                        used_sponsors.add(prefix)
+                        prefix = rng.choice(available_sponsors)
+                        available_sponsors.remove(prefix)
                         # Pro-Am only for non-profits AND if we haven't hit the limit
                         if prefix in non_profit_sponsors and pro_am_count < 2:
                             event_type = "Pro-Am"
                             pro_am_count += 1
                         else:
-                            event_type = random.choice([et for et in general_event_types if et != "Pro-Am"])
+                            event_type = rng.choice([et for et in GENERAL_EVENT_TYPES if et != "Pro-Am"])
                         final_tournament_name = f"{prefix} {event_type}"
                 else:
                     # Golfer events (rare)
-                    prefix = random.choice(famous_golfers)
-                    event_type = random.choice([et for et in general_event_types if et != "Pro-Am"])
+                    prefix = rng.choice(famous_golfers)
+                    event_type = rng.choice([et for et in GENERAL_EVENT_TYPES if et != "Pro-Am"])
                     final_tournament_name = f"{prefix} {event_type}"
 
             # Create database entries
@@ -631,9 +752,6 @@ def seed_database():
                 used_cities.add(selected_location)
                 country_counts[country] = country_counts.get(country, 0) + 1
 
-                course_name = generate_course_name()
-                course_par = random.randint(70, 72)
-                
                 # For location-based tournaments, use the location name as city
                 # For sponsored/golfer tournaments, generate a random city from the same state/country
                 if name_type == 'location':
@@ -642,79 +760,50 @@ def seed_database():
                 else:
                     # Find a random city from the same state/country for course location
                     if country == "USA":
-                        available_cities = us_cities_by_state.get(state, [selected_location])
-                        city = random.choice(available_cities)
+                        available_cities = US_CITIES_BY_STATE.get(state, [selected_location])
+                        city = rng.choice(available_cities)
                         state_country = state
                     else:
                         # For international, use the selected location
                         city = selected_location
                         state_country = country
                 
-                c.execute(
-                    'INSERT INTO courses (name, type, par, difficulty, city, state_country) VALUES (?, ?, ?, ?, ?, ?)',
-                    (course_name, 'Fictional', course_par, round(random.uniform(0.8, 1.2), 2), city, state_country)
-                )
-                course_id = c.lastrowid
-                
-                # Generate course characteristics that affect player performance
-                course_characteristics = generate_course_characteristics(course_name, 'Fictional', city, state_country)
-                
-                # Save course characteristics to database
-                c.execute('''
-                    INSERT INTO course_characteristics (
-                        course_id, avg_temperature, humidity_level, wind_factor, rain_probability,
-                        design_strategy, course_length, narrowness_factor, hazard_density,
-                        green_speed, turf_firmness, rough_length,
-                        prestige_level, course_age, crowd_factor,
-                        elevation_factor, terrain_difficulty
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    course_id,
-                    course_characteristics['avg_temperature'],
-                    course_characteristics['humidity_level'],
-                    course_characteristics['wind_factor'],
-                    course_characteristics['rain_probability'],
-                    course_characteristics['design_strategy'],
-                    course_characteristics['course_length'],
-                    course_characteristics['narrowness_factor'],
-                    course_characteristics['hazard_density'],
-                    course_characteristics['green_speed'],
-                    course_characteristics['turf_firmness'],
-                    course_characteristics['rough_length'],
-                    course_characteristics['prestige_level'],
-                    course_characteristics['course_age'],
-                    course_characteristics['crowd_factor'],
-                    course_characteristics['elevation_factor'],
-                    course_characteristics['terrain_difficulty']
-                ))
-                
-                holes, total_par = [], 0
-                for hole_num in range(1, 18):
-                    par = random.choice([3, 4, 5])
-                    holes.append((course_id, hole_num, par, round(random.uniform(0.8, 1.2), 2)))
-                    total_par += par
-                last_hole_par = max(3, min(5, course_par - total_par))
-                holes.append((course_id, 18, last_hole_par, round(random.uniform(0.8, 1.2), 2)))
-                c.executemany('INSERT INTO holes (course_id, hole_number, par, difficulty_modifier) VALUES (?, ?, ?, ?)', holes)
-
                 event_start_date = start_date + timedelta(days=(i * 10))
-                c.execute(
-                    'INSERT INTO tournaments (name, course_id, start_date, end_date, purse, status, current_round, cut_applied) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
-                    (final_tournament_name, course_id, event_start_date, event_start_date + timedelta(days=4), random.uniform(5.0, 15.0), 'pending', 1, 0)
-                )
-                
-                print(f"  - Created: {final_tournament_name} at {course_name} ({city}, {state_country})")
+                schedule.append((final_tournament_name, city, state_country, event_start_date, rng.uniform(5.0, 15.0)))
                 
                 break
 
+    # Courses only depend on the seed and their place in the schedule
+    courses = _run_stage(generate_course, [(seed, i, city, state_country)
+                                           for i, (_, city, state_country, _, _) in enumerate(schedule)], workers)
+    for (tournament_name, city, state_country, event_start_date, purse), course in zip(schedule, courses):
+        c.execute(
+            'INSERT INTO courses (name, type, par, difficulty, city, state_country) VALUES (?, ?, ?, ?, ?, ?)',
+            (course['name'], 'Fictional', course['par'], course['difficulty'], city, state_country)
+        )
+        course_id = c.lastrowid
+        
+        # Save the course characteristics that affect player performance
+        c.execute(CHARACTERISTICS_INSERT, characteristics_row(course_id, course['characteristics']))
+        
+        c.executemany(HOLE_INSERT, [(course_id,) + hole for hole in course['holes']])
+
+        c.execute(
+            'INSERT INTO tournaments (name, course_id, start_date, end_date, purse, status, current_round, cut_applied) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (tournament_name, course_id, event_start_date, event_start_date + timedelta(days=4), purse, 'pending', 1, 0)
+        )
+        
+        print(f"  - Created: {tournament_name} at {course['name']} ({city}, {state_country})")
+
     # --- 5. Assign Players to all Tournaments ---
     all_player_ids = [row[0] for row in c.execute('SELECT id FROM players').fetchall()]
     all_tournament_ids = [row[0] for row in c.execute('SELECT id FROM tournaments').fetchall()]
 
+    rng = stage_rng(seed, 'fields')
     for tournament_id in all_tournament_ids:
         tournament_players, group_num = [], 1
         player_ids_for_grouping = all_player_ids.copy()
-        random.shuffle(player_ids_for_grouping)
+        rng.shuffle(player_ids_for_grouping)
         
         for i in range(0, len(player_ids_for_grouping), 3):
             for player_id in player_ids_for_grouping[i:i+3]:
@@ -729,8 +818,169 @@ def seed_database():
     conn.close()
     print("Database seeding complete.")
 
+def _batches(rows, batch_size):
+    """Groups a row generator into lists of at most batch_size rows."""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def bulk_seed(num_players=10000, num_tournaments=1000, field_size=150, batch_size=5000, seed=None, db_path=None,
+              workers=1):
+    """
+    Seeds a large synthetic league for load testing, e.g. 10k+ players and
+    thousands of tournaments. Unlike seed_database it skips the season
+    schedule's naming and location rules: courses and tournaments are placed
+    anywhere and names may repeat. Rows are generated in batches and written
+    with executemany, with ids assigned up front so no insert needs its
+    lastrowid, inside one transaction per table and with journaling and
+    syncing turned off. Meant for a freshly initialised database. Player and
+    course generation run in that many worker processes if workers > 1. Prints
+    and returns the rows written per second for each table.
+    """
+    if seed is None:
+        seed = random.SystemRandom().randrange(2 ** 32)
+    conn = get_db_connection(db_path)
+    # Durability does not matter for a throwaway load-test database
+    conn.execute('PRAGMA journal_mode = OFF')
+    conn.execute('PRAGMA synchronous = OFF')
+    conn.execute('PRAGMA temp_store = MEMORY')
+    conn.execute('PRAGMA cache_size = -200000')
+    conn.execute('PRAGMA locking_mode = EXCLUSIVE')
+
+    first_player = conn.execute('SELECT COALESCE(MAX(id), 0) + 1 FROM players').fetchone()[0]
+    first_course = conn.execute('SELECT COALESCE(MAX(id), 0) + 1 FROM courses').fetchone()[0]
+    first_tournament = conn.execute('SELECT COALESCE(MAX(id), 0) + 1 FROM tournaments').fetchone()[0]
+    player_ids = range(first_player, first_player + num_players)
+    field_size = min(field_size, num_players)
+    us_locations = [(city, state, state) for state, cities in US_CITIES_BY_STATE.items() for city in cities]
+    international = [(city, country, country) for country, cities in INTERNATIONAL_LOCATIONS.items() for city in cities]
+    start_date = datetime(2025, 5, 26)
+
+    # Faker is slow per call, so names are combined from pools drawn up front
+    fake = stage_faker(seed, 'names')
+    first_names = [fake.first_name_male() for _ in range(min(num_players, 2000))]
+    last_names = [fake.last_name() for _ in range(min(num_players, 2000))]
+    rng = stage_rng(seed, 'locations')
+    locations = [rng.choice(us_locations if rng.random() < 0.93 else international)[:2] for _ in range(num_tournaments)]
+
+    def players():
+        chunks = _run_stage(generate_players, _player_jobs(seed, num_players, first_names, last_names), workers)
+        for player_id, player in zip(player_ids, (row for chunk in chunks for row in chunk)):
+            yield (player_id,) + player
+
+    def tournaments():
+        rng = stage_rng(seed, 'schedule')
+        for i in range(num_tournaments):
+            name = f"{rng.choice(SPONSORS)} {rng.choice([et for et in GENERAL_EVENT_TYPES if et != 'Pro-Am'])}"
+            event_start_date = start_date + timedelta(days=i * 10)
+            yield (first_tournament + i, name, first_course + i, event_start_date, event_start_date + timedelta(days=4),
+                   rng.uniform(5.0, 15.0), 'pending', 1, 0)
+
+    def fields():
+        rng = stage_rng(seed, 'fields')
+        for tournament_id in range(first_tournament, first_tournament + num_tournaments):
+            field = rng.sample(player_ids, field_size)
+            for i, player_id in enumerate(field):
+                yield (tournament_id, player_id, 'active', i // 3 + 1)
+
+    rates = {}
+    def write(table, sql, rows):
+        started, count = time.perf_counter(), 0
+        for batch in _batches(rows, batch_size):
+            conn.executemany(sql, batch)
+            count += len(batch)
+        conn.commit()
+        elapsed = time.perf_counter() - started
+        rates[table] = {'rows': count, 'seconds': round(elapsed, 3), 'rows_per_second': round(count / elapsed) if elapsed else None}
+        print(f"  {table}: {count} rows in {elapsed:.2f}s ({rates[table]['rows_per_second']} rows/s)")
+
+    print(f"Bulk seeding {num_players} players and {num_tournaments} tournaments (seed {seed})...")
+    started = time.perf_counter()
+    write('players', PLAYER_INSERT_WITH_ID, players())
+
+    courses = list(zip(range(first_course, first_course + num_tournaments), locations,
+                       _run_stage(generate_course, [(seed, i) + location for i, location in enumerate(locations)], workers)))
+    write('courses', 'INSERT INTO courses (id, name, type, par, difficulty, city, state_country) VALUES (?, ?, ?, ?, ?, ?, ?)',
+          ((course_id, c['name'], 'Fictional', c['par'], c['difficulty']) + location for course_id, location, c in courses))
+    write('course_characteristics', CHARACTERISTICS_INSERT,
+          (characteristics_row(course_id, c['characteristics']) for course_id, _, c in courses))
+    write('holes', HOLE_INSERT, ((course_id,) + hole for course_id, _, c in courses for hole in c['holes']))
+    write('tournaments', 'INSERT INTO tournaments (id, name, course_id, start_date, end_date, purse, status, current_round, cut_applied) '
+                         'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', tournaments())
+    write('tournament_players', 'INSERT INTO tournament_players (tournament_id, player_id, status, tee_group) VALUES (?, ?, ?, ?)',
+          fields())
+    conn.close()
+
+    total_rows = sum(r['rows'] for r in rates.values())
+    total_seconds = time.perf_counter() - started
+    print(f"Bulk seeding complete: {total_rows} rows in {total_seconds:.2f}s ({round(total_rows / total_seconds)} rows/s).")
+    return rates
+
+def seeder_version():
+    """Identifies the seeder and schema that built a database, for golden database keys."""
+    schema = hashlib.sha1(inspect.getsource(init_db).encode()).hexdigest()[:10]
+    return f"v{SEEDER_VERSION}-{schema}"
+
+def golden_database_path(seed):
+    """Path of the golden database for a seed and the current seeder version."""
+    return os.path.join(Config.GOLDEN_DB_DIR, f"golf_betting-seed{seed}-{seeder_version()}.db")
+
+def build_golden_database(seed):
+    """
+    Builds the seeded golden database for a seed unless it already exists, and
+    returns its path. The database is built under a temporary name and moved
+    into place, so a half-built file is never picked up.
+    """
+    path = golden_database_path(seed)
+    if os.path.exists(path):
+        return path
+    os.makedirs(Config.GOLDEN_DB_DIR, exist_ok=True)
+    building = f"{path}.{os.getpid()}.tmp"
+    if os.path.exists(building):
+        os.remove(building)
+    init_db(building)
+    seed_database(seed, building)
+    os.replace(building, path)
+    return path
+
+def restore_golden_database(seed, db_path=None):
+    """
+    Resets a database to the seeded league for a seed by copying the golden
+    database over it with SQLite's backup API, building the golden database
+    first if needed. Open connections to db_path see the restored data. With
+    an in-memory db_path this loads the league into memory without other I/O.
+    """
+    copy_database(build_golden_database(seed), db_path or Config.DATABASE_PATH)
+
 if __name__ == '__main__':
-    # Initialize the database (creates tables)
-    init_db()
-    # Seed the database with data
-    seed_database()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Create and seed the golf simulator database.')
+    parser.add_argument('--seed', type=int, help='seed for a reproducible league')
+    parser.add_argument('--golden', action='store_true',
+                        help='restore from the golden database for --seed, building it on first use')
+    parser.add_argument('--bulk', action='store_true', help='seed a large synthetic league for load testing')
+    parser.add_argument('--players', type=int, default=10000, help='players to create with --bulk')
+    parser.add_argument('--tournaments', type=int, default=1000, help='tournaments to create with --bulk')
+    parser.add_argument('--field-size', type=int, default=150, help='players entered per tournament with --bulk')
+    parser.add_argument('--batch-size', type=int, default=5000, help='rows per executemany with --bulk')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='worker processes for generating players and courses (same output for any number)')
+    args = parser.parse_args()
+
+    if args.bulk:
+        init_db()
+        bulk_seed(args.players, args.tournaments, args.field_size, args.batch_size, args.seed, workers=args.workers)
+    elif args.golden:
+        if args.seed is None:
+            parser.error('--golden requires --seed')
+        restore_golden_database(args.seed)
+        print(f"Restored the seed {args.seed} league from {golden_database_path(args.seed)}.")
+    else:
+        # Initialize the database (creates tables)
+        init_db()
+        # Seed the database with data
+        seed_database(args.seed, workers=args.workers)
\ No newline at end of file
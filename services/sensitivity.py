@@ -0,0 +1,294 @@
+"""
+Sensitivity analysis of the scoring model to course characteristics.
+
+    python services/sensitivity.py                       # every factor over 0.0..1.0
+    python services/sensitivity.py --pairs green_speed:wind_factor,course_length:narrowness_factor
+    python services/sensitivity.py --all-pairs --pair-steps 5 --output sweep.json
+
+Each factor is swept over a grid, and optionally pairs of factors over a
+grid of both, with every other characteristic held at the baseline (0.5, or
+a course's own values with --course). For each setting, each representative
+skill profile plays --rounds rounds of a course's holes with a scoring model
+(--model, default Config.SCORING_MODEL), and the report gives the marginal
+effect on expected strokes per round against the baseline; for pairs, also
+the interaction: the joint effect minus the two single-factor effects.
+
+Every setting replays the same random draws for a profile (common random
+numbers), so differences between settings come from the model rather than
+from sampling noise, and small effects show up with modest sample sizes.
+Settings are scored in batches across worker processes, with the configured
+scoring parameters (Config.SCORING_PARAMS_PATH).
+"""
+import argparse
+import bisect
+import itertools
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import Config
+from services.scoring_models import SCORING_MODELS, cumulative_probabilities, effective_skill, get_model
+
+FACTORS = (
+    'avg_temperature', 'humidity_level', 'wind_factor', 'rain_probability',
+    'design_strategy', 'course_length', 'narrowness_factor', 'hazard_density',
+    'green_speed', 'turf_firmness', 'rough_length',
+    'prestige_level', 'course_age', 'crowd_factor',
+    'elevation_factor', 'terrain_difficulty',
+)
+
+# Skill profiles from test_course_characteristics.py, plus a weaker all-rounder
+PROFILES = {
+    'long_driver': {'overall_skill': 85, 'driving_skill': 95, 'approach_skill': 80,
+                    'short_game_skill': 75, 'putting_skill': 80},
+    'accurate': {'overall_skill': 85, 'driving_skill': 75, 'approach_skill': 95,
+                 'short_game_skill': 90, 'putting_skill': 85},
+    'putter': {'overall_skill': 85, 'driving_skill': 80, 'approach_skill': 80,
+               'short_game_skill': 85, 'putting_skill': 95},
+    'balanced': {'overall_skill': 85, 'driving_skill': 85, 'approach_skill': 85,
+                 'short_game_skill': 85, 'putting_skill': 85},
+    'journeyman': {'overall_skill': 72, 'driving_skill': 72, 'approach_skill': 72,
+                   'short_game_skill': 72, 'putting_skill': 72},
+}
+
+# A par-72 layout of neutral holes: (par, difficulty_modifier)
+STANDARD_HOLES = [(4, 1.0), (5, 1.0), (4, 1.0), (3, 1.0), (4, 1.0), (4, 1.0), (5, 1.0), (3, 1.0), (4, 1.0),
+                  (4, 1.0), (4, 1.0), (3, 1.0), (5, 1.0), (4, 1.0), (4, 1.0), (3, 1.0), (4, 1.0), (5, 1.0)]
+
+BASELINE_VALUE = 0.5
+SETTINGS_PER_JOB = 8
+
+
+def grid(steps):
+    """steps evenly spaced values from 0.0 to 1.0."""
+    if steps < 2:
+        raise ValueError('A grid needs at least 2 steps.')
+    return [round(i / (steps - 1), 4) for i in range(steps)]
+
+
+def profile_draws(seed, profile, rounds, holes):
+    """
+    The uniform [0, 1) draws a profile's rounds use, one per hole. Every setting
+    reuses them, so the settings differ only in the model's response.
+    """
+    rng = random.Random(f'{seed}:{profile}')
+    return [rng.random() for _ in range(rounds * holes)]
+
+
+def score_rounds(model, weighted_skill, holes, draws):
+    """
+    Plays len(draws) / len(holes) rounds with a scoring model (see
+    services/scoring_models.py), turning each draw into a hole score through
+    the model's score distribution for the hole, computed once per hole.
+    Returns the mean strokes per round and their standard deviation.
+    """
+    # Per hole: the lowest score and the cumulative probabilities above it
+    hole_tables = []
+    for par, difficulty in holes:
+        best, probabilities = model.distribution(weighted_skill, difficulty)
+        hole_tables.append((par + best, cumulative_probabilities(probabilities)))
+    per_round = len(hole_tables)
+    total = total_squares = 0.0
+    rounds = len(draws) // per_round
+    for start in range(0, rounds * per_round, per_round):
+        strokes = 0
+        for (low, cumulative), u in zip(hole_tables, draws[start:start + per_round]):
+            strokes += low + bisect.bisect_right(cumulative, u)
+        total += strokes
+        total_squares += strokes * strokes
+    mean = total / rounds
+    return mean, math.sqrt(max(total_squares / rounds - mean * mean, 0.0))
+
+
+def _score_settings(settings, baseline, profiles, holes, rounds, seed, model):
+    """Worker: scores a batch of settings for every profile. Returns {setting: {profile: (mean, sd)}}."""
+    model = get_model(model)
+    draws = {name: profile_draws(seed, name, rounds, len(holes)) for name in profiles}
+    results = {}
+    for setting in settings:
+        characteristics = dict(baseline, **dict(setting))
+        results[setting] = {
+            name: score_rounds(model, effective_skill(model.parameters, skills, characteristics), holes, draws[name])
+            for name, skills in profiles.items()
+        }
+    return results
+
+
+def run_settings(settings, baseline, profiles=PROFILES, holes=STANDARD_HOLES, rounds=2000, seed=0, workers=1,
+                 model=None):
+    """
+    Scores each setting (a tuple of (factor, value) pairs applied over the
+    baseline characteristics) for every profile with the scoring model
+    (default Config.SCORING_MODEL), in batches spread over worker processes
+    if workers > 1. The result is the same for any workers.
+    """
+    settings = list(dict.fromkeys(settings))
+    batches = [settings[i:i + SETTINGS_PER_JOB] for i in range(0, len(settings), SETTINGS_PER_JOB)]
+    args = (baseline, profiles, holes, rounds, seed, model or Config.SCORING_MODEL)
+    results = {}
+    if workers > 1 and len(batches) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for batch in executor.map(_score_settings, batches, *([arg] * len(batches) for arg in args)):
+                results.update(batch)
+    else:
+        for batch in batches:
+            results.update(_score_settings(batch, *args))
+    return results
+
+
+def analyse(baseline, factors=FACTORS, steps=11, pairs=(), pair_steps=5, profiles=PROFILES,
+            holes=STANDARD_HOLES, rounds=2000, seed=0, workers=1, model=None):
+    """
+    Sweeps each factor over grid(steps), and each pair of factors over
+    grid(pair_steps) squared. Returns a report dict: for every setting and
+    profile, the mean strokes per round and the effect against the baseline;
+    for pairs, also the interaction between the two factors.
+    """
+    values, pair_values = grid(steps), grid(pair_steps)
+    one_way = [((factor, value),) for factor in factors for value in values]
+    pair_settings = [((a, x), (b, y)) for a, b in pairs for x in pair_values for y in pair_values]
+    # Pair interactions need each factor's single effect at the pair grid too
+    singles = [((factor, value),) for a, b in pairs for factor in (a, b) for value in pair_values]
+
+    started = time.perf_counter()
+    scored = run_settings([()] + one_way + singles + pair_settings, baseline, profiles, holes,
+                          rounds, seed, workers, model)
+    elapsed = time.perf_counter() - started
+    base = scored[()]
+
+    def effects(setting):
+        return {name: round(scored[setting][name][0] - base[name][0], 4) for name in profiles}
+
+    report = {
+        'model': get_model(model or Config.SCORING_MODEL).id,
+        'rounds': rounds,
+        'seed': seed,
+        'baseline': baseline,
+        'holes': holes,
+        'profiles': profiles,
+        'baseline_strokes': {name: {'mean': round(mean, 4), 'sd': round(sd, 4)} for name, (mean, sd) in base.items()},
+        'settings_scored': len(scored),
+        'seconds': round(elapsed, 2),
+        'factors': {},
+        'pairs': [],
+    }
+    for factor in factors:
+        sweep = [{'value': value, 'effect': effects(((factor, value),))} for value in values]
+        report['factors'][factor] = {
+            'sweep': sweep,
+            # Largest swing in expected strokes over the grid, per profile
+            'range': {name: round(max(s['effect'][name] for s in sweep) - min(s['effect'][name] for s in sweep), 4)
+                      for name in profiles},
+        }
+    for a, b in pairs:
+        cells = []
+        for x in pair_values:
+            for y in pair_values:
+                joint = effects(((a, x), (b, y)))
+                single_a, single_b = effects(((a, x),)), effects(((b, y),))
+                cells.append({a: x, b: y, 'effect': joint,
+                              'interaction': {name: round(joint[name] - single_a[name] - single_b[name], 4)
+                                              for name in profiles}})
+        report['pairs'].append({
+            'factors': [a, b],
+            'cells': cells,
+            'max_interaction': max(abs(v) for cell in cells for v in cell['interaction'].values()),
+        })
+    report['pairs'].sort(key=lambda p: p['max_interaction'], reverse=True)
+    return report
+
+
+def course_inputs(course_id):
+    """A course's characteristics and holes from the database, as the baseline and layout."""
+    from models.database import db
+    characteristics = db.get_course_characteristics(course_id)
+    holes = db.get_holes_for_course(course_id)
+    if not characteristics or not holes:
+        raise ValueError(f'Course {course_id} has no characteristics or holes.')
+    return ({factor: characteristics[factor] for factor in FACTORS},
+            [(hole['par'], hole['difficulty_modifier']) for hole in holes])
+
+
+def parse_pairs(text):
+    pairs = []
+    for item in text.split(','):
+        a, _, b = item.partition(':')
+        for factor in (a, b):
+            if factor not in FACTORS:
+                raise ValueError(f"Unknown characteristic '{factor}'")
+        if a == b:
+            raise ValueError(f"A pair needs two different characteristics, got '{item}'")
+        pairs.append((a, b))
+    return pairs
+
+
+def print_report(report):
+    profiles = list(report['profiles'])
+    print(f"Expected strokes per round at the baseline ({report['rounds']} rounds each):")
+    for name, stats in report['baseline_strokes'].items():
+        print(f"  {name:12s} {stats['mean']:7.2f} (sd {stats['sd']:.2f})")
+
+    factors = sorted(report['factors'].items(), key=lambda item: -max(item[1]['range'].values()))
+    values = [s['value'] for s in factors[0][1]['sweep']] if factors else []
+    print('\nEffect on strokes per round, averaged over profiles, by value:')
+    print(f"{'factor':20s}" + ''.join(f'{v:>7.2f}' for v in values))
+    for factor, result in factors:
+        print(f'{factor:20s}' + ''.join(
+            f"{sum(s['effect'].values()) / len(profiles):+7.2f}" for s in result['sweep']))
+
+    print('\nLargest swing in strokes per round over the grid, by profile:')
+    print(f"{'factor':20s}" + ''.join(f'{name[:11]:>12s}' for name in profiles))
+    for factor, result in factors:
+        print(f'{factor:20s}' + ''.join(f"{result['range'][name]:12.2f}" for name in profiles))
+
+    if report['pairs']:
+        print('\nPairs by largest interaction (joint effect minus the two single effects):')
+        for pair in report['pairs']:
+            print(f"  {' x '.join(pair['factors']):40s} {pair['max_interaction']:6.2f}")
+    print(f"\nScored {report['settings_scored']} settings in {report['seconds']:.1f}s")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Sweep course characteristics and report their effect on scoring.')
+    parser.add_argument('--factors', help='comma-separated characteristics to sweep (default: all)')
+    parser.add_argument('--steps', type=int, default=11, help='grid points per factor, from 0.0 to 1.0')
+    parser.add_argument('--pairs', help='pairs to sweep jointly, e.g. green_speed:wind_factor,course_length:rough_length')
+    parser.add_argument('--all-pairs', action='store_true', help='sweep every pair of the swept factors')
+    parser.add_argument('--pair-steps', type=int, default=5, help='grid points per factor in a pair sweep')
+    parser.add_argument('--rounds', type=int, default=2000, help='rounds simulated per profile and setting')
+    parser.add_argument('--course', type=int, help="use a course's characteristics and holes as the baseline")
+    parser.add_argument('--seed', type=int, default=0, help='seed for the random draws')
+    parser.add_argument('--model', default=Config.SCORING_MODEL, choices=sorted(SCORING_MODELS),
+                        help='scoring model to sweep (default SCORING_MODEL)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='worker processes')
+    parser.add_argument('--output', help='write the full report as JSON to this file')
+    args = parser.parse_args()
+
+    try:
+        factors = args.factors.split(',') if args.factors else list(FACTORS)
+        unknown = [f for f in factors if f not in FACTORS]
+        if unknown:
+            raise ValueError(f"Unknown characteristic(s): {', '.join(unknown)}")
+        pairs = parse_pairs(args.pairs) if args.pairs else []
+        if args.all_pairs:
+            pairs = list(itertools.combinations(factors, 2))
+        if args.course:
+            baseline, holes = course_inputs(args.course)
+        else:
+            baseline, holes = {factor: BASELINE_VALUE for factor in FACTORS}, STANDARD_HOLES
+        report = analyse(baseline, factors, args.steps, pairs, args.pair_steps, holes=holes,
+                         rounds=args.rounds, seed=args.seed, workers=args.workers, model=args.model)
+    except ValueError as e:
+        parser.error(str(e))
+
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.output}")
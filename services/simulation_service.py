@@ -1,148 +1,108 @@
-import random
+import logging
 from models.database import db
+from services.cut_tracker import CutLineTracker
+from services.betting_service import betting_service
+from services.metrics import record_players_scored
+from services.event_log import get_logger
+from services.scoring_params import load_scoring_parameters, parameters_version
+from services.scoring_models import ScoringInputs, effective_skill, get_model, compare_models
+from config import Config
 from collections import defaultdict
-import datetime
+
+logger = get_logger('simulation')
 
 class SimulationService:
     """Handles the logic for simulating golf tournaments."""
 
+    def __init__(self, parameters=None, model=None, fast_model=None):
+        # Projected cut lines for tournaments in rounds 1 and 2, kept up to date
+        # as each hole is scored
+        self._cut_trackers = {}
+        # Coefficients of the scoring model: the configured set (see
+        # services/scoring_params.py) unless given
+        if parameters is None:
+            self.parameters_version, self.parameters = load_scoring_parameters()
+        else:
+            self.parameters_version, self.parameters = parameters_version(parameters), parameters
+        # The model scoring live tournaments, which each tournament records, and
+        # the one pricing uses; both score from the same per-tournament inputs
+        self.model = get_model(model or Config.SCORING_MODEL, self.parameters, self.parameters_version)
+        self.fast_model = get_model(fast_model or Config.FAST_SCORING_MODEL, self.parameters, self.parameters_version)
+        self._scoring_inputs = {}  # tournament_id -> ScoringInputs
+        self._model_mismatches = set()
+
+    def get_cut_tracker(self, tournament_id, tournament=None):
+        """
+        Returns the cut line tracker for a tournament that has not applied its
+        cut yet, building it from the live scores the first time it is needed.
+        Returns None once the cut has been applied.
+        """
+        tournament = tournament or db.get_tournament_by_id(tournament_id)
+        if not tournament or tournament['current_round'] > 2 or tournament['cut_applied']:
+            self._cut_trackers.pop(tournament_id, None)
+            return None
+
+        tracker = self._cut_trackers.get(tournament_id)
+        if tracker is None:
+            leaderboard = db.get_leaderboard_from_live_scores(tournament_id)
+            tracker = self._cut_trackers[tournament_id] = CutLineTracker.from_leaderboard(leaderboard)
+        return tracker
+
+    def effective_skill(self, player_skills, course_characteristics=None):
+        """
+        Combines a player's detailed skills and the course characteristics that
+        affect performance into the single weighted skill used to score holes.
+        """
+        return effective_skill(self.parameters, player_skills, course_characteristics)
+
     def _calculate_hole_score(self, player_skills, hole_par, hole_difficulty, course_characteristics=None):
         """
-        Calculates a player's score for a single hole using the detailed skill system
-        and course characteristics that affect performance.
+        Calculates a player's score for a single hole with the scoring model,
+        from the detailed skill system and course characteristics.
         """
-        # Extract skills from the player data
-        overall_skill = player_skills['overall_skill']
-        driving_skill = player_skills['driving_skill']
-        approach_skill = player_skills['approach_skill']
-        short_game_skill = player_skills['short_game_skill']
-        putting_skill = player_skills['putting_skill']
-        
-        # Base weighted skill calculation
-        weighted_skill = (overall_skill * 0.3 + driving_skill * 0.25 + approach_skill * 0.25 + 
-                         short_game_skill * 0.15 + putting_skill * 0.05)
-        
-        # Apply course characteristic modifiers
-        if course_characteristics:
-            # Weather effects
-            weather_modifier = 0.0
-            
-            # Temperature effects (extreme temperatures affect performance)
-            temp_factor = abs(course_characteristics['avg_temperature'] - 0.5) * 2  # 0 at 50%, max at extremes
-            weather_modifier += temp_factor * 0.1
-            
-            # Humidity effects (high humidity is more challenging)
-            weather_modifier += course_characteristics['humidity_level'] * 0.05
-            
-            # Wind effects (wind affects all shots)
-            wind_penalty = course_characteristics['wind_factor'] * 0.15
-            weather_modifier += wind_penalty
-            
-            # Rain effects (rain makes conditions more difficult)
-            weather_modifier += course_characteristics['rain_probability'] * 0.1
-            
-            # Course design effects
-            design_modifier = 0.0
-            
-            # Penal vs strategic design
-            if course_characteristics['design_strategy'] > 0.7:
-                # Penal courses favor accuracy over distance
-                accuracy_bonus = (approach_skill + short_game_skill) / 2 - weighted_skill
-                design_modifier += accuracy_bonus * 0.1
-            else:
-                # Strategic courses favor overall skill
-                design_modifier += 0.0  # Neutral effect
-            
-            # Course length effects (longer courses favor driving distance)
-            if course_characteristics['course_length'] > 0.7:
-                driving_bonus = driving_skill - weighted_skill
-                design_modifier += driving_bonus * 0.1
-            
-            # Narrowness effects (narrow courses favor accuracy)
-            if course_characteristics['narrowness_factor'] > 0.7:
-                accuracy_penalty = (weighted_skill - (approach_skill + short_game_skill) / 2) * 0.1
-                design_modifier += accuracy_penalty
-            
-            # Hazard density effects (more hazards = more challenging)
-            hazard_penalty = course_characteristics['hazard_density'] * 0.1
-            design_modifier += hazard_penalty
-            
-            # Course conditions effects
-            conditions_modifier = 0.0
-            
-            # Green speed effects (faster greens favor putting skill)
-            if course_characteristics['green_speed'] > 0.7:
-                putting_bonus = putting_skill - weighted_skill
-                conditions_modifier += putting_bonus * 0.15
-            elif course_characteristics['green_speed'] < 0.3:
-                putting_penalty = (weighted_skill - putting_skill) * 0.1
-                conditions_modifier += putting_penalty
-            
-            # Turf firmness effects (firmer turf affects approach shots)
-            if course_characteristics['turf_firmness'] > 0.7:
-                approach_penalty = (weighted_skill - approach_skill) * 0.1
-                conditions_modifier += approach_penalty
-            
-            # Rough length effects (longer rough affects all shots)
-            rough_penalty = course_characteristics['rough_length'] * 0.1
-            conditions_modifier += rough_penalty
-            
-            # Mental factors
-            mental_modifier = 0.0
-            
-            # Prestige effects (higher prestige = more pressure)
-            prestige_pressure = course_characteristics['prestige_level'] * 0.1
-            mental_modifier += prestige_pressure
-            
-            # Crowd effects (larger crowds = more pressure)
-            crowd_pressure = course_characteristics['crowd_factor'] * 0.05
-            mental_modifier += crowd_pressure
-            
-            # Course age effects (historic courses can be intimidating)
-            if course_characteristics['course_age'] > 0.7:
-                historic_intimidation = 0.05
-                mental_modifier += historic_intimidation
-            
-            # Elevation and terrain effects
-            physical_modifier = 0.0
-            
-            # Elevation effects (high elevation affects distance and stamina)
-            elevation_penalty = course_characteristics['elevation_factor'] * 0.1
-            physical_modifier += elevation_penalty
-            
-            # Terrain difficulty effects (hilly courses are more physically demanding)
-            terrain_penalty = course_characteristics['terrain_difficulty'] * 0.05
-            physical_modifier += terrain_penalty
-            
-            # Apply all modifiers to the weighted skill
-            total_modifier = weather_modifier + design_modifier + conditions_modifier + mental_modifier + physical_modifier
-            weighted_skill += total_modifier * 100  # Scale up the modifier effect
-        else:
-            # No course characteristics available, use base calculation
-            pass
-        
-        # Base score tendency (lower is better)
-        # Higher skill means a score closer to par, but not dramatically better
-        skill_bonus = (weighted_skill - 75) / 100.0  # e.g. skill 85 -> +0.1, skill 95 -> +0.2
-        base_tendency = hole_par - skill_bonus
+        return self.model.hole_score(self.effective_skill(player_skills, course_characteristics),
+                                     hole_par, hole_difficulty)
 
-        # Use overall skill as a consistency factor (higher skill = more consistent)
-        consistency_factor = (100 - weighted_skill) / 100.0  # e.g. skill 90 -> 0.1
-        
-        # Introduce more randomness to allow for bogeys and worse
-        random_factor = random.uniform(-3.0, 3.0) * consistency_factor
-        
-        # Difficulty modifier of the hole
-        difficulty_factor = (hole_difficulty - 1.0) * 2.0  # e.g. 1.1 -> +0.2, 0.9 -> -0.2
-        
-        # Final score calculation
-        raw_score = base_tendency + random_factor + difficulty_factor
-        
-        # Round to nearest integer
-        final_score = round(raw_score)
-        
-        # Cap scores to avoid extreme outliers (e.g., nothing worse than triple bogey)
-        return max(hole_par - 2, min(final_score, hole_par + 3))
+    def scoring_inputs(self, tournament_id, tournament=None, player_ids=()):
+        """
+        The precomputed player skills and holes both scoring models use for a
+        tournament, built on first use and again if the field has changed
+        (player_ids not all in it). The first build logs how far the fast
+        model's expected scores are from the reference model's.
+        """
+        inputs = self._scoring_inputs.get(tournament_id)
+        if inputs is not None and inputs.covers(player_ids):
+            return inputs
+        tournament = tournament or db.get_tournament_by_id(tournament_id)
+        course_id = tournament['course_id']
+        inputs = ScoringInputs.build(self.parameters, db.get_tournament_players(tournament_id),
+                                     db.get_holes_for_course(course_id), db.get_course_characteristics(course_id))
+        if tournament_id not in self._scoring_inputs and self.fast_model.id != self.model.id:
+            mean_gap, variance_gap = compare_models(inputs, self.model, self.fast_model)
+            logger.info("Fast scoring model %s is within %.4f strokes (variance %.4f) of %s for %s",
+                        self.fast_model.id, mean_gap, variance_gap, self.model.id, tournament['name'],
+                        extra={'event': 'scoring_models_compared', 'tournament_id': tournament_id,
+                               'model': self.model.id, 'fast_model': self.fast_model.id,
+                               'mean_gap': mean_gap, 'variance_gap': variance_gap})
+        self._scoring_inputs[tournament_id] = inputs
+        return inputs
+
+    def _record_scoring_model(self, tournament):
+        """
+        Records the model and parameter version scoring a tournament on its
+        first tick, and warns once if a later tick is scored by another.
+        """
+        recorded = (tournament.get('scoring_model'), tournament.get('scoring_params_version'))
+        current = (self.model.id, self.parameters_version)
+        if recorded[0] is None:
+            db.record_scoring_model(tournament['id'], *current)
+        elif recorded != current and tournament['id'] not in self._model_mismatches:
+            self._model_mismatches.add(tournament['id'])
+            logger.warning("Tournament %s was scored by %s with parameters %s, now by %s with %s",
+                           tournament['name'], *recorded, *current,
+                           extra={'event': 'scoring_model_changed', 'tournament_id': tournament['id'],
+                                  'recorded_model': recorded[0], 'recorded_parameters': recorded[1],
+                                  'model': current[0], 'parameters': current[1]})
 
     def advance_staggered_simulation(self, tournament_id):
         """
@@ -188,78 +148,78 @@ class SimulationService:
             if finished_players >= total_players:
                 # If Round 4 is over, the tournament is complete
                 if current_round == 4:
-                    print(f"Tournament {tournament['name']} is fully complete!")
+                    logger.info("Tournament %s is fully complete!", tournament['name'],
+                                extra={'event': 'tournament_completed', 'tournament_id': tournament_id})
                     db.complete_tournament(tournament_id)
+                    # Settlement credited winnings directly in the database
+                    betting_service.invalidate_balances()
                     return # Stop simulation permanently
                 
                 # Special handling for Round 2 - apply cut if not already applied
                 if current_round == 2 and not tournament['cut_applied']:
                     try:
                         self._check_and_apply_cut(tournament_id)
-                    except Exception as e:
-                        print(f"Error applying cut: {e}")
+                    except Exception:
+                        logger.exception("Error applying cut", extra={'event': 'cut_failed', 'tournament_id': tournament_id})
                         # Even if cut fails, we should still stop the simulation
                 return  # Stop simulation, wait for user to start next round
             else:
                 return  # Wait for all players to finish
 
-        for group_num in all_groups:
-            # Calculate hole to play based on steps *in this round*
-            hole_to_play = steps_this_round - (group_num - 1) + 1
-            
+        self._record_scoring_model(tournament)
+        # The holes the groups play this step, first to last tee group
+        holes = [steps_this_round - (group_num - 1) + 1 for group_num in all_groups]
+        holes_played = [hole for hole in holes if 1 <= hole <= 18]
+        scored = db.get_scored_holes(tournament_id, current_round, min(holes_played), max(holes_played)) if holes_played else set()
+        new_scores = []
+        for group_num, hole_to_play in zip(all_groups, holes):
             group_players = [p for p in players if p['tee_group'] == group_num]
 
             if 1 <= hole_to_play <= 18:
-                self._simulate_group_on_hole(tournament_id, group_num, current_round, hole_to_play, group_players)
+                new_scores += self._simulate_group_on_hole(tournament_id, group_num, current_round, hole_to_play,
+                                                           group_players, scored)
+
+        # Every score of the step is saved in one transaction
+        db.save_live_scores(tournament_id, current_round, new_scores)
+        # Keep the projected cut line current while the cut is still to come
+        cut_tracker = self._cut_trackers.get(tournament_id) if current_round <= 2 else None
+        if cut_tracker is not None:
+            for player_id, _, score, par in new_scores:
+                cut_tracker.record_hole(player_id, score - par)
+        record_players_scored(len(new_scores))
 
         # Increment the master step counter
         db.set_simulation_step(tournament_id, step + 1)
         
-    def _simulate_group_on_hole(self, tournament_id, group_num, round_num, hole_num, group_players):
-        """Simulates a single group playing a specific hole."""
-        
-        live_scores_for_hole = db.get_live_scores_for_hole(tournament_id, round_num, hole_num)
-        players_with_scores = {score['player_id'] for score in live_scores_for_hole}
-        
-        # Check if the whole group is already done
-        if all(p['id'] in players_with_scores for p in group_players):
-            return
-
-        print(f"[{datetime.datetime.now().strftime('%H:%M:%S')}] Simulating R{round_num}, Hole {hole_num} (Par {self._get_hole_par(tournament_id, hole_num)}) for Group {group_num}...")
-        
-        for player in group_players:
-            # Only simulate players who haven't already got a score for this hole
-            if player['id'] not in players_with_scores:
-                score = self._simulate_hole_score(player, tournament_id, hole_num)
-                db.save_live_score(tournament_id, player['id'], round_num, hole_num, score)
-                print(f"  - {player['name']} scores a {score}")
-        print()
-
-    def _get_hole_par(self, tournament_id, hole_num):
-        """Get the par for a specific hole."""
-        tournament = db.get_tournament_by_id(tournament_id)
-        holes = db.get_holes_for_course(tournament['course_id'])
-        if hole_num <= len(holes):
-            return holes[hole_num - 1]['par']
-        return 4  # Default fallback
+    def _simulate_group_on_hole(self, tournament_id, group_num, round_num, hole_num, group_players, scored):
+        """
+        Simulates a single group playing a specific hole. Players already in
+        scored, a set of (player_id, hole), are skipped. Returns the new scores
+        as (player_id, hole, score, par) rows for db.save_live_scores.
+        """
+        # Only simulate players who haven't already got a score for this hole
+        to_score = [p for p in group_players if (p['id'], hole_num) not in scored]
+        if not to_score:
+            return []
 
-    def _simulate_hole_score(self, player, tournament_id, hole_num):
-        """Simulate a player's score for a specific hole."""
-        tournament = db.get_tournament_by_id(tournament_id)
-        holes = db.get_holes_for_course(tournament['course_id'])
-        
-        # Get course characteristics for this tournament's course
-        course_characteristics = db.get_course_characteristics(tournament['course_id'])
+        inputs = self.scoring_inputs(tournament_id, player_ids=[p['id'] for p in group_players])
+        hole = inputs.holes.get(hole_num)
+        hole_par = hole[0] if hole else 4  # Default fallback
+        # Per-hole detail is off unless DEBUG is on; check once, not per score
+        detail = logger.isEnabledFor(logging.DEBUG)
+        if detail:
+            logger.debug("Simulating R%d, Hole %d (Par %d) for Group %d", round_num, hole_num, hole_par, group_num,
+                         extra={'event': 'group_hole', 'tournament_id': tournament_id, 'round': round_num,
+                                'hole': hole_num, 'par': hole_par, 'group': group_num})
         
-        if hole_num <= len(holes):
-            hole_info = holes[hole_num - 1]
-            return self._calculate_hole_score(
-                player,
-                hole_info['par'],
-                hole_info['difficulty_modifier'],
-                course_characteristics
-            )
-        return 4  # Default fallback
+        scores = self.model.score_batch(inputs, [p['id'] for p in to_score], hole_num)
+        if detail:
+            for player, score in zip(to_score, scores):
+                logger.debug("%s scores a %d", player['name'], score,
+                             extra={'event': 'hole_scored', 'tournament_id': tournament_id, 'round': round_num,
+                                    'hole': hole_num, 'par': hole_par, 'group': group_num,
+                                    'player_id': player['id'], 'score': score})
+        return [(player['id'], hole_num, score, hole_par) for player, score in zip(to_score, scores)]
 
     def regroup_players(self, tournament_id, round_num, players_to_group, conn=None):
         """
@@ -315,23 +275,30 @@ class SimulationService:
             if finished_players < total_players:
                 return
 
-            print(f"Round 2 has completed. Applying cut for tournament {tournament_id}...")
+            logger.info("Round 2 has completed. Applying cut for tournament %d...", tournament_id)
             
-            leaderboard = db.get_leaderboard_from_live_scores(tournament_id, conn=conn)
             # --- APPLY THE CUT (Top 65 and ties) ---
-            if len(leaderboard) > 65:
-                cut_line_score = leaderboard[64]['score_to_par']
-                players_made_cut = [p for p in leaderboard if p['score_to_par'] <= cut_line_score]
+            cut_tracker = self._cut_trackers.get(tournament_id)
+            if cut_tracker is not None and len(cut_tracker) == total_players:
+                # The tracker already holds every player's 36-hole score
+                players_made_cut = cut_tracker.players_making_cut()
             else:
-                players_made_cut = leaderboard
+                leaderboard = db.get_leaderboard_from_live_scores(tournament_id, conn=conn)
+                if len(leaderboard) > 65:
+                    cut_line_score = leaderboard[64]['score_to_par']
+                    players_made_cut = [p for p in leaderboard if p['score_to_par'] <= cut_line_score]
+                else:
+                    players_made_cut = leaderboard
                 
             player_ids_made_cut = [p['player_id'] for p in players_made_cut]
             db.apply_cut(tournament_id, player_ids_made_cut, conn=conn)
-            print(f"Cut applied. {len(player_ids_made_cut)} players made the cut.")
+            logger.info("Cut applied. %d players made the cut.", len(player_ids_made_cut),
+                        extra={'event': 'cut_applied', 'tournament_id': tournament_id,
+                               'players_made_cut': len(player_ids_made_cut)})
 
             # --- REGROUP PLAYERS FOR ROUND 3 ---
             self.regroup_players(tournament_id, 3, players_made_cut, conn=conn)
-            print("Players regrouped for Round 3.")
-            print("Round 2 simulation complete. Waiting for user to start Round 3.")
+            logger.info("Players regrouped for Round 3. Waiting for user to start Round 3.")
 
-            conn.commit() 
\ No newline at end of file
+            conn.commit()
+            self._cut_trackers.pop(tournament_id, None) 
\ No newline at end of file
@@ -0,0 +1,75 @@
+import pytest
+
+from config import Config
+from models.database import db
+from services.betting_service import BettingService
+
+
+def field(tournament_id, count):
+    return [p['id'] for p in db.get_tournament_players(tournament_id)[:count]]
+
+
+def test_settle_bets_splits_dead_heats(tournament_id):
+    user_id = db.create_user('dead_heat')
+    first, second, third = field(tournament_id, 3)
+    bet_ids = db.save_bet_batch([
+        (user_id, tournament_id, first, 100.0, 10.0, 'outright', None, None, None),
+        (user_id, tournament_id, second, 50.0, 20.0, 'outright', None, None, None),
+        (user_id, tournament_id, third, 25.0, 5.0, 'outright', None, None, None),
+    ])
+
+    with db._get_connection() as conn:
+        # first and second tie for the win
+        conn.executemany('INSERT INTO tournament_results (tournament_id, player_id, position) VALUES (?, ?, ?)',
+                         [(tournament_id, first, 1), (tournament_id, second, 1), (tournament_id, third, 3)])
+        db._settle_bets(conn, tournament_id)
+        conn.commit()
+
+    bets = {b['id']: b for b in db.get_user_bets(user_id)}
+    assert [bets[i]['status'] for i in bet_ids] == ['won', 'won', 'lost']
+    assert [bets[i]['payout'] for i in bet_ids] == pytest.approx([500.0, 500.0, 0.0])
+    assert db.get_user_balance(user_id) == pytest.approx(Config.INITIAL_VIRTUAL_BALANCE - 175.0 + 1000.0)
+
+
+def test_group_commit_and_reconcile(tournament_id):
+    ledger = BettingService(flush_interval=0.01)
+    users = [db.create_user(f'ledger_{i}') for i in range(3)]
+    players = field(tournament_id, 3)
+
+    tickets = [ledger.place_bet(user_id, tournament_id, player_id, 10.0, 4.0)
+               for user_id in users for player_id in players]
+    # Stakes are reserved as soon as the bets are accepted
+    assert ledger.available_balance(users[0]) <= Config.INITIAL_VIRTUAL_BALANCE - 30.0
+    bet_ids = [ticket.wait(timeout=5) for ticket in tickets]
+
+    assert len(set(bet_ids)) == len(tickets)
+    for user_id in users:
+        assert len(db.get_user_bets(user_id)) == len(players)
+        assert db.get_user_balance(user_id) == pytest.approx(Config.INITIAL_VIRTUAL_BALANCE - 30.0)
+        assert ledger.available_balance(user_id) == pytest.approx(Config.INITIAL_VIRTUAL_BALANCE - 30.0)
+
+    with pytest.raises(ValueError):
+        ledger.place_bet(users[0], tournament_id, players[0], Config.MAX_BET_AMOUNT + 1, 4.0)
+
+    assert db.reconcile_balances(Config.INITIAL_VIRTUAL_BALANCE) == 0
+    with db._get_connection() as conn:
+        conn.execute('UPDATE users SET virtual_balance = virtual_balance + 123 WHERE id = ?', (users[1],))
+        conn.commit()
+    assert ledger.reconcile() == 1
+    assert db.get_user_balance(users[1]) == pytest.approx(Config.INITIAL_VIRTUAL_BALANCE - 30.0)
+    assert ledger.available_balance(users[1]) == pytest.approx(Config.INITIAL_VIRTUAL_BALANCE - 30.0)
+
+
+def test_bets_on_a_closed_tournament_are_refused(tournament_id):
+    ledger = BettingService(flush_interval=0.01)
+    user_id = db.create_user('late')
+    with db._get_connection() as conn:
+        conn.execute("UPDATE tournaments SET status = 'completed' WHERE id = ?", (tournament_id,))
+        conn.commit()
+
+    # Accepted in memory, but refused when its batch is written
+    ticket = ledger.place_bet(user_id, tournament_id, field(tournament_id, 1)[0], 10.0, 4.0)
+    with pytest.raises(ValueError):
+        ticket.wait(timeout=5)
+    assert db.get_user_bets(user_id) == []
+    assert ledger.available_balance(user_id) == pytest.approx(Config.INITIAL_VIRTUAL_BALANCE)
@@ -8,7 +8,8 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath('.'))
 
-from models.database import db, init_db
+from config import Config
+from models.database import db, init_db, MEMORY_DATABASE
 from services.seeder import seed_database, generate_course_characteristics
 from services.simulation_service import SimulationService
 import random
@@ -19,6 +20,8 @@ def test_course_characteristics():
     
     # Initialize database
     print("Initializing database...")
+    # In memory, so the demo never touches golf_betting.db
+    Config.DATABASE_PATH = MEMORY_DATABASE
     init_db()
     seed_database()
     
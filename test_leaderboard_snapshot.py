@@ -0,0 +1,28 @@
+from services.leaderboard_snapshot import LeaderboardSnapshotStore
+
+
+def test_snapshot_write_read(tmp_path):
+    writer = LeaderboardSnapshotStore(str(tmp_path))
+    reader = LeaderboardSnapshotStore(str(tmp_path))
+    assert reader.read(1) is None
+
+    view = {'tournament': {'id': 1, 'current_round': 1}, 'leaderboard': [{'player_id': 7, 'score_to_par': -3}]}
+    writer.publish(1, view)
+    snapshot = reader.read(1)
+    assert snapshot['version'] == 1
+    assert snapshot['leaderboard'] == view['leaderboard']
+    assert reader.read(1) is snapshot  # decoded once per version
+
+    view['leaderboard'][0]['score_to_par'] = -4
+    writer.publish(1, view)
+    snapshot = reader.read(1)
+    assert snapshot['version'] == 2
+    assert snapshot['leaderboard'][0]['score_to_par'] == -4
+
+    # A snapshot too big for its slots moves to a larger file
+    big = dict(view, leaderboard=[{'player_id': i, 'name': 'x' * 100} for i in range(2000)])
+    writer.publish(1, big)
+    snapshot = reader.read(1)
+    assert snapshot['version'] == 3
+    assert len(snapshot['leaderboard']) == 2000
+    assert reader.read(2) is None
@@ -0,0 +1,105 @@
+from models.database import db
+from services.query_tracer import max_queries
+from services.simulation_service import SimulationService
+
+
+def round_finished(tournament_id):
+    tournament = db.get_tournament_by_id(tournament_id)
+    players = db.get_tournament_players(tournament_id, tournament['current_round'])
+    if tournament['current_round'] == 2:
+        players = [p for p in players if p['status'] == 'active']
+    return db.count_players_finished_round(tournament_id, tournament['current_round']) >= len(players)
+
+
+def play_round(sim, tournament_id):
+    """Ticks the simulation until every player has finished the current round."""
+    while not round_finished(tournament_id):
+        sim.advance_staggered_simulation(tournament_id)
+
+
+def start_next_round(sim, tournament_id):
+    """Starts the next round the way the /next_round route does."""
+    next_round_num = db.get_tournament_by_id(tournament_id)['current_round'] + 1
+    if next_round_num == 4:
+        leaderboard = db.get_leaderboard_from_live_scores(tournament_id)
+        sim.regroup_players(tournament_id, 4, [p for p in leaderboard if p['status'] != 'cut'])
+    db.set_round_start_step(tournament_id, next_round_num, db.get_simulation_step(tournament_id))
+    db.set_current_round(tournament_id, next_round_num)
+
+
+def test_tick_query_count(tournament_id):
+    sim = SimulationService()
+    # The first tick builds the cut tracker from the leaderboard
+    sim.advance_staggered_simulation(tournament_id)
+    for _ in range(20):
+        with max_queries(7, 'tick'):
+            sim.advance_staggered_simulation(tournament_id)
+    assert db.get_simulation_step(tournament_id) == 21
+
+
+def test_leaderboard_query_count(tournament_id):
+    with max_queries(5, 'leaderboard before any scores'):
+        leaderboard = db.get_leaderboard_from_live_scores(tournament_id)
+    assert all(p['position'] is None for p in leaderboard)
+
+    sim = SimulationService()
+    for _ in range(30):
+        sim.advance_staggered_simulation(tournament_id)
+    with max_queries(4, 'leaderboard mid-round'):
+        leaderboard = db.get_leaderboard_from_live_scores(tournament_id)
+    assert leaderboard[0]['position'] == 1
+    assert any(p['holes_played'] for p in leaderboard)
+
+
+def test_cut_tracker_matches_leaderboard_cut(tournament_id):
+    sim = SimulationService()
+    play_round(sim, tournament_id)
+    start_next_round(sim, tournament_id)
+    play_round(sim, tournament_id)
+
+    leaderboard = db.get_leaderboard_from_live_scores(tournament_id)
+    cut_score = leaderboard[64]['score_to_par']
+    expected = {p['player_id'] for p in leaderboard if p['score_to_par'] <= cut_score}
+
+    # Built on the first tick and kept up to date hole by hole since
+    tracker = sim.get_cut_tracker(tournament_id)
+    assert len(tracker) == len(leaderboard)
+    assert tracker.cut_score == cut_score
+    assert {p['player_id'] for p in tracker.players_making_cut()} == expected
+    assert tracker.projection()['players_inside'] == len(expected)
+
+    # The round is over, so the next tick applies the cut
+    sim.advance_staggered_simulation(tournament_id)
+    assert db.get_tournament_by_id(tournament_id)['cut_applied']
+    made_cut = {p['id'] for p in db.get_tournament_players(tournament_id) if p['status'] == 'active'}
+    assert made_cut == expected
+    assert sim.get_cut_tracker(tournament_id) is None
+
+
+def test_score_archive_round_trip(tournament_id):
+    sim = SimulationService()
+    play_round(sim, tournament_id)
+    for _ in range(3):
+        if db.get_tournament_by_id(tournament_id)['current_round'] == 2:
+            sim.advance_staggered_simulation(tournament_id)  # applies the cut
+        start_next_round(sim, tournament_id)
+        play_round(sim, tournament_id)
+
+    def key(s):
+        return s['player_id'], s['round'], s['hole'], s['score']
+
+    live = sorted(key(s) for s in db.get_live_scores_for_tournament(tournament_id))
+    leaderboard = db.get_leaderboard_from_live_scores(tournament_id)
+
+    # The round is over, so the next tick completes the tournament
+    sim.advance_staggered_simulation(tournament_id)
+    assert db.get_tournament_by_id(tournament_id)['status'] == 'completed'
+    with db._get_connection() as conn:
+        remaining = conn.execute('SELECT COUNT(*) AS n FROM live_scores WHERE tournament_id = ?',
+                                 (tournament_id,)).fetchone()['n']
+    assert remaining == 0
+
+    assert sorted(key(s) for s in db.get_live_scores_for_tournament(tournament_id)) == live
+    archived = db.get_leaderboard_from_live_scores(tournament_id)
+    assert [(p['player_id'], p['total_strokes']) for p in archived] == \
+        [(p['player_id'], p['total_strokes']) for p in leaderboard]